@@ -1,4 +1,6 @@
 # main.py
+import argparse
+import json
 import pandas as pd
 import logging
 import os
@@ -11,9 +13,33 @@ warnings.filterwarnings("ignore")
 os.makedirs("models", exist_ok=True)
 os.makedirs("data/processed", exist_ok=True)
 
+from src import compact as compact_module
+from src import (
+    config,
+    cross_validation,
+    data_acquisition,
+    dataset_cache,
+    feature_engineering,
+    model_registry,
+    model_trainer,
+    parallel_features,
+    provider_cache,
+    serving,
+    tuning,
+    utils,
+)
+from src.compact import attach_constants, compact_frame
+from src.cross_validation import cross_validate
 from src.data_acquisition import DataAcquisition
+from src.data_lake import ParquetDataLake
 from src.feature_engineering import calculate_sequestration_and_removal
+from src.model_registry import registry_matches, train_city_models
 from src.model_trainer import train_lgbm_model
+from src.parallel_features import engineer_features_parallel
+from src.profiler import PipelineProfiler
+from src.serving import build_serving_variants, variants_match
+from src.stages import PIPELINE_STAGES, StagePipeline
+from src.tuning import load_tuned_config, run_search
 from src.utils import save_model
 
 # Setup logging
@@ -22,100 +48,338 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Columns excluded from the feature matrix (targets and identifiers)
+EXCLUDE_COLUMNS = [
+    "daily_date",
+    "city_id",
+    "ward_id",
+    "CO2_emission_kg",
+    "PM25_emission_kg",
+    "NOX_emission_kg",
+    "co2_sequestered_kg",
+    "PM25_removed_kg",
+    "NOX_removed_kg",
+    "co2_car_kg",
+    "co2_truck_kg",
+    "co2_twowheeler_kg",
+    "pm25_car_kg",
+    "pm25_truck_kg",
+    "pm25_twowheeler_kg",
+    "nox_car_kg",
+    "nox_truck_kg",
+    "nox_twowheeler_kg",
+    "total_vehicles",
+    "car_prop",
+    "truck_prop",
+    "twowheeler_prop",
+    "f_ndvi",
+    "f_temp",
+    "f_humidity",
+    "ambient_pm25_kg_m3",
+    "ambient_nox_kg_m3",
+    "canopy_area_sqm",
+    "total_vkt_km",
+]
+
+TARGET_COLUMNS = ["Net_CO2_kg", "Net_PM25_kg", "Net_NOX_kg"]
+
+# Modules whose source is part of the stage fingerprints: every src module a
+# stage runs, directly or through the modules it calls
+ENGINEER_CODE = [feature_engineering, parallel_features, utils, compact_module, config]
+ACQUIRE_CODE = [data_acquisition, provider_cache, *ENGINEER_CODE]
+MODEL_CODE = [model_trainer, dataset_cache, utils, config]
+
+
+def acquire_data(start_date, days, max_workers=None, compact=False):
+    """Stage 1: generate the raw observations."""
+    data_acquirer = DataAcquisition()
+    raw_df = data_acquirer.generate_training_data(
+        start_date=start_date, days=days, max_workers=max_workers, compact=compact
+    )
+
+    logger.info(f"Acquired data with {len(raw_df)} records")
+    logger.info(f"Columns: {list(raw_df.columns)}")
+    return raw_df
+
+
+def engineer_features(raw_df, max_workers=None, compact=False):
+    """Stage 2: compute emissions and sequestration."""
+    if max_workers:
+        engineered_df, _ = engineer_features_parallel(raw_df, max_workers=max_workers)
+    else:
+        engineered_df = calculate_sequestration_and_removal(raw_df)
+    if compact:
+        engineered_df, report = compact_frame(engineered_df)
+        logger.info(
+            f"Compact feature table: {report['savings_pct']:.0f}% smaller, "
+            f"max relative deviation {report['max_rel_deviation']:.2e}"
+        )
+
+    logger.info(f"Engineered data shape: {engineered_df.shape}")
+    return engineered_df
+
+
+def save_engineered(raw_df, engineered_df):
+    """Write the observations and features the API and notebooks read.
+
+    Called on the stage outputs rather than inside the cached stages, so the
+    files are rewritten when the stages load from the cache too.
+    """
+    engineered_df.to_csv("data/processed/training_data.csv", index=False)
+    lake = ParquetDataLake()
+    lake.write(raw_df, "observations", mode="overwrite")
+    lake.write(engineered_df, "features", mode="overwrite")
+
+
+def prepare_features(engineered_df, exclude_columns, target_columns):
+    """Stage 3: select the feature and target columns."""
+    # A compact table keeps per-city constants in a side table
+    engineered_df = attach_constants(
+        engineered_df,
+        [col for col in ["forest_area_sqkm"] if col not in exclude_columns],
+    )
+    feature_columns = [
+        col
+        for col in engineered_df.columns
+        if col not in exclude_columns and col not in target_columns
+    ]
+    logger.info(f"Feature columns: {feature_columns}")
+    return engineered_df[feature_columns + list(target_columns)]
+
+
+def tune_model(prepared_df, target_columns):
+    """Optional stage: search LightGBM parameters and return the best config."""
+    X = prepared_df.drop(columns=list(target_columns))
+    Y = prepared_df[list(target_columns)]
+    return run_search(X, Y)["best_config"]
+
+
+def cross_validate_model(
+    engineered_df, exclude_columns, target_columns, model_config=None
+):
+    """Optional stage: rolling-origin cross-validation by date and ward."""
+    prepared_df = prepare_features(engineered_df, exclude_columns, target_columns)
+    X = prepared_df.drop(columns=list(target_columns))
+    Y = prepared_df[list(target_columns)]
+    return cross_validate(
+        X,
+        Y,
+        engineered_df["daily_date"],
+        engineered_df["ward_id"],
+        model_config=model_config,
+    )
+
+
+def train_model(prepared_df, target_columns, model_config=None):
+    """Stage 4: train the multi-output model."""
+    X = prepared_df.drop(columns=list(target_columns))
+    Y = prepared_df[list(target_columns)]
+
+    logger.info(f"Feature matrix shape: {X.shape}")
+    logger.info(f"Target matrix shape: {Y.shape}")
+    # Saved by the pipeline from the stage output, cached or not
+    return train_lgbm_model(X, Y, config=model_config, save_path=None)
+
+
+def train_city_shards(
+    engineered_df, exclude_columns, target_columns, model_config=None
+):
+    """Optional stage: train one model per city for the model registry."""
+    prepared_df = prepare_features(engineered_df, exclude_columns, target_columns)
+    X = prepared_df.drop(columns=list(target_columns))
+    Y = prepared_df[list(target_columns)]
+    return train_city_models(X, Y, engineered_df["city_id"], model_config=model_config)
+
+
+def build_variants(prepared_df, trained, target_columns):
+    """Optional stage: compact the trained model into serving variants."""
+    X = prepared_df.drop(columns=list(target_columns))
+    Y = prepared_df[list(target_columns)]
+    return build_serving_variants(trained[0], X, Y)
+
+
+def build_report(prepared_df, trained, target_columns):
+    """Stage 5: summarize the training run."""
+    trainer, train_metrics, test_metrics = trained
+    return {
+        "data_points": len(prepared_df),
+        "features_used": len(prepared_df.columns) - len(target_columns),
+        "train_metrics": train_metrics,
+        "test_metrics": test_metrics,
+        "feature_importance": trainer.feature_importance.to_dict("records"),
+        "training": trainer.training_report,
+    }
 
-def run_complete_pipeline():
-    """Run the complete data pipeline and model training."""
+
+def run_complete_pipeline(
+    force=None,
+    max_workers=None,
+    cprofile_stages=None,
+    trace_memory=False,
+    compact=False,
+    tune=False,
+    tuned_config=None,
+    cv=False,
+    city_models=False,
+    serving_variants=False,
+):
+    """Run the complete data pipeline and model training.
+
+    Each stage is skipped when an artifact with the same fingerprint (inputs,
+    code and config) exists under data/stages/; ``force`` lists stages to
+    recompute anyway. With ``max_workers`` the rolling-feature and
+    feature-engineering work runs per city on a process pool. With
+    ``compact`` the feature tables use float32, categorical ids and a
+    per-city side table for constants (see src/compact.py).
+
+    With ``tune`` a hyperparameter search (src/tuning.py) runs before
+    training and the model is trained with its best config; ``tuned_config``
+    trains with a best_config.json written by an earlier search instead.
+    With ``cv`` the model config is scored by rolling-origin
+    cross-validation (src/cross_validation.py) before training; the report
+    goes to models/cv_report.json. With ``city_models`` one model per city
+    (or city cluster) is trained into the registry under models/registry/,
+    which the API loads on demand (src/model_registry.py). With
+    ``serving_variants`` the trained model is compacted into pruned (and,
+    when enabled, distilled) variants under models/serving/, with a report
+    of their accuracy against per-row latency (src/serving.py).
+
+    Per-stage timings, memory and row counts are written to
+    models/pipeline_profile.json; ``cprofile_stages`` lists stages to dump
+    cProfile stats for, and ``trace_memory`` adds tracemalloc peaks, at the
+    cost of slower allocation-heavy stages.
+    """
     logger.info("Starting complete pipeline execution...")
+    profiler = PipelineProfiler(
+        "models/pipeline_profile.json",
+        trace_memory=trace_memory,
+        cprofile_stages=cprofile_stages,
+    )
 
     try:
+        pipeline = StagePipeline(force=force, profiler=profiler)
+
         # 1. Data Acquisition
         logger.info("Step 1: Data Acquisition")
-        data_acquirer = DataAcquisition()
-        raw_df = data_acquirer.generate_training_data(
-            start_date="2023-01-01", days=180  # 6 months of data
+        raw_df = pipeline.run(
+            "acquire",
+            acquire_data,
+            params={
+                "start_date": "2023-01-01",
+                "days": 180,  # 6 months of data
+                "compact": compact,
+            },
+            code=ACQUIRE_CODE,
+            options={"max_workers": max_workers},
         )
 
-        logger.info(f"Acquired data with {len(raw_df)} records")
-        logger.info(f"Columns: {list(raw_df.columns)}")
-
         # 2. Feature Engineering
         logger.info("Step 2: Feature Engineering")
-        engineered_df = calculate_sequestration_and_removal(raw_df)
-
-        # Save processed data
-        engineered_df.to_csv("data/processed/training_data.csv", index=False)
-        logger.info(f"Engineered data shape: {engineered_df.shape}")
+        engineered_df = pipeline.run(
+            "engineer",
+            engineer_features,
+            inputs=["acquire"],
+            params={"compact": compact},
+            code=ENGINEER_CODE,
+            options={"max_workers": max_workers},
+        )
+        save_engineered(raw_df, engineered_df)
 
         # 3. Prepare Features and Targets
         logger.info("Step 3: Preparing Features and Targets")
+        pipeline.run(
+            "prepare",
+            prepare_features,
+            inputs=["engineer"],
+            params={
+                "exclude_columns": EXCLUDE_COLUMNS,
+                "target_columns": TARGET_COLUMNS,
+            },
+            code=[compact_module],
+        )
 
-        # Define feature columns (excluding targets and identifiers)
-        exclude_columns = [
-            "daily_date",
-            "city_id",
-            "ward_id",
-            "CO2_emission_kg",
-            "PM25_emission_kg",
-            "NOX_emission_kg",
-            "co2_sequestered_kg",
-            "PM25_removed_kg",
-            "NOX_removed_kg",
-            "co2_car_kg",
-            "co2_truck_kg",
-            "co2_twowheeler_kg",
-            "pm25_car_kg",
-            "pm25_truck_kg",
-            "pm25_twowheeler_kg",
-            "nox_car_kg",
-            "nox_truck_kg",
-            "nox_twowheeler_kg",
-            "total_vehicles",
-            "car_prop",
-            "truck_prop",
-            "twowheeler_prop",
-            "f_ndvi",
-            "f_temp",
-            "f_humidity",
-            "ambient_pm25_kg_m3",
-            "ambient_nox_kg_m3",
-            "canopy_area_sqm",
-            "total_vkt_km",
-        ]
-
-        feature_columns = [
-            col for col in engineered_df.columns if col not in exclude_columns
-        ]
-        X = engineered_df[feature_columns]
-
-        # Define target variables
-        Y = engineered_df[["Net_CO2_kg", "Net_PM25_kg", "Net_NOX_kg"]]
-
-        logger.info(f"Feature matrix shape: {X.shape}")
-        logger.info(f"Target matrix shape: {Y.shape}")
-        logger.info(f"Feature columns: {feature_columns}")
+        # Optional: Hyperparameter Search
+        model_config = load_tuned_config(tuned_config) if tuned_config else None
+        if tune:
+            logger.info("Searching hyperparameters")
+            model_config = pipeline.run(
+                "tune",
+                tune_model,
+                inputs=["prepare"],
+                params={"target_columns": TARGET_COLUMNS},
+                code=[tuning, *MODEL_CODE],
+            )
+
+        # Optional: Cross-Validation
+        if cv:
+            logger.info("Cross-validating by date")
+            pipeline.run(
+                "cv",
+                cross_validate_model,
+                inputs=["engineer"],
+                params={
+                    "exclude_columns": EXCLUDE_COLUMNS,
+                    "target_columns": TARGET_COLUMNS,
+                    "model_config": model_config,
+                },
+                code=[cross_validation, compact_module, *MODEL_CODE],
+            )
 
         # 4. Model Training
         logger.info("Step 4: Model Training")
-        trainer, train_metrics, test_metrics = train_lgbm_model(X, Y)
+        trainer, train_metrics, test_metrics = pipeline.run(
+            "train",
+            train_model,
+            inputs=["prepare"],
+            params={"target_columns": TARGET_COLUMNS, "model_config": model_config},
+            code=MODEL_CODE,
+        )
+        save_model(trainer, "models/trained_model.pkl")
+
+        # Optional: Per-City Models
+        if city_models:
+            logger.info("Training per-city models")
+            pipeline.run(
+                "city_models",
+                train_city_shards,
+                inputs=["engineer"],
+                params={
+                    "exclude_columns": EXCLUDE_COLUMNS,
+                    "target_columns": TARGET_COLUMNS,
+                    "model_config": model_config,
+                },
+                code=[model_registry, compact_module, *MODEL_CODE],
+                valid=registry_matches,
+            )
+
+        # Optional: Serving Variants
+        if serving_variants:
+            logger.info("Compacting the model into serving variants")
+            pipeline.run(
+                "variants",
+                build_variants,
+                inputs=["prepare", "train"],
+                params={"target_columns": TARGET_COLUMNS},
+                code=[serving, *MODEL_CODE],
+                valid=variants_match,
+            )
 
         # 5. Save Final Model and Results
         logger.info("Step 5: Saving Results")
+        summary = pipeline.run(
+            "report",
+            build_report,
+            inputs=["prepare", "train"],
+            params={"target_columns": TARGET_COLUMNS},
+        )
 
-        # Save training summary
-        summary = {
-            "timestamp": datetime.now().isoformat(),
-            "data_points": len(engineered_df),
-            "features_used": len(feature_columns),
-            "train_metrics": train_metrics,
-            "test_metrics": test_metrics,
-            "feature_importance": trainer.feature_importance.to_dict("records"),
-        }
-
-        import json
-
+        # Stamped outside the stage, so a cached summary gets this run's time
+        summary = {"timestamp": datetime.now().isoformat(), **summary}
         with open("models/training_summary.json", "w") as f:
             json.dump(summary, f, indent=2)
+        profiler.write()
 
+        logger.info(f"Stage status: {pipeline.status}")
         logger.info("Pipeline completed successfully!")
         logger.info(f"Training RMSE: {train_metrics['overall_rmse']:.2f}")
         logger.info(f"Test RMSE: {test_metrics['overall_rmse']:.2f}")
@@ -125,6 +389,7 @@ def run_complete_pipeline():
 
     except Exception as e:
         logger.error(f"Pipeline failed: {e}")
+        profiler.write()
         raise
 
 
@@ -160,7 +425,12 @@ def generate_sample_prediction(trainer=None):
         "ward_id": ["Delhi_W1"],
     }
 
-    sample_df = pd.DataFrame(sample_data)
+    # Align with the columns the model was fitted on; features the sample
+    # does not provide are left missing, which LightGBM handles natively
+    columns = getattr(trainer, "input_columns", None)
+    if not columns:  # Models saved before input columns were recorded
+        columns = trainer.scaler.feature_names_in_
+    sample_df = pd.DataFrame(sample_data).reindex(columns=columns)
     prediction = trainer.predict(sample_df)
 
     logger.info("Sample Prediction:")
@@ -172,10 +442,80 @@ def generate_sample_prediction(trainer=None):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the complete pipeline")
+    parser.add_argument(
+        "--force",
+        action="append",
+        choices=PIPELINE_STAGES + ["all"],
+        default=[],
+        help="Recompute a stage even if its cached artifact is up to date",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Engineer features per city on this many processes",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="append",
+        choices=PIPELINE_STAGES + ["all"],
+        default=[],
+        help="Dump cProfile stats for a stage to models/profile_<stage>.prof",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record per-stage tracemalloc peaks in the pipeline profile",
+    )
+    parser.add_argument(
+        "--tune",
+        action="store_true",
+        help="Search hyperparameters and train with the best config",
+    )
+    parser.add_argument(
+        "--tuned-config",
+        type=str,
+        default=None,
+        help="Train with a best_config.json from an earlier search",
+    )
+    parser.add_argument(
+        "--cv",
+        action="store_true",
+        help="Cross-validate on rolling date folds before training",
+    )
+    parser.add_argument(
+        "--city-models",
+        action="store_true",
+        help="Also train one model per city for the model registry",
+    )
+    parser.add_argument(
+        "--serving-variants",
+        action="store_true",
+        help="Compact the trained model into pruned serving variants",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Keep feature tables as float32 with categorical ids",
+    )
+    args = parser.parse_args()
+
     logger.info("Urban Emission and Sequestration Model Pipeline")
 
     # Run complete pipeline
-    trainer, data = run_complete_pipeline()
+    trainer, data = run_complete_pipeline(
+        force=args.force,
+        max_workers=args.workers,
+        cprofile_stages=args.cprofile,
+        trace_memory=args.trace_memory,
+        compact=args.compact,
+        tune=args.tune,
+        tuned_config=args.tuned_config,
+        cv=args.cv,
+        city_models=args.city_models,
+        serving_variants=args.serving_variants,
+    )
 
     # Generate sample prediction
     generate_sample_prediction(trainer)
@@ -3,13 +3,15 @@
 Data validation script for GitHub Actions
 """
 
+import argparse
 import sys
 import os
 import pandas as pd
 import logging
 from pathlib import Path
 
-# Add src to path
+# Add the repository root and src to path
+sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from data_loader import DataLoader
@@ -18,10 +20,10 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def validate_data_schemas():
+def validate_data_schemas(use_cache=None):
     """Validate that data files conform to expected schemas"""
     try:
-        loader = DataLoader()
+        loader = DataLoader(use_cache=use_cache)
 
         # Check if data directory exists
         data_dir = Path("data")
@@ -33,13 +35,19 @@ def validate_data_schemas():
         vehicle_data_path = data_dir / "raw" / "vehicle_emissions.csv"
         if vehicle_data_path.exists():
             vehicle_data = loader.load_vehicle_data(str(vehicle_data_path))
-            logger.info(f"Vehicle data validated: {len(vehicle_data)} records")
+            logger.info(
+                f"Vehicle data validated: {len(vehicle_data)} records, "
+                f"{loader.last_validation_report['invalid_rows']} with violations"
+            )
 
         # Validate forest data schema if file exists
         forest_data_path = data_dir / "raw" / "forest_data.csv"
         if forest_data_path.exists():
             forest_data = loader.load_forest_data(str(forest_data_path))
-            logger.info(f"Forest data validated: {len(forest_data)} records")
+            logger.info(
+                f"Forest data validated: {len(forest_data)} records, "
+                f"{loader.last_validation_report['invalid_rows']} with violations"
+            )
 
         logger.info("All data validation checks passed")
         return True
@@ -50,5 +58,11 @@ def validate_data_schemas():
 
 
 if __name__ == "__main__":
-    success = validate_data_schemas()
+    parser = argparse.ArgumentParser(description="Validate raw data schemas")
+    parser.add_argument(
+        "--cache", action="store_true", help="Reuse parsed files from the file cache"
+    )
+    args = parser.parse_args()
+
+    success = validate_data_schemas(use_cache=args.cache or None)
     sys.exit(0 if success else 1)
@@ -10,7 +10,36 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def validate_outputs(output_dir="data/processed"):
+def validate_lake(lake_path, datasets=("observations", "features")):
+    """Validate Parquet lake datasets from their footers, without reading data."""
+    from src.data_lake import ParquetDataLake
+
+    lake = ParquetDataLake(lake_path)
+    all_valid = True
+
+    for dataset in datasets:
+        if not lake.exists(dataset):
+            logger.info(f"Lake dataset not present: {dataset} (skipped)")
+            continue
+
+        try:
+            rows = lake.count_rows(dataset)
+            if rows == 0:
+                logger.error(f"Lake dataset is empty: {dataset}")
+                all_valid = False
+            else:
+                logger.info(
+                    f"Successfully validated lake dataset {dataset} "
+                    f"({rows} rows, {len(lake.list_partitions(dataset))} partitions)"
+                )
+        except Exception as e:
+            logger.error(f"Error validating lake dataset {dataset}: {str(e)}")
+            all_valid = False
+
+    return all_valid
+
+
+def validate_outputs(output_dir="data/processed", lake_path="data/lake"):
     """Validate that expected output files exist and are valid."""
     logger.info(f"Validating outputs in {output_dir}...")
 
@@ -46,6 +75,9 @@ def validate_outputs(output_dir="data/processed"):
             logger.error(f"Error validating {filename}: {str(e)}")
             all_valid = False
 
+    if os.path.isdir(lake_path):
+        all_valid = validate_lake(lake_path) and all_valid
+
     if all_valid:
         logger.info("All outputs validated successfully.")
         sys.exit(0)
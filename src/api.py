@@ -10,11 +10,16 @@ from pydantic import BaseModel
 import pandas as pd
 import numpy as np
 import logging
-from typing import Optional, Dict, Any
+import os
+import time
+from typing import Optional, Dict, Any, List
 import uvicorn
 
 from src.utils import load_model
-from src.config import CITIES
+from src.config import CITIES, REGISTRY_CONFIG, SERVING_CONFIG
+from src.model_registry import MANIFEST_FILE, ModelRegistry
+from src.model_trainer import TARGET_COLUMNS
+from src.serving import SERVING_VARIANTS, load_variant
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -38,6 +43,10 @@ app.add_middleware(
 
 # Global model variable
 MODEL = None
+# Per-city models, when a registry has been trained
+REGISTRY: Optional[ModelRegistry] = None
+# Compacted variants of the global model, loaded on first use
+VARIANTS: Dict[str, Any] = {}
 
 
 class PolicyInput(BaseModel):
@@ -91,6 +100,7 @@ class PredictionResponse(BaseModel):
         policy_impact_co2 (Optional[float]): The policy impact on CO2 emissions.
         policy_impact_pm25 (Optional[float]): The policy impact on PM2.5 emissions.
         policy_impact_nox (Optional[float]): The policy impact on NOx emissions.
+        variant (Optional[str]): The serving variant that predicted.
     """
 
     city: str
@@ -100,19 +110,80 @@ class PredictionResponse(BaseModel):
     policy_impact_co2: Optional[float] = None
     policy_impact_pm25: Optional[float] = None
     policy_impact_nox: Optional[float] = None
+    variant: Optional[str] = None
+
+
+class FeatureContribution(BaseModel):
+    """
+    The SHAP contribution of one feature.
+
+    Attributes:
+        feature (str): The feature name.
+        shap_value (float): The feature's contribution, in kg/day.
+    """
+
+    feature: str
+    shap_value: float
+
+
+class TargetExplanation(BaseModel):
+    """
+    The explanation of one target.
+
+    Attributes:
+        target (str): The target name.
+        expected_value (float): The model's average output, in kg/day.
+        prediction (float): The prediction, in kg/day.
+        contributions (List[FeatureContribution]): The largest contributions
+            by absolute value.
+    """
+
+    target: str
+    expected_value: float
+    prediction: float
+    contributions: List[FeatureContribution]
+
+
+class ExplanationResponse(BaseModel):
+    """
+    Response data model for an explanation.
+
+    Attributes:
+        city (str): The city ID.
+        model_version (str): The version of the explained model.
+        targets (List[TargetExplanation]): One explanation per target.
+        latency_ms (float): The time spent explaining.
+    """
+
+    city: str
+    model_version: str
+    targets: List[TargetExplanation]
+    latency_ms: float
 
 
 @app.on_event("startup")
 async def startup_event():
     """Load model on startup."""
-    global MODEL
+    global MODEL, REGISTRY
     try:
-        MODEL = load_model("models/trained_model.pkl")
+        if os.path.exists(os.path.join(REGISTRY_CONFIG["path"], MANIFEST_FILE)):
+            # City models load on their first request; the global model
+            # serves the other cities
+            REGISTRY = ModelRegistry()
+            MODEL = REGISTRY.fallback()
+        else:
+            MODEL = load_model("models/trained_model.pkl")
         logger.info("Model loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load model: {e}")
         raise RuntimeError("Model loading failed")
 
+    # Build the SHAP explainers now rather than on the first /explain call
+    try:
+        MODEL.explainers()
+    except Exception as e:
+        logger.warning(f"SHAP explainers not available: {e}")
+
 
 @app.get("/")
 async def root():
@@ -126,29 +197,40 @@ async def get_cities():
 
 
 @app.post("/api/v1/predict_net_impact", response_model=PredictionResponse)
-async def predict_net_impact(data: PolicyInput):
+async def predict_net_impact(data: PolicyInput, variant: Optional[str] = None):
     """
     Predict net pollution impact for a given scenario with policy interventions.
+
+    ``variant`` picks a compacted variant of the global model (see
+    src/serving.py); it defaults to the ``variant`` of SERVING_CONFIG, and
+    "full" serves the city's own model.
     """
     try:
         if MODEL is None:
             raise HTTPException(status_code=500, detail="Model not loaded")
 
-        # Create baseline and scenario feature sets
-        baseline_features = create_feature_dict(data, apply_policies=False)
-        scenario_features = create_feature_dict(data, apply_policies=True)
+        variant = variant or SERVING_CONFIG["variant"]
+        if variant not in SERVING_VARIANTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown variant '{variant}'; expected one of "
+                f"{list(SERVING_VARIANTS)}",
+            )
+        model = model_for(data.city_id) if variant == "full" else variant_model(variant)
 
-        # Convert to DataFrames
-        baseline_df = pd.DataFrame([baseline_features])
-        scenario_df = pd.DataFrame([scenario_features])
+        # Create baseline and scenario feature sets
+        baseline_df = model_frame(
+            model, create_feature_dict(data, apply_policies=False)
+        )
+        scenario_df = model_frame(model, create_feature_dict(data, apply_policies=True))
 
         # Make predictions
-        baseline_pred = MODEL.predict(baseline_df)
-        scenario_pred = MODEL.predict(scenario_df)
+        baseline_pred = model.predict(baseline_df)
+        scenario_pred = model.predict(scenario_df)
 
         # Convert kg to tonnes
-        baseline_tonnes = baseline_pred[0] / 1000
-        scenario_tonnes = scenario_pred[0] / 1000
+        baseline_tonnes = baseline_pred.iloc[0].to_numpy() / 1000
+        scenario_tonnes = scenario_pred.iloc[0].to_numpy() / 1000
 
         # Calculate policy impact
         policy_impact = scenario_tonnes - baseline_tonnes
@@ -161,16 +243,129 @@ async def predict_net_impact(data: PolicyInput):
             policy_impact_co2=float(policy_impact[0]),
             policy_impact_pm25=float(policy_impact[1]),
             policy_impact_nox=float(policy_impact[2]),
+            variant=model.training_report.get("variant", variant),
         )
 
         logger.info(f"Prediction completed for {data.city_id} - {data.ward_id}")
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/explain", response_model=ExplanationResponse)
+async def explain(data: PolicyInput, top_k: int = 10):
+    """
+    Explain the prediction for a scenario with policy interventions.
+
+    The SHAP explainers are cached per model version, so a request costs a
+    few milliseconds per target once they are built.
+    """
+    try:
+        if MODEL is None:
+            raise HTTPException(status_code=500, detail="Model not loaded")
+
+        started = time.perf_counter()
+        model = model_for(data.city_id)
+        scenario_df = model_frame(model, create_feature_dict(data, apply_policies=True))
+        explanation = model.explain_batch(scenario_df)
+
+        targets = []
+        names = explanation["feature_names"]
+        for target, values, expected_value in zip(
+            TARGET_COLUMNS,
+            explanation["shap_values"],
+            explanation["expected_values"],
+        ):
+            row = values[0]
+            top = np.argsort(-np.abs(row))[:top_k]
+            targets.append(
+                TargetExplanation(
+                    target=target,
+                    expected_value=expected_value,
+                    prediction=float(expected_value + row.sum()),
+                    contributions=[
+                        FeatureContribution(
+                            feature=names[index], shap_value=float(row[index])
+                        )
+                        for index in top
+                    ],
+                )
+            )
+
+        return ExplanationResponse(
+            city=data.city_id,
+            model_version=explanation["model_version"],
+            targets=targets,
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Explanation error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def model_for(city_id: str) -> Any:
+    """
+    Return the model serving a city.
+
+    Args:
+        city_id (str): The city ID.
+
+    Returns:
+        Any: The city's model from the registry, or the global model.
+    """
+    if REGISTRY is not None:
+        return REGISTRY.get(city_id)
+    return MODEL
+
+
+def variant_model(name: str) -> Any:
+    """
+    Return a serving variant of the global model, loading it on first use.
+
+    Args:
+        name (str): The variant, or "auto" for the one selected for the
+            latency budget.
+
+    Returns:
+        Any: The variant.
+    """
+    if name not in SERVING_VARIANTS:
+        raise HTTPException(status_code=400, detail=f"Unknown variant '{name}'")
+    if name not in VARIANTS:
+        try:
+            VARIANTS[name] = load_variant(name)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+    return VARIANTS[name]
+
+
+def model_frame(model: Any, features: Dict[str, float]) -> pd.DataFrame:
+    """
+    Build a one-row frame with the columns the model was fitted on.
+
+    Features the request does not provide are left missing, which LightGBM
+    handles natively.
+
+    Args:
+        model (Any): The model.
+        features (Dict[str, float]): The feature dictionary.
+
+    Returns:
+        pd.DataFrame: The aligned row.
+    """
+    columns = getattr(model, "input_columns", None)
+    if not columns:  # Models saved before input columns were recorded
+        columns = model.scaler.feature_names_in_
+    return pd.DataFrame([features]).reindex(columns=columns)
+
+
 def create_feature_dict(
     data: PolicyInput, apply_policies: bool = False
 ) -> Dict[str, float]:
@@ -258,6 +453,7 @@ async def health_check():
     return {
         "status": "healthy",
         "model_loaded": MODEL is not None,
+        "registry": REGISTRY.stats() if REGISTRY is not None else None,
         "timestamp": pd.Timestamp.now().isoformat(),
     }
 
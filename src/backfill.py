@@ -0,0 +1,271 @@
+"""
+This module contains the historical backfill command, which splits a date range
+into (city, month) tasks, runs them on a process pool and checkpoints each
+finished partition so an interrupted backfill can resume.
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import BACKFILL_CONFIG, CITIES
+from src.data_acquisition import ROLLING_FEATURE_COLUMNS, DataAcquisition
+from src.data_lake import ParquetDataLake
+from src.provider_cache import ProviderCache
+from src.utils import calculate_rolling_features, create_time_features
+
+logger = logging.getLogger(__name__)
+
+
+def plan_tasks(
+    start_date: str, end_date: str, cities: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Split a date range into one task per city and calendar month.
+
+    Args:
+        start_date (str): The first day to backfill (YYYY-MM-DD).
+        end_date (str): The last day to backfill (YYYY-MM-DD), inclusive.
+        cities (Optional[List[str]]): The cities to backfill. Defaults to CITIES.
+
+    Returns:
+        List[Dict[str, Any]]: Tasks with task_id, city, start and end keys.
+    """
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    if end < start:
+        raise ValueError(f"End date {end_date} is before start date {start_date}")
+
+    tasks = []
+    for city in cities or CITIES:
+        for month_start in pd.date_range(start.replace(day=1), end, freq="MS"):
+            task_start = max(start, month_start)
+            task_end = min(end, month_start + pd.offsets.MonthEnd(0))
+            tasks.append(
+                {
+                    "task_id": f"{city}_{task_start:%Y%m%d}_{task_end:%Y%m%d}",
+                    "city": city,
+                    "start": task_start.strftime("%Y-%m-%d"),
+                    "end": task_end.strftime("%Y-%m-%d"),
+                }
+            )
+    return tasks
+
+
+def day_seed(base_seed: int, city: str, day: pd.Timestamp) -> int:
+    """
+    Derive the RNG seed for one city-day.
+
+    Seeds depend only on the base seed, city and day, so a task reproduces the
+    same rows however the date range is split, and its warm-up window matches
+    the rows the previous task wrote.
+
+    Args:
+        base_seed (int): The backfill-wide seed.
+        city (str): The city.
+        day (pd.Timestamp): The day.
+
+    Returns:
+        int: A 32-bit seed.
+    """
+    sequence = np.random.SeedSequence(
+        [base_seed, zlib.crc32(city.encode("utf-8")), day.toordinal()]
+    )
+    return int(sequence.generate_state(1)[0])
+
+
+def run_task(
+    task: Dict[str, Any],
+    lake_path: str,
+    dataset: str,
+    base_seed: int,
+    warmup_days: int,
+    cache_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Generate one (city, date-range) partition and write it to the lake.
+
+    Args:
+        task (Dict[str, Any]): The task from plan_tasks.
+        lake_path (str): The root of the Parquet lake.
+        dataset (str): The lake dataset to write.
+        base_seed (int): The backfill-wide seed.
+        warmup_days (int): Days generated before the range for rolling windows.
+        cache_path (Optional[str]): Provider cache file shared by the workers.
+
+    Returns:
+        Dict[str, Any]: The task with rows and elapsed_seconds added.
+    """
+    started = time.perf_counter()
+    cache = ProviderCache(path=cache_path) if cache_path else None
+    acquisition = DataAcquisition(cache=cache)
+
+    start = pd.Timestamp(task["start"])
+    end = pd.Timestamp(task["end"])
+    frames = []
+    for day in pd.date_range(start - timedelta(days=warmup_days), end):
+        np.random.seed(day_seed(base_seed, task["city"], day))
+        frames.append(
+            acquisition.generate_observations(
+                day.strftime("%Y-%m-%d"), days=1, cities=[task["city"]]
+            )
+        )
+    if cache is not None:
+        cache.close()
+
+    df = create_time_features(pd.concat(frames, ignore_index=True))
+    df = calculate_rolling_features(df, ROLLING_FEATURE_COLUMNS)
+    df = df[df["daily_date"] >= start].reset_index(drop=True)
+
+    # The task's days are replaced wherever they were written before, by an
+    # earlier backfill or the pipeline; the partition's other days are kept
+    ParquetDataLake(lake_path).write(df, dataset, mode="replace")
+    return {
+        **task,
+        "rows": len(df),
+        "elapsed_seconds": time.perf_counter() - started,
+    }
+
+
+def checkpoint_dir(lake_path: str, dataset: str) -> str:
+    """Return the directory holding completed-task markers for a dataset."""
+    return os.path.join(lake_path, "_backfill", dataset)
+
+
+def run_backfill(
+    start_date: str,
+    end_date: str,
+    cities: Optional[List[str]] = None,
+    lake_path: Optional[str] = None,
+    dataset: Optional[str] = None,
+    seed: Optional[int] = None,
+    warmup_days: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    cache_path: Optional[str] = None,
+    resume: bool = True,
+) -> Dict[str, Any]:
+    """
+    Backfill observations for a date range on a process pool.
+
+    Args:
+        start_date (str): The first day to backfill (YYYY-MM-DD).
+        end_date (str): The last day to backfill (YYYY-MM-DD), inclusive.
+        cities (Optional[List[str]]): The cities to backfill. Defaults to CITIES.
+        lake_path (Optional[str]): The root of the Parquet lake.
+        dataset (Optional[str]): The lake dataset to write.
+        seed (Optional[int]): The backfill-wide seed.
+        warmup_days (Optional[int]): Days generated before each task's range.
+        max_workers (Optional[int]): Worker processes. Defaults to the CPU count.
+        cache_path (Optional[str]): Provider cache file shared by the workers.
+        resume (bool): Skip tasks that already have a checkpoint.
+
+    Returns:
+        Dict[str, Any]: Completed, skipped and failed task counts, rows written
+            and wall time.
+    """
+    lake_path = lake_path or BACKFILL_CONFIG["lake_path"]
+    dataset = dataset or BACKFILL_CONFIG["dataset"]
+    seed = BACKFILL_CONFIG["seed"] if seed is None else seed
+    warmup_days = BACKFILL_CONFIG["warmup_days"] if warmup_days is None else warmup_days
+    max_workers = max_workers or BACKFILL_CONFIG["max_workers"] or os.cpu_count()
+
+    markers = checkpoint_dir(lake_path, dataset)
+    os.makedirs(markers, exist_ok=True)
+
+    tasks = plan_tasks(start_date, end_date, cities)
+    pending = [
+        task
+        for task in tasks
+        if not (
+            resume and os.path.exists(os.path.join(markers, f"{task['task_id']}.json"))
+        )
+    ]
+    logger.info(
+        f"Backfilling {len(pending)} of {len(tasks)} tasks "
+        f"on {max_workers} workers ({len(tasks) - len(pending)} already done)"
+    )
+
+    started = time.perf_counter()
+    completed, failed, rows = 0, [], 0
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                run_task, task, lake_path, dataset, seed, warmup_days, cache_path
+            ): task
+            for task in pending
+        }
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Backfill task {task['task_id']} failed: {e}")
+                failed.append(task["task_id"])
+                continue
+
+            # The marker is written only after the partition is in place
+            with open(os.path.join(markers, f"{task['task_id']}.json"), "w") as f:
+                json.dump({**result, "seed": seed}, f, indent=2)
+            completed += 1
+            rows += result["rows"]
+            logger.info(
+                f"Finished {task['task_id']} ({result['rows']} rows, "
+                f"{result['elapsed_seconds']:.1f}s) [{completed}/{len(pending)}]"
+            )
+
+    summary = {
+        "tasks": len(tasks),
+        "completed": completed,
+        "skipped": len(tasks) - len(pending),
+        "failed": failed,
+        "rows": rows,
+        "wall_seconds": time.perf_counter() - started,
+    }
+    logger.info(f"Backfill finished: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Backfill historical observations")
+    parser.add_argument(
+        "--start", type=str, required=True, help="First day (YYYY-MM-DD)"
+    )
+    parser.add_argument("--end", type=str, required=True, help="Last day (YYYY-MM-DD)")
+    parser.add_argument("--cities", nargs="+", default=None, help="Cities to backfill")
+    parser.add_argument("--lake", type=str, default=None, help="Parquet lake root")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=None, help="Base RNG seed")
+    parser.add_argument(
+        "--cache", type=str, default=None, help="Provider cache file to share"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore checkpoints and redo every task"
+    )
+    args = parser.parse_args()
+
+    result = run_backfill(
+        args.start,
+        args.end,
+        cities=args.cities,
+        lake_path=args.lake,
+        seed=args.seed,
+        max_workers=args.workers,
+        cache_path=args.cache,
+        resume=not args.restart,
+    )
+    if result["failed"]:
+        raise SystemExit(1)
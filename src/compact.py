@@ -0,0 +1,210 @@
+"""
+This module contains the compact dtype mode for the engineered feature table:
+float32 numerics, categorical ids and per-city constants in a side table.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config import CITIES, FOREST_COVER_DATA, VEHICLE_DATA
+
+logger = logging.getLogger(__name__)
+
+ID_COLUMNS: List[str] = ["city_id", "ward_id"]
+
+# Columns that depend only on the city and repeat on every ward-day row
+CITY_CONSTANT_COLUMNS: List[str] = [
+    "forest_area_sqkm",
+    "total_vehicles",
+    "car_prop",
+    "truck_prop",
+    "twowheeler_prop",
+]
+
+# Largest relative error accepted when downcasting a column to float32;
+# float32 rounding alone stays below 6e-8
+DEFAULT_RTOL = 1e-6
+
+
+def city_constants(
+    cities: Optional[Sequence[str]] = None, wards_per_city: int = 5
+) -> pd.DataFrame:
+    """
+    Build the per-city side table from the static config.
+
+    Values are per ward, exactly as DataAcquisition.generate_observations
+    writes them on every row.
+
+    Args:
+        cities (Optional[Sequence[str]]): The cities. Defaults to CITIES.
+        wards_per_city (int): The number of wards the city totals are split over.
+
+    Returns:
+        pd.DataFrame: One row per city, indexed by city_id.
+    """
+    cities = list(cities or CITIES)
+    return pd.DataFrame(
+        {
+            "forest_area_sqkm": [
+                FOREST_COVER_DATA[city]["area_sqkm"] / wards_per_city for city in cities
+            ],
+            "total_vehicles": [
+                VEHICLE_DATA[city]["total_vehicles"] / wards_per_city for city in cities
+            ],
+            "car_prop": [VEHICLE_DATA[city]["car_prop"] for city in cities],
+            "truck_prop": [VEHICLE_DATA[city]["truck_prop"] for city in cities],
+            "twowheeler_prop": [
+                VEHICLE_DATA[city]["twowheeler_prop"] for city in cities
+            ],
+        },
+        index=pd.Index(cities, name="city_id"),
+    )
+
+
+def constant_column(
+    df: pd.DataFrame, column: str, constants: Optional[pd.DataFrame] = None
+) -> pd.Series:
+    """
+    Return a per-city constant column, from the frame or looked up lazily.
+
+    Args:
+        df (pd.DataFrame): Rows with a city_id column.
+        column (str): One of CITY_CONSTANT_COLUMNS.
+        constants (Optional[pd.DataFrame]): The side table. Defaults to
+            city_constants().
+
+    Returns:
+        pd.Series: The column aligned with df.
+    """
+    if column in df.columns:
+        return df[column]
+    if constants is None:
+        constants = city_constants()
+    values = df["city_id"].map(constants[column])
+    # Mapping a categorical yields a categorical of the mapped values
+    return values.astype(constants[column].dtype).rename(column)
+
+
+def attach_constants(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    constants: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Join per-city constant columns back onto a compact frame.
+
+    Args:
+        df (pd.DataFrame): Rows with a city_id column.
+        columns (Optional[Sequence[str]]): The columns to attach. Defaults to
+            every constant column missing from df.
+        constants (Optional[pd.DataFrame]): The side table. Defaults to
+            city_constants().
+
+    Returns:
+        pd.DataFrame: The frame with the columns attached.
+    """
+    columns = [
+        col for col in (columns or CITY_CONSTANT_COLUMNS) if col not in df.columns
+    ]
+    if not columns:
+        return df
+    if constants is None:
+        constants = city_constants()
+    return df.assign(**{col: constant_column(df, col, constants) for col in columns})
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    constants: Optional[pd.DataFrame] = None,
+    rtol: float = DEFAULT_RTOL,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Shrink a feature table.
+
+    - float64 columns become float32 when every value round-trips within
+      ``rtol`` (relative to its magnitude);
+    - integer columns are downcast to the smallest integer type that fits;
+    - city_id and ward_id become categoricals;
+    - per-city constant columns are dropped when they equal the side table
+      exactly, to be attached again with attach_constants or read with
+      constant_column.
+
+    Args:
+        df (pd.DataFrame): The feature table.
+        constants (Optional[pd.DataFrame]): The side table. Defaults to
+            city_constants().
+        rtol (float): The largest accepted relative error of a downcast.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: The compact table and a report
+            with the memory before and after (including the side table), the
+            columns converted, kept or dropped, and the largest absolute and
+            relative deviation introduced by the float32 conversion.
+    """
+    if constants is None:
+        constants = city_constants()
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    columns: Dict[str, pd.Series] = {}
+    float32_columns, kept_float64, dropped = [], [], []
+    max_abs, max_rel = 0.0, 0.0
+
+    for column in df.columns:
+        series = df[column]
+
+        if column in CITY_CONSTANT_COLUMNS and "city_id" in df.columns:
+            expected = df["city_id"].map(constants[column]).astype("float64")
+            if series.astype("float64").equals(expected.rename(column)):
+                dropped.append(column)
+                continue
+
+        if column in ID_COLUMNS:
+            columns[column] = series.astype("category")
+        elif pd.api.types.is_float_dtype(series) and series.dtype == np.float64:
+            values = series.to_numpy()
+            narrowed = values.astype(np.float32)
+            with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+                error = np.abs(narrowed.astype(np.float64) - values)
+                scale = np.abs(values)
+                relative = np.where(scale > 0, error / scale, error)
+            finite = np.isfinite(values)
+            if np.all(np.isfinite(narrowed[finite])) and (
+                not finite.any() or np.nanmax(relative[finite]) <= rtol
+            ):
+                columns[column] = pd.Series(narrowed, index=series.index, name=column)
+                float32_columns.append(column)
+                if finite.any():
+                    max_abs = max(max_abs, float(np.nanmax(error[finite])))
+                    max_rel = max(max_rel, float(np.nanmax(relative[finite])))
+            else:
+                columns[column] = series
+                kept_float64.append(column)
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(
+            series
+        ):
+            columns[column] = pd.to_numeric(series, downcast="integer")
+        else:
+            columns[column] = series
+
+    compact = pd.DataFrame(columns, index=df.index)
+    bytes_after = int(compact.memory_usage(deep=True).sum())
+    if dropped:
+        bytes_after += int(constants[dropped].memory_usage(deep=True).sum())
+
+    report = {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "savings_pct": 100 * (1 - bytes_after / bytes_before) if bytes_before else 0.0,
+        "float32_columns": float32_columns,
+        "float64_columns": kept_float64,
+        "constant_columns": dropped,
+        "max_abs_deviation": max_abs,
+        "max_rel_deviation": max_rel,
+    }
+    logger.info(
+        f"Compact mode: {bytes_before / 1e6:.1f} MB -> {bytes_after / 1e6:.1f} MB "
+        f"({report['savings_pct']:.0f}% saved), max relative deviation "
+        f"{max_rel:.2e}"
+    )
+    return compact, report
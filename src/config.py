@@ -1,9 +1,11 @@
 """
 This module contains the configuration for the application.
 """
+
 import os
 from typing import List, Dict, Any
 
+
 # --- API Configuration ---
 class APIConfig:
     """
@@ -128,4 +130,176 @@ MODEL_CONFIG: Dict[str, Any] = {
     "n_estimators": 500,
     "learning_rate": 0.05,
     "early_stopping_rounds": 50,
+    # LightGBM parameters besides the objective, learning rate and seed
+    "lgb_params": {
+        "num_leaves": 31,
+        "feature_fraction": 0.8,
+        "bagging_fraction": 0.8,
+        "bagging_freq": 5,
+    },
+    # "scaled": label-encoded ids and StandardScaler; "native": categorical
+    # ids passed to LightGBM as they are, no scaling
+    "preprocessing": "scaled",
+    # Fit the three targets concurrently, splitting n_jobs cores between them
+    "parallel_targets": True,
+    "n_jobs": None,  # Defaults to the CPU count
+    # Binned LightGBM Datasets reused across trainings on the same features
+    "dataset_cache": {
+        "enabled": False,
+        "path": "data/cache/lgb_datasets/",
+        "max_disk_usage": "2GB",
+    },
+    # ModelTrainer.update: "continue" boosting or "refit" leaf values only
+    "update": {
+        "mode": "continue",
+        "rounds": 100,
+        "learning_rate": None,  # Defaults to the training learning rate
+        "refit_decay_rate": 0.9,
+        # Largest relative increase of validation RMSE an update may bring
+        "tolerance": 0.0,
+    },
+}
+
+# Provider response cache configuration
+CACHE_CONFIG: Dict[str, Any] = {
+    "path": "data/cache/provider_cache.sqlite",
+    "max_entries": 50000,
+    # Seconds a cached response is served without revalidation
+    "ttl_seconds": {
+        "traffic": 900,
+        "weather": 3600,
+        "ndvi": 86400,
+        "air_quality": 1800,
+    },
+    # Extra seconds a stale response may be served while it is refreshed
+    "stale_seconds": {
+        "traffic": 900,
+        "weather": 3 * 3600,
+        "ndvi": 7 * 86400,
+        "air_quality": 1800,
+    },
+    # Width of the time bucket that is part of the cache key
+    "bucket_seconds": {
+        "traffic": 3600,
+        "weather": 86400,
+        "ndvi": 86400,
+        "air_quality": 3600,
+    },
+}
+
+# Real-time acquisition configuration
+REALTIME_CONFIG: Dict[str, Any] = {
+    "wards_per_city": 5,
+    # Seconds between provider polls
+    "poll_interval_seconds": {
+        "traffic": 60,
+        "weather": 600,
+        "ndvi": 86400,
+        "air_quality": 300,
+    },
+    "queue_maxsize": 10000,
+    # Seconds a poller waits for queue space before dropping a reading
+    "enqueue_timeout_seconds": 1.0,
+    # Maximum readings applied per ward-state recompute
+    "batch_size": 1000,
+    # Number of recent lag samples kept for percentiles
+    "lag_window": 1000,
+}
+
+# Historical backfill configuration
+BACKFILL_CONFIG: Dict[str, Any] = {
+    "lake_path": "data/lake/",
+    "dataset": "observations",
+    "seed": 42,
+    # Days generated before each task so rolling windows are fully populated
+    "warmup_days": 30,
+    "max_workers": None,  # Defaults to the CPU count
+}
+
+# Incremental daily processing configuration
+INCREMENTAL_CONFIG: Dict[str, Any] = {
+    "lake_path": "data/lake/",
+    "source": "observations",
+    "target": "features",
+    # Days of existing observations read before the new ones; covers the
+    # longest rolling window (30 days)
+    "seed_days": 30,
+}
+
+# Rolling-origin cross-validation (src/cross_validation.py)
+CV_CONFIG: Dict[str, Any] = {
+    "n_folds": 5,
+    # Days in each fold's test block; the blocks are the last
+    # n_folds * test_days days, and each fold trains on every day before it
+    "test_days": 14,
+    # Days left out between the training window and the test block
+    "gap_days": 0,
+    # Trailing days of the training window held out for early stopping
+    "valid_days": 14,
+    "max_workers": None,  # Defaults to the CPU count
+    "output_path": "models/cv_report.json",
+}
+
+# Per-city model registry (src/model_registry.py)
+REGISTRY_CONFIG: Dict[str, Any] = {
+    "path": "models/registry/",
+    # The global model that serves cities without a model of their own
+    "fallback_path": "models/trained_model.pkl",
+    # Budget for loaded models, estimated from their file sizes; the least
+    # recently used city models are evicted past it
+    "max_memory": "512MB",
+    # Cities with fewer training rows are served by the fallback model
+    "min_rows": 200,
+    "max_workers": None,  # Defaults to the CPU count
+    # Optional city -> cluster name mapping; cities of a cluster share a model
+    "clusters": {},
+}
+
+# Serving variants compacted from the trained model (src/serving.py)
+SERVING_CONFIG: Dict[str, Any] = {
+    "path": "models/serving/",
+    # Variant the API serves: "full", "pruned", "distilled", or "auto" for
+    # the most accurate one within latency_budget_us
+    "variant": "full",
+    "latency_budget_us": None,  # Per row of a batch predict()
+    # The "pruned" variant keeps the fewest trees whose validation RMSE is
+    # within this share of the best, checked every tree_step iterations
+    "rmse_tolerance": 0.02,
+    "tree_step": 25,
+    # One ensemble shared by the targets, trained on the model's predictions;
+    # num_leaves is split between the targets by the forced first splits
+    "distill": {
+        "enabled": False,
+        "n_estimators": 1000,
+        "learning_rate": 0.1,
+        "num_leaves": 93,
+        "early_stopping_rounds": 50,
+    },
+    "latency_rows": 200,  # Rows timed per variant
+}
+
+# Hyperparameter search configuration
+TUNING_CONFIG: Dict[str, Any] = {
+    "n_trials": 24,
+    "max_workers": None,  # Defaults to the CPU count
+    "time_budget_seconds": 600,
+    "seed": 42,
+    # Share of the training rows held out to early-stop and rank the trials
+    "valid_size": 0.2,
+    # Iterations between checks of a trial against the leaders
+    "prune_interval": 25,
+    # A trial is pruned when its validation RMSE at a checkpoint is worse than
+    # this percentile of the trials that finished before it started
+    "prune_percentile": 50,
+    "min_trials_to_prune": 3,
+    "output_path": "models/tuning/",
+    # Per parameter: ["float" | "log" | "int", low, high]; binning parameters
+    # such as max_bin stay fixed so every trial shares one binned Dataset
+    "search_space": {
+        "learning_rate": ["log", 0.01, 0.2],
+        "num_leaves": ["int", 15, 127],
+        "feature_fraction": ["float", 0.6, 1.0],
+        "bagging_fraction": ["float", 0.6, 1.0],
+        "lambda_l2": ["log", 1e-3, 10.0],
+    },
 }
@@ -0,0 +1,317 @@
+"""
+This module contains rolling-origin cross-validation, which trains on every
+ward's days before a cut-off date and tests on the days after it, running the
+folds on a process pool over one shared, memory-mapped feature matrix.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from src.config import CV_CONFIG
+from src.dataset_cache import binning_params
+from src.model_trainer import ModelTrainer
+from src.utils import calculate_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def rolling_origin_splits(
+    dates: pd.Series,
+    n_folds: int,
+    test_days: int,
+    gap_days: int = 0,
+    valid_days: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    Cut a date-sorted table into expanding-window folds.
+
+    The test blocks are consecutive runs of ``test_days`` days at the end of
+    the table. Each fold trains on every day before its block, less
+    ``gap_days``, and holds the last ``valid_days`` of those out for early
+    stopping. Every ward's rows of a day fall on the same side of a cut, so
+    no ward is trained on its own future.
+
+    Args:
+        dates (pd.Series): The date of every row, sorted ascending.
+        n_folds (int): The number of folds.
+        test_days (int): Days per test block.
+        gap_days (int): Days dropped between the training window and the
+            test block.
+        valid_days (int): Trailing training days used for early stopping.
+
+    Returns:
+        List[Dict[str, Any]]: Per fold, the row ranges ``train`` (start,
+            stop), ``valid`` and ``test``, and the first and last test day.
+    """
+    values = pd.to_datetime(dates).to_numpy()
+    if len(values) and (np.diff(values) < np.timedelta64(0)).any():
+        raise ValueError("Rows must be sorted by date")
+
+    days = np.unique(values)
+    if len(days) < n_folds * test_days + gap_days + valid_days + 1:
+        raise ValueError(
+            f"{len(days)} days cannot hold {n_folds} folds of {test_days} days "
+            f"after {gap_days} gap and {valid_days} validation days"
+        )
+
+    def row(day_index: int) -> int:
+        if day_index >= len(days):
+            return len(values)
+        return int(np.searchsorted(values, days[day_index], side="left"))
+
+    folds = []
+    first_test = len(days) - n_folds * test_days
+    for fold in range(n_folds):
+        test_start = first_test + fold * test_days
+        train_stop = test_start - gap_days
+        valid_start = train_stop - valid_days
+        folds.append(
+            {
+                "fold": fold,
+                "train": (0, row(valid_start)),
+                "valid": (row(valid_start), row(train_stop)),
+                "test": (row(test_start), row(test_start + test_days)),
+                "test_start": str(pd.Timestamp(days[test_start]).date()),
+                "test_end": str(pd.Timestamp(days[test_start + test_days - 1]).date()),
+            }
+        )
+    return folds
+
+
+def run_fold(
+    fold: Dict[str, Any],
+    matrix_path: str,
+    labels_path: str,
+    targets: List[str],
+    params: Dict[str, Any],
+    categorical: List[int],
+    n_estimators: int,
+    early_stopping_rounds: int,
+) -> Dict[str, Any]:
+    """
+    Train and test every target of one fold.
+
+    The matrix is memory-mapped and every window is a contiguous row range,
+    so a worker reads its rows from the shared page cache without copying
+    the table. The fold's training window is binned once for all targets.
+
+    Args:
+        fold (Dict[str, Any]): A fold from rolling_origin_splits.
+        matrix_path (str): The feature matrix (.npy).
+        labels_path (str): The target matrix (.npy), one column per target.
+        targets (List[str]): The target names.
+        params (Dict[str, Any]): LightGBM parameters.
+        categorical (List[int]): Column positions of categorical features.
+        n_estimators (int): The largest number of boosting rounds.
+        early_stopping_rounds (int): Rounds without improvement before stopping.
+
+    Returns:
+        Dict[str, Any]: The fold's windows, per-target metrics and best
+            iterations, overall RMSE and seconds.
+    """
+    started = time.perf_counter()
+    matrix = np.load(matrix_path, mmap_mode="r")
+    labels = np.load(labels_path, mmap_mode="r")
+    train, valid, test = (slice(*fold[window]) for window in ("train", "valid", "test"))
+
+    train_set = lgb.Dataset(
+        matrix[train],
+        labels[train, 0],
+        params=binning_params(params),
+        categorical_feature=categorical or "auto",
+    )
+    valid_set = train_set.create_valid(matrix[valid], labels[valid, 0])
+
+    predictions = np.empty((test.stop - test.start, len(targets)))
+    record: Dict[str, Any] = {
+        **fold,
+        "rows": {
+            "train": train.stop - train.start,
+            "valid": valid.stop - valid.start,
+            "test": test.stop - test.start,
+        },
+        "metrics": {},
+        "best_iterations": {},
+    }
+    for index, target in enumerate(targets):
+        if index:
+            train_set.set_label(labels[train, index])
+            valid_set.set_label(labels[valid, index])
+        booster = lgb.train(
+            params,
+            train_set,
+            num_boost_round=n_estimators,
+            valid_sets=[valid_set],
+            callbacks=[lgb.early_stopping(early_stopping_rounds, verbose=False)],
+        )
+        predictions[:, index] = booster.predict(matrix[test])
+        record["best_iterations"][target] = booster.best_iteration
+        record["metrics"][target] = {
+            name: float(value)
+            for name, value in calculate_metrics(
+                labels[test, index], predictions[:, index]
+            ).items()
+        }
+
+    record["overall_rmse"] = float(
+        np.sqrt(np.mean((np.asarray(labels[test]) - predictions) ** 2))
+    )
+    record["seconds"] = time.perf_counter() - started
+    return record
+
+
+def aggregate_folds(
+    folds: List[Dict[str, Any]], targets: List[str]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Average the per-target metrics of the folds.
+
+    Args:
+        folds (List[Dict[str, Any]]): Fold records from run_fold.
+        targets (List[str]): The target names.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per target, the mean and standard
+            deviation of each metric across folds.
+    """
+    summary = {}
+    for target in targets:
+        summary[target] = {}
+        for name in ("rmse", "mae", "r2"):
+            values = [fold["metrics"][target][name] for fold in folds]
+            summary[target][f"{name}_mean"] = float(np.mean(values))
+            summary[target][f"{name}_std"] = float(np.std(values))
+    return summary
+
+
+def cross_validate(
+    x_features: pd.DataFrame,
+    y_features: pd.DataFrame,
+    dates: pd.Series,
+    groups: Optional[pd.Series] = None,
+    cv_config: Optional[Dict[str, Any]] = None,
+    model_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run rolling-origin cross-validation with the folds on a process pool.
+
+    Rows are ordered by date and ward, prepared once as ModelTrainer does
+    (encoding and scaling are monotone, so the trees split the same way as
+    when they are fitted per fold) and written to a temporary .npy file
+    that every worker memory-maps. The ``n_jobs`` core budget is split
+    between the workers; the latest, largest folds are submitted first.
+
+    Args:
+        x_features (pd.DataFrame): The input features.
+        y_features (pd.DataFrame): The target features.
+        dates (pd.Series): The date of every row.
+        groups (Optional[pd.Series]): The ward of every row, used to order
+            the rows of a day and to count wards per fold.
+        cv_config (Optional[Dict[str, Any]]): Overrides of CV_CONFIG.
+        model_config (Optional[Dict[str, Any]]): Overrides of MODEL_CONFIG.
+
+    Returns:
+        Dict[str, Any]: Per-fold records, the per-target aggregate and wall
+            time. The report is also written to ``output_path``.
+    """
+    cv = {**CV_CONFIG, **(cv_config or {})}
+    started = time.perf_counter()
+
+    keys = pd.DataFrame({"date": pd.to_datetime(dates).to_numpy()})
+    if groups is not None:
+        keys["group"] = groups.astype(str).to_numpy()
+    order = keys.sort_values(list(keys.columns), kind="stable").index.to_numpy()
+    x_sorted = x_features.iloc[order].reset_index(drop=True)
+    y_sorted = y_features.iloc[order].reset_index(drop=True)
+    keys = keys.iloc[order].reset_index(drop=True)
+
+    folds = rolling_origin_splits(
+        keys["date"], cv["n_folds"], cv["test_days"], cv["gap_days"], cv["valid_days"]
+    )
+    if groups is not None:
+        for fold in folds:
+            fold["wards"] = int(keys["group"].iloc[slice(*fold["test"])].nunique())
+
+    trainer = ModelTrainer(use_dataset_cache=False, config=model_config)
+    x_processed = trainer.prepare_features(x_sorted, y_sorted)
+    categorical: List[int] = []
+    if trainer.config.get("preprocessing", "scaled") == "native":
+        matrix = trainer.native_matrix(x_sorted)
+        categorical = [trainer.feature_names.index(col) for col in trainer.categories]
+    else:
+        matrix = x_processed.to_numpy(dtype=np.float64)
+
+    workers = min(cv["max_workers"] or os.cpu_count() or 1, len(folds))
+    threads = max(1, (trainer.config.get("n_jobs") or os.cpu_count() or 1) // workers)
+    params = {**trainer.lgb_params(), "num_threads": threads}
+    targets = list(y_features.columns)
+
+    directory = tempfile.mkdtemp(prefix="cv-")
+    try:
+        matrix_path = os.path.join(directory, "features.npy")
+        labels_path = os.path.join(directory, "labels.npy")
+        np.save(matrix_path, np.ascontiguousarray(matrix))
+        np.save(labels_path, y_sorted.to_numpy(dtype=np.float64))
+        del matrix, x_processed
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    run_fold,
+                    fold,
+                    matrix_path,
+                    labels_path,
+                    targets,
+                    params,
+                    categorical,
+                    trainer.config["n_estimators"],
+                    trainer.config["early_stopping_rounds"],
+                )
+                for fold in reversed(folds)
+            ]
+            results = sorted(
+                (future.result() for future in futures),
+                key=lambda record: record["fold"],
+            )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    for record in results:
+        logger.info(
+            f"Fold {record['fold']} ({record['test_start']} to "
+            f"{record['test_end']}): RMSE {record['overall_rmse']:.4g} "
+            f"in {record['seconds']:.1f}s"
+        )
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "config": {key: cv[key] for key in cv if key != "output_path"},
+        "workers": workers,
+        "threads_per_fold": threads,
+        "wall_seconds": time.perf_counter() - started,
+        "folds": results,
+        "aggregate": aggregate_folds(results, targets),
+        "overall_rmse_mean": float(np.mean([r["overall_rmse"] for r in results])),
+    }
+
+    output_path = cv["output_path"]
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    logger.info(
+        f"Cross-validation of {len(results)} folds finished in "
+        f"{report['wall_seconds']:.1f}s, mean RMSE {report['overall_rmse_mean']:.4g}"
+    )
+    return report
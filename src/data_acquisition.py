@@ -1,29 +1,58 @@
 """
 This module is responsible for acquiring data from various sources.
 """
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from src.compact import compact_frame
 from src.config import CITIES, FOREST_COVER_DATA, VEHICLE_DATA
+from src.provider_cache import ProviderCache, cached_provider
 from src.utils import create_time_features, calculate_rolling_features
 
 logger = logging.getLogger(__name__)
 
+# Columns that get rolling mean/std features
+ROLLING_FEATURE_COLUMNS: List[str] = [
+    "traffic_index_0_100",
+    "median_ndvi",
+    "max_temp_c",
+]
+
 
 class DataAcquisition:
     """
     A class to acquire data from various sources.
     """
 
-    def get_traffic_data(self, city: str) -> Dict[str, Any]:
+    def __init__(self, cache: Optional[ProviderCache] = None) -> None:
+        """
+        Initializes the DataAcquisition.
+
+        Args:
+            cache (Optional[ProviderCache]): Cache placed in front of the
+                provider getters. Defaults to None (always call the provider).
+        """
+        self.cache = cache
+
+    @cached_provider("traffic")
+    def get_traffic_data(
+        self,
+        city: str,
+        as_of: Optional[datetime] = None,
+        ward: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Get traffic data for a city using Google Maps API.
         In production, this would use real API calls.
 
         Args:
             city (str): The city for which to get traffic data.
+            as_of (Optional[datetime]): The time the data should describe.
+            ward (Optional[str]): The ward the data should describe; cached
+                apart from the city's other wards.
 
         Returns:
             Dict[str, Any]: A dictionary containing traffic data.
@@ -59,15 +88,25 @@ class DataAcquisition:
                 "traffic_index": 50,
                 "avg_speed_kph": 30,
                 "timestamp": datetime.now(),
+                "fallback": True,
             }
 
-    def get_weather_data(self, city: str) -> Dict[str, Any]:
+    @cached_provider("weather")
+    def get_weather_data(
+        self,
+        city: str,
+        as_of: Optional[datetime] = None,
+        ward: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Get weather data using OpenWeatherMap API.
         Mock implementation - replace with actual API calls.
 
         Args:
             city (str): The city for which to get weather data.
+            as_of (Optional[datetime]): The time the data should describe.
+            ward (Optional[str]): The ward the data should describe; cached
+                apart from the city's other wards.
 
         Returns:
             Dict[str, Any]: A dictionary containing weather data.
@@ -97,20 +136,33 @@ class DataAcquisition:
                 "wind_speed_ms": 3,
                 "pressure_hpa": 1013,
                 "timestamp": datetime.now(),
+                "fallback": True,
             }
 
-    def get_ndvi_data(self) -> Dict[str, Any]:
+    @cached_provider("ndvi")
+    def get_ndvi_data(
+        self,
+        city: Optional[str] = None,
+        as_of: Optional[datetime] = None,
+        ward: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Calculate NDVI using Google Earth Engine.
         Mock implementation - replace with actual GEE integration.
 
+        Args:
+            city (Optional[str]): The city whose boundary to aggregate over.
+            as_of (Optional[datetime]): The time the data should describe.
+            ward (Optional[str]): The ward the data should describe; cached
+                apart from the city's other wards.
+
         Returns:
             Dict[str, Any]: A dictionary containing NDVI data.
         """
         try:
             # This would normally use Google Earth Engine
             # For now, return mock NDVI data with seasonal variation
-            month = datetime.now().month
+            month = (as_of or datetime.now()).month
             # Higher NDVI in monsoon months (June-Sept)
             seasonal_factor = 1.2 if 6 <= month <= 9 else 1.0
             base_ndvi = np.random.uniform(0.3, 0.6) * seasonal_factor
@@ -129,15 +181,25 @@ class DataAcquisition:
                 "mean_ndvi": 0.48,
                 "ndvi_std": 0.05,
                 "timestamp": datetime.now(),
+                "fallback": True,
             }
 
-    def get_air_quality_data(self, city: str) -> Dict[str, Any]:
+    @cached_provider("air_quality")
+    def get_air_quality_data(
+        self,
+        city: str,
+        as_of: Optional[datetime] = None,
+        ward: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Get real-time air quality data from CPCB/SAFAR.
         Mock implementation - replace with actual API calls.
 
         Args:
             city (str): The city for which to get air quality data.
+            as_of (Optional[datetime]): The time the data should describe.
+            ward (Optional[str]): The ward the data should describe; cached
+                apart from the city's other wards.
 
         Returns:
             Dict[str, Any]: A dictionary containing air quality data.
@@ -161,39 +223,42 @@ class DataAcquisition:
                 "nox_ug_m3": 80,
                 "aqi": 300,
                 "timestamp": datetime.now(),
+                "fallback": True,
             }
 
-    def generate_training_data(
-        self, start_date: str = "2023-01-01", days: int = 180
+    def generate_observations(
+        self,
+        start_date: str = "2023-01-01",
+        days: int = 180,
+        cities: Optional[List[str]] = None,
     ) -> pd.DataFrame:
         """
-        Generate comprehensive training data with realistic patterns.
+        Generate raw daily ward observations, without derived features.
 
         Args:
             start_date (str): The start date for generating data.
             days (int): The number of days for which to generate data.
+            cities (Optional[List[str]]): The cities to include. Defaults to CITIES.
 
         Returns:
-            pd.DataFrame: A DataFrame containing the generated training data.
+            pd.DataFrame: One row per ward and day.
         """
-        logger.info("Generating training data...")
-
         data_list = []
         current_date = datetime.strptime(start_date, "%Y-%m-%d")
 
         for i in range(days):
             date = current_date + timedelta(days=i)
 
-            for city in CITIES:
+            for city in cities or CITIES:
                 # Create multiple wards per city
                 for ward_id in range(1, 6):  # 5 wards per city
                     ward_key = f"{city}_W{ward_id}"
 
                     # Get simulated real-time data
-                    traffic_data = self.get_traffic_data(city)
-                    weather_data = self.get_weather_data(city)
-                    ndvi_data = self.get_ndvi_data()  # Pass actual boundary in production
-                    aq_data = self.get_air_quality_data(city)
+                    traffic_data = self.get_traffic_data(city, date, ward_key)
+                    weather_data = self.get_weather_data(city, date, ward_key)
+                    ndvi_data = self.get_ndvi_data(city, date, ward_key)
+                    aq_data = self.get_air_quality_data(city, date, ward_key)
 
                     # Calculate ward-specific forest area (distribute total city area)
                     total_wards = 5
@@ -221,13 +286,58 @@ class DataAcquisition:
 
                     data_list.append(record)
 
-        df = pd.DataFrame(data_list)
+        return pd.DataFrame(data_list)
+
+    def generate_training_data(
+        self,
+        start_date: str = "2023-01-01",
+        days: int = 180,
+        cities: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        compact: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Generate comprehensive training data with realistic patterns.
+
+        Args:
+            start_date (str): The start date for generating data.
+            days (int): The number of days for which to generate data.
+            cities (Optional[List[str]]): The cities to include. Defaults to CITIES.
+            max_workers (Optional[int]): If given, compute rolling features per
+                city on a process pool of this size; the result is identical.
+            compact (bool): Return the compact table: float32 numerics,
+                categorical ids and the per-city constants left to
+                src.compact.city_constants.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing the generated training data.
+        """
+        logger.info("Generating training data...")
+
+        df = self.generate_observations(start_date, days, cities)
 
         # Add time-based features
         df = create_time_features(df)
-        df = calculate_rolling_features(
-            df, ["traffic_index_0_100", "median_ndvi", "max_temp_c"]
-        )
+        if max_workers:
+            from src.parallel_features import engineer_features_parallel
+
+            df, _ = engineer_features_parallel(
+                df,
+                ROLLING_FEATURE_COLUMNS,
+                sequestration=False,
+                max_workers=max_workers,
+            )
+        else:
+            df = calculate_rolling_features(df, ROLLING_FEATURE_COLUMNS)
+
+        if compact:
+            df, _ = compact_frame(df)
 
         logger.info(f"Generated training data with {len(df)} records")
+        if self.cache is not None:
+            stats = self.cache.stats()
+            logger.info(
+                f"Provider cache hit rate: {stats['hit_rate']:.1%} "
+                f"({stats['misses']} provider calls)"
+            )
         return df
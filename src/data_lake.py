@@ -0,0 +1,381 @@
+"""
+This module contains the ParquetDataLake class, which stores observations and
+engineered features as compressed Parquet partitioned by city and month.
+"""
+import os
+import uuid
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[str, datetime, pd.Timestamp]
+
+
+class ParquetDataLake:
+    """
+    Hive-style Parquet store laid out as
+    ``<root>/<dataset>/city_id=<city>/month=<YYYY-MM>/part-<first>-<last>.parquet``.
+
+    Readers list only the partition directories and part files whose city and
+    date range overlap the request, so a single city-month never touches the
+    rest of the data.
+    """
+
+    def __init__(
+        self,
+        root: str = "data/lake/",
+        compression: str = "zstd",
+        partition_column: str = "city_id",
+        date_column: str = "daily_date",
+    ) -> None:
+        """
+        Initializes the ParquetDataLake.
+
+        Args:
+            root (str): The root directory of the lake.
+            compression (str): The Parquet compression codec.
+            partition_column (str): The column holding the city.
+            date_column (str): The column holding the observation date.
+        """
+        self.root = root
+        self.compression = compression
+        self.partition_column = partition_column
+        self.date_column = date_column
+
+    def dataset_path(self, dataset: str) -> str:
+        """Return the directory of a dataset."""
+        return os.path.join(self.root, dataset)
+
+    def exists(self, dataset: str) -> bool:
+        """Return True if the dataset has at least one partition."""
+        return len(self.list_partitions(dataset)) > 0
+
+    def write(self, df: pd.DataFrame, dataset: str, mode: str = "append") -> List[str]:
+        """
+        Write a frame to the lake, one part file per city-month.
+
+        Args:
+            df (pd.DataFrame): Rows with city and date columns.
+            dataset (str): The dataset name, e.g. "observations" or "features".
+            mode (str): "append" adds part files to existing partitions
+                (re-appending the same date range replaces that part);
+                "replace" also removes the frame's days from the other part
+                files of each partition it touches; "overwrite" replaces every
+                partition the frame touches.
+
+        Returns:
+            List[str]: The paths of the written part files.
+        """
+        if mode not in ("append", "replace", "overwrite"):
+            raise ValueError(f"Unsupported write mode: {mode}")
+
+        missing = [
+            col
+            for col in (self.partition_column, self.date_column)
+            if col not in df.columns
+        ]
+        if missing:
+            raise ValueError(f"Missing partition columns: {missing}")
+
+        dates = pd.to_datetime(df[self.date_column])
+        months = dates.dt.strftime("%Y-%m")
+        written = []
+
+        for (city, month), index in df.groupby(
+            [df[self.partition_column].astype(str), months], observed=True
+        ).groups.items():
+            part = df.loc[index].copy()
+            part[self.date_column] = dates.loc[index]
+            part = part.sort_values(self.date_column)
+
+            directory = os.path.join(
+                self.dataset_path(dataset),
+                f"{self.partition_column}={city}",
+                f"month={month}",
+            )
+            if mode == "overwrite" and os.path.isdir(directory):
+                for name in os.listdir(directory):
+                    if name.endswith(".parquet"):
+                        os.remove(os.path.join(directory, name))
+            os.makedirs(directory, exist_ok=True)
+
+            first = part[self.date_column].iloc[0].strftime("%Y%m%d")
+            last = part[self.date_column].iloc[-1].strftime("%Y%m%d")
+            path = os.path.join(directory, f"part-{first}-{last}.parquet")
+
+            # Write to a temporary name first so readers never see a partial file
+            tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}.tmp")
+            table = pa.Table.from_pandas(part, preserve_index=False)
+            pq.write_table(table, tmp_path, compression=self.compression)
+            os.replace(tmp_path, path)
+            written.append(path)
+
+            if mode == "replace":
+                self._remove_days(
+                    directory,
+                    part[self.date_column].iloc[0],
+                    part[self.date_column].iloc[-1],
+                    keep=path,
+                )
+
+        logger.info(
+            f"Wrote {len(df)} rows to {len(written)} partition files of '{dataset}'"
+        )
+        return written
+
+    def _remove_days(
+        self, directory: str, first: pd.Timestamp, last: pd.Timestamp, keep: str
+    ) -> None:
+        """
+        Remove the days from ``first`` to ``last`` from a partition's part files.
+
+        Parts lying within the range are deleted; parts overlapping it are
+        rewritten with their remaining rows and renamed after their new first
+        and last day.
+
+        Args:
+            directory (str): The partition directory.
+            first (pd.Timestamp): The first day to remove.
+            last (pd.Timestamp): The last day to remove.
+            keep (str): The part file that holds those days now.
+        """
+        first_day, last_day = first.normalize(), last.normalize()
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if path == keep or not (
+                name.startswith("part-") and name.endswith(".parquet")
+            ):
+                continue
+            start, end = name[len("part-") : -len(".parquet")].split("-")
+            if pd.Timestamp(end) < first_day or pd.Timestamp(start) > last_day:
+                continue
+
+            table = pq.read_table(path)
+            days = pd.to_datetime(
+                table.column(self.date_column).to_pandas()
+            ).dt.normalize()
+            outside = ~days.between(first_day, last_day)
+            if outside.any():
+                remaining = days[outside]
+                new_path = os.path.join(
+                    directory,
+                    f"part-{remaining.min():%Y%m%d}-{remaining.max():%Y%m%d}.parquet",
+                )
+                tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}.tmp")
+                pq.write_table(
+                    table.filter(pa.array(outside.to_numpy())),
+                    tmp_path,
+                    compression=self.compression,
+                )
+                os.replace(tmp_path, new_path)
+                if new_path == path:
+                    continue
+            os.remove(path)
+
+    def list_partitions(
+        self,
+        dataset: str,
+        cities: Optional[Iterable[str]] = None,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> List[Tuple[str, str, str]]:
+        """
+        List the partitions that overlap a city set and date range.
+
+        Args:
+            dataset (str): The dataset name.
+            cities (Optional[Iterable[str]]): Cities to keep. Defaults to all.
+            start_date (Optional[DateLike]): Inclusive lower date bound.
+            end_date (Optional[DateLike]): Inclusive upper date bound.
+
+        Returns:
+            List[Tuple[str, str, str]]: (city, month, directory) tuples.
+        """
+        root = self.dataset_path(dataset)
+        if not os.path.isdir(root):
+            return []
+
+        wanted = set(cities) if cities is not None else None
+        start_month = (
+            pd.Timestamp(start_date).strftime("%Y-%m")
+            if start_date is not None
+            else None
+        )
+        end_month = (
+            pd.Timestamp(end_date).strftime("%Y-%m") if end_date is not None else None
+        )
+        prefix = f"{self.partition_column}="
+        partitions = []
+
+        for city_dir in sorted(os.listdir(root)):
+            if not city_dir.startswith(prefix):
+                continue
+            city = city_dir[len(prefix) :]
+            if wanted is not None and city not in wanted:
+                continue
+
+            for month_dir in sorted(os.listdir(os.path.join(root, city_dir))):
+                if not month_dir.startswith("month="):
+                    continue
+                month = month_dir[len("month=") :]
+                if start_month is not None and month < start_month:
+                    continue
+                if end_month is not None and month > end_month:
+                    continue
+                partitions.append(
+                    (city, month, os.path.join(root, city_dir, month_dir))
+                )
+
+        return partitions
+
+    def list_files(
+        self,
+        dataset: str,
+        cities: Optional[Iterable[str]] = None,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> List[str]:
+        """
+        List the part files that may hold rows for a city set and date range.
+
+        Part files are named after the first and last date they contain, so
+        files entirely outside the range are skipped without being opened.
+
+        Args:
+            dataset (str): The dataset name.
+            cities (Optional[Iterable[str]]): Cities to keep. Defaults to all.
+            start_date (Optional[DateLike]): Inclusive lower date bound.
+            end_date (Optional[DateLike]): Inclusive upper date bound.
+
+        Returns:
+            List[str]: The matching part file paths.
+        """
+        start = (
+            pd.Timestamp(start_date).strftime("%Y%m%d")
+            if start_date is not None
+            else None
+        )
+        end = (
+            pd.Timestamp(end_date).strftime("%Y%m%d") if end_date is not None else None
+        )
+        files = []
+
+        for _, _, directory in self.list_partitions(
+            dataset, cities, start_date, end_date
+        ):
+            for name in sorted(os.listdir(directory)):
+                if not (name.startswith("part-") and name.endswith(".parquet")):
+                    continue
+                first, last = name[len("part-") : -len(".parquet")].split("-")
+                if start is not None and last < start:
+                    continue
+                if end is not None and first > end:
+                    continue
+                files.append(os.path.join(directory, name))
+
+        return files
+
+    def read(
+        self,
+        dataset: str,
+        columns: Optional[List[str]] = None,
+        cities: Optional[Iterable[str]] = None,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+    ) -> pd.DataFrame:
+        """
+        Read a dataset with column projection and partition pruning.
+
+        Args:
+            dataset (str): The dataset name.
+            columns (Optional[List[str]]): Columns to load. Defaults to all.
+            cities (Optional[Iterable[str]]): Cities to keep. Defaults to all.
+            start_date (Optional[DateLike]): Inclusive lower date bound.
+            end_date (Optional[DateLike]): Inclusive upper date bound.
+
+        Returns:
+            pd.DataFrame: The matching rows.
+        """
+        files = self.list_files(dataset, cities, start_date, end_date)
+        if not files:
+            logger.warning(f"No partitions of '{dataset}' match the request")
+            return pd.DataFrame(columns=columns)
+
+        filter_dates = start_date is not None or end_date is not None
+        read_columns = columns
+        if columns is not None and filter_dates and self.date_column not in columns:
+            read_columns = list(columns) + [self.date_column]
+
+        table = pa.concat_tables(
+            [pq.read_table(path, columns=read_columns) for path in files],
+            promote_options="default",
+        )
+        df = table.to_pandas()
+
+        if filter_dates:
+            mask = pd.Series(True, index=df.index)
+            if start_date is not None:
+                mask &= df[self.date_column] >= pd.Timestamp(start_date)
+            if end_date is not None:
+                mask &= df[self.date_column] <= pd.Timestamp(end_date)
+            df = df[mask].reset_index(drop=True)
+
+        if columns is not None:
+            df = df[list(columns)]
+
+        logger.info(f"Read {len(df)} rows from {len(files)} files of '{dataset}'")
+        return df
+
+    def columns(self, dataset: str) -> List[str]:
+        """
+        Return the column names of a dataset from a Parquet footer.
+
+        Args:
+            dataset (str): The dataset name.
+
+        Returns:
+            List[str]: The column names, or an empty list for a missing dataset.
+        """
+        files = self.list_files(dataset)
+        if not files:
+            return []
+        return pq.read_schema(files[0]).names
+
+    def count_rows(self, dataset: str) -> int:
+        """
+        Count the rows of a dataset from Parquet footers, without reading data.
+
+        Args:
+            dataset (str): The dataset name.
+
+        Returns:
+            int: The total number of rows.
+        """
+        return sum(pq.read_metadata(path).num_rows for path in self.list_files(dataset))
+
+    def latest_date(
+        self, dataset: str, cities: Optional[Iterable[str]] = None
+    ) -> Optional[pd.Timestamp]:
+        """
+        Return the last date stored for a city set, from part file names only.
+
+        Args:
+            dataset (str): The dataset name.
+            cities (Optional[Iterable[str]]): Cities to consider. Defaults to all.
+
+        Returns:
+            Optional[pd.Timestamp]: The latest date, or None for no data.
+        """
+        last_dates = [
+            os.path.basename(path)[len("part-") : -len(".parquet")].split("-")[1]
+            for path in self.list_files(dataset, cities)
+        ]
+        if not last_dates:
+            return None
+        return pd.Timestamp(max(last_dates))
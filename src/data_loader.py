@@ -2,33 +2,320 @@
 This module contains the DataLoader class, which is responsible for loading data from various sources.
 """
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import datetime
+import glob
+import json
+import operator
 import os
-from typing import Dict, Optional
+import yaml
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 import logging
 
+from src.file_cache import DEFAULT_CACHE_PATH, ParsedFileCache
+from src.utils import parse_size
+from src.validation import SchemaValidator, merge_reports
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config",
+    "data_config.yaml",
+)
+DEFAULT_CHUNK_SIZE = 10000
+
+REQUIRED_VEHICLE_COLUMNS: List[str] = [
+    "vehicle_type",
+    "fuel_type",
+    "distance",
+    "emissions",
+]
+
+# A row filter: (column, operator, value), e.g. ("city_id", "==", "Delhi")
+Filter = Tuple[str, str, Any]
+
+COLUMNAR_FORMATS: Dict[str, str] = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _filter_term(field: Any, op: str, value: Any, temporal: bool) -> Any:
+    """
+    Build one filter term; works on pyarrow dataset fields and pandas Series.
+    """
+    if temporal:
+        value = (
+            [pd.Timestamp(v) for v in value]
+            if op in ("in", "not in")
+            else pd.Timestamp(value)
+        )
+
+    if op in _COMPARISONS:
+        return _COMPARISONS[op](field, value)
+    if op == "in":
+        return field.isin(list(value))
+    if op == "not in":
+        return ~field.isin(list(value))
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+def _filter_expression(filters: Sequence[Filter], schema: Any) -> Any:
+    """Combine filters into a pyarrow dataset expression evaluated at scan time."""
+    expression = None
+    for column, op, value in filters:
+        field_type = schema.field(column).type
+        term = _filter_term(
+            ds.field(column),
+            op,
+            value,
+            pa.types.is_timestamp(field_type) or pa.types.is_date(field_type),
+        )
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _is_temporal_value(value: Any) -> bool:
+    """Return whether a filter value (or every value of a list) is a date."""
+    if isinstance(value, (list, tuple, set)):
+        return bool(value) and all(_is_temporal_value(v) for v in value)
+    return isinstance(value, (datetime.date, np.datetime64))
+
+
+def _filter_mask(df: pd.DataFrame, filters: Sequence[Filter]) -> pd.Series:
+    """
+    Combine filters into a boolean row mask.
+
+    Row formats such as CSV read dates as strings; a column compared with
+    dates is parsed first, as the columnar scan would see it.
+    """
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        field = df[column]
+        temporal = pd.api.types.is_datetime64_any_dtype(field)
+        if not temporal and _is_temporal_value(value):
+            field = pd.to_datetime(field)
+            temporal = True
+        mask &= _filter_term(field, op, value, temporal)
+    return mask
+
+
+def _load_log_file(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    dtypes: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Read one file of a multi-file directory.
+
+    JSON files may hold a single record or a list of records, as API logs
+    usually do; nested fields are flattened to dotted column names. Every
+    file becomes its own frame, so a malformed file fails alone and is
+    reported by the caller. Defined at module level so process pools can
+    pickle it.
+    """
+    if file_path.lower().endswith(".json"):
+        with open(file_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        records = records if isinstance(records, list) else [records]
+        if not all(isinstance(record, dict) for record in records):
+            raise ValueError("JSON records must be objects")
+        df = pd.json_normalize(records)
+    else:
+        df = DataLoader.read_file(file_path)
+    # Align column names across exports, which sometimes pad their headers
+    df.columns = [str(col).strip() for col in df.columns]
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    if dtypes:
+        df = df.astype({k: v for k, v in dtypes.items() if k in df.columns})
+    return df
+
 
 class DataLoader:
     """
     Enhanced data loader with error handling and validation.
     """
 
-    def __init__(self, data_path: str = "data/"):
+    def __init__(
+        self,
+        data_path: str = "data/",
+        config: Optional[Dict] = None,
+        use_cache: Optional[bool] = None,
+    ):
         """
         Initializes the DataLoader.
 
         Args:
             data_path (str): The path to the data directory.
+            config (Optional[Dict]): The parsed data_config.yaml. Defaults to
+                the repository's config file when it exists.
+            use_cache (Optional[bool]): Cache parsed files on disk. Defaults to
+                processing.cache.enabled from the config.
         """
         self.data_path = data_path
+        if config is None and os.path.exists(DEFAULT_CONFIG_PATH):
+            with open(DEFAULT_CONFIG_PATH, "r") as f:
+                config = yaml.safe_load(f)
+        self.config = config or {}
+
+        processing = self.config.get("data_processing", {}).get("processing", {})
+        self.chunk_size: int = processing.get("chunk_size", DEFAULT_CHUNK_SIZE)
+
+        self.validators: Dict[str, SchemaValidator] = {
+            dataset: SchemaValidator.from_config(self.config, dataset)
+            for dataset in ("vehicle_data", "forest_data")
+        }
+        if not self.validators["vehicle_data"].required_columns:
+            self.validators["vehicle_data"].required_columns = list(
+                REQUIRED_VEHICLE_COLUMNS
+            )
+        self.last_validation_report: Optional[Dict[str, Any]] = None
 
-    def load_vehicle_data(self, file_path: str) -> pd.DataFrame:
+        cache_config = processing.get("cache", {})
+        if use_cache is None:
+            use_cache = cache_config.get("enabled", False)
+        self.cache: Optional[ParsedFileCache] = None
+        if use_cache:
+            self.cache = ParsedFileCache(
+                cache_config.get("path", DEFAULT_CACHE_PATH),
+                parse_size(cache_config.get("max_disk_usage", "1GB")),
+            )
+
+    @staticmethod
+    def read_file(
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read a data file, auto-detecting its format.
+
+        Parquet, Feather and Arrow IPC files are scanned with pyarrow so that
+        the column projection and row filters are applied while reading;
+        row-group statistics let Parquet skip whole row groups. Row-oriented
+        formats apply the filters after parsing. ``dtypes`` are passed to the
+        CSV and Excel parsers; columnar files are cast after the scan.
+
+        Args:
+            file_path (str): The path to the data file.
+            columns (Optional[List[str]]): Columns to load. Defaults to all.
+            filters (Optional[Sequence[Filter]]): Row filters as
+                (column, op, value) tuples, combined with AND. Supported ops are
+                ==, !=, <, <=, >, >=, in and not in.
+            dtypes (Optional[Dict[str, Any]]): Column dtypes, e.g.
+                {"fuel_type": "category"}.
+
+        Returns:
+            pd.DataFrame: The loaded data.
+        """
+        filters = list(filters or [])
+        extension = os.path.splitext(file_path)[1].lower()
+
+        if extension in COLUMNAR_FORMATS:
+            dataset = ds.dataset(file_path, format=COLUMNAR_FORMATS[extension])
+            table = dataset.to_table(
+                columns=columns,
+                filter=_filter_expression(filters, dataset.schema) if filters else None,
+            )
+            df = table.to_pandas()
+            if dtypes:
+                df = df.astype({k: v for k, v in dtypes.items() if k in df.columns})
+            return df
+
+        # Filter columns must be read even when they are not projected
+        read_columns = columns
+        if columns is not None and filters:
+            read_columns = list(
+                dict.fromkeys(list(columns) + [column for column, _, _ in filters])
+            )
+
+        if extension == ".csv":
+            df = pd.read_csv(file_path, usecols=read_columns, dtype=dtypes)
+        elif extension in (".xlsx", ".xls"):
+            df = pd.read_excel(file_path, usecols=read_columns, dtype=dtypes)
+        elif extension in (".json", ".jsonl"):
+            df = pd.read_json(file_path, lines=extension == ".jsonl", dtype=dtypes)
+            if read_columns is not None:
+                df = df[read_columns]
+        else:
+            raise ValueError(f"Unsupported file format: {file_path}")
+
+        if filters:
+            df = df[_filter_mask(df, filters)].reset_index(drop=True)
+        if columns is not None:
+            df = df[list(columns)]
+        return df
+
+    def load_file(
+        self,
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read a data file through the parsed-file cache, if enabled.
+
+        Cached frames are keyed by the file's path, size and modification
+        time together with the read options, so an unchanged file is read
+        back from Feather instead of being parsed again.
+
+        Args:
+            file_path (str): The path to the data file.
+            columns (Optional[List[str]]): Columns to load. Defaults to all.
+            filters (Optional[Sequence[Filter]]): Row filters, see read_file.
+            dtypes (Optional[Dict[str, Any]]): Column dtypes, see read_file.
+
+        Returns:
+            pd.DataFrame: The loaded data.
+        """
+        if self.cache is None:
+            return self.read_file(file_path, columns, filters, dtypes)
+        return self.cache.get_or_parse(
+            file_path,
+            lambda: self.read_file(file_path, columns, filters, dtypes),
+            columns=columns,
+            filters=filters,
+            dtypes=dtypes,
+        )
+
+    def load_vehicle_data(
+        self,
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> pd.DataFrame:
         """
         Load and validate vehicle emissions data.
 
+        Missing required columns raise; type, range and allowed-value checks
+        from data_config.yaml are reported in last_validation_report.
+
         Args:
             file_path (str): The path to the vehicle data file.
+            columns (Optional[List[str]]): Columns to load. Defaults to all.
+            filters (Optional[Sequence[Filter]]): Row filters, see read_file.
+            dtypes (Optional[Dict[str, Any]]): Column dtypes, see read_file.
 
         Returns:
             pd.DataFrame: The loaded vehicle data.
@@ -37,22 +324,10 @@ class DataLoader:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Data file not found: {file_path}")
 
-            # Auto-detect file type and load
-            if file_path.endswith(".csv"):
-                df = pd.read_csv(file_path)
-            elif file_path.endswith((".xlsx", ".xls")):
-                df = pd.read_excel(file_path)
-            elif file_path.endswith(".json"):
-                df = pd.read_json(file_path)
-            else:
-                raise ValueError(f"Unsupported file format: {file_path}")
-
-            # Validate required columns
-            required_columns = ["vehicle_type", "fuel_type", "distance", "emissions"]
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            df = self.load_file(file_path, columns, filters, dtypes)
 
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
+            self._check_columns("vehicle_data", df.columns, columns)
+            df = self._validate("vehicle_data", df, columns)
 
             logger.info(f"Successfully loaded vehicle data with {len(df)} records")
             return df
@@ -61,12 +336,24 @@ class DataLoader:
             logger.error(f"Error loading vehicle data: {str(e)}")
             raise
 
-    def load_forest_data(self, file_path: str) -> pd.DataFrame:
+    def load_forest_data(
+        self,
+        file_path: str,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> pd.DataFrame:
         """
         Load and validate forest carbon data.
 
+        Missing required columns raise; the other checks are reported in
+        last_validation_report.
+
         Args:
             file_path (str): The path to the forest data file.
+            columns (Optional[List[str]]): Columns to load. Defaults to all.
+            filters (Optional[Sequence[Filter]]): Row filters, see read_file.
+            dtypes (Optional[Dict[str, Any]]): Column dtypes, see read_file.
 
         Returns:
             pd.DataFrame: The loaded forest data.
@@ -75,16 +362,11 @@ class DataLoader:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Forest data file not found: {file_path}")
 
-            if file_path.endswith(".csv"):
-                df = pd.read_csv(file_path)
-            elif file_path.endswith((".xlsx", ".xls")):
-                df = pd.read_excel(file_path)
-            elif file_path.endswith(".json"):
-                df = pd.read_json(file_path)
-            else:
-                raise ValueError(f"Unsupported file format: {file_path}")
+            df = self.load_file(file_path, columns, filters, dtypes)
+
+            self._check_columns("forest_data", df.columns, columns)
+            df = self._validate("forest_data", df, columns)
 
-            # Basic data validation
             if df.isnull().sum().sum() > 0:
                 logger.warning("Forest data contains missing values")
 
@@ -93,3 +375,313 @@ class DataLoader:
         except Exception as e:
             logger.error(f"Error loading forest data: {str(e)}")
             raise
+
+    def _check_columns(
+        self,
+        dataset: str,
+        available: Sequence[str],
+        requested: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Raise if required columns (of those requested) are missing."""
+        missing_columns = self.validators[dataset].missing_columns(available, requested)
+
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+    def _validate(
+        self,
+        dataset: str,
+        df: pd.DataFrame,
+        requested: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Apply the dataset's validation rules and keep the report."""
+        df, report = self.validators[dataset].validate(df, requested)
+        self.last_validation_report = report
+        self._log_violations(report)
+        return df
+
+    @staticmethod
+    def _log_violations(report: Dict[str, Any]) -> None:
+        """Log a one-line summary per violated rule."""
+        for violation in report["violations"]:
+            logger.warning(
+                f"{report['dataset']}: {violation['count']} values of "
+                f"'{violation['column']}' fail {violation['check']} "
+                f"(e.g. {violation['examples']})"
+            )
+
+    def file_columns(self, file_path: str) -> List[str]:
+        """
+        Read the column names of a file without loading its rows.
+
+        Args:
+            file_path (str): The path to the data file.
+
+        Returns:
+            List[str]: The column names.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in COLUMNAR_FORMATS:
+            return ds.dataset(
+                file_path, format=COLUMNAR_FORMATS[extension]
+            ).schema.names
+        if extension == ".csv":
+            return pd.read_csv(file_path, nrows=0).columns.tolist()
+        if extension == ".jsonl":
+            return pd.read_json(file_path, lines=True, nrows=1).columns.tolist()
+        raise ValueError(f"Chunked reading is not supported for: {file_path}")
+
+    def iter_file(
+        self,
+        file_path: str,
+        chunk_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read a CSV, JSON-lines, Parquet, Feather or Arrow file in chunks.
+
+        Every chunk except the last has exactly chunk_size rows (after
+        filtering for columnar formats, before filtering otherwise).
+
+        Args:
+            file_path (str): The path to the data file.
+            chunk_size (Optional[int]): Rows per chunk. Defaults to
+                processing.chunk_size from data_config.yaml.
+            columns (Optional[List[str]]): Columns to load. Defaults to all.
+            filters (Optional[Sequence[Filter]]): Row filters, see read_file.
+            dtypes (Optional[Dict[str, Any]]): Column dtypes, see read_file.
+
+        Yields:
+            pd.DataFrame: The next chunk.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        filters = list(filters or [])
+        extension = os.path.splitext(file_path)[1].lower()
+
+        if extension in COLUMNAR_FORMATS:
+            dataset = ds.dataset(file_path, format=COLUMNAR_FORMATS[extension])
+            batches = dataset.to_batches(
+                columns=columns,
+                filter=_filter_expression(filters, dataset.schema) if filters else None,
+                batch_size=chunk_size,
+            )
+            # Batches never span row groups, so regroup them into full chunks
+            pending, pending_rows = [], 0
+            for batch in batches:
+                pending.append(batch)
+                pending_rows += batch.num_rows
+                while pending_rows >= chunk_size:
+                    table = pa.Table.from_batches(pending)
+                    yield self._typed(table.slice(0, chunk_size).to_pandas(), dtypes)
+                    rest = table.slice(chunk_size)
+                    pending, pending_rows = rest.to_batches(), rest.num_rows
+            if pending_rows:
+                yield self._typed(pa.Table.from_batches(pending).to_pandas(), dtypes)
+            return
+
+        read_columns = columns
+        if columns is not None and filters:
+            read_columns = list(
+                dict.fromkeys(list(columns) + [column for column, _, _ in filters])
+            )
+
+        if extension == ".csv":
+            reader = pd.read_csv(
+                file_path, usecols=read_columns, dtype=dtypes, chunksize=chunk_size
+            )
+        elif extension == ".jsonl":
+            reader = pd.read_json(
+                file_path, lines=True, dtype=dtypes, chunksize=chunk_size
+            )
+        else:
+            raise ValueError(f"Chunked reading is not supported for: {file_path}")
+
+        with reader:
+            for chunk in reader:
+                if read_columns is not None:
+                    chunk = chunk[read_columns]
+                if filters:
+                    chunk = chunk[_filter_mask(chunk, filters)]
+                if columns is not None:
+                    chunk = chunk[list(columns)]
+                yield chunk
+
+    @staticmethod
+    def _typed(df: pd.DataFrame, dtypes: Optional[Dict[str, Any]]) -> pd.DataFrame:
+        """Apply the dtypes that refer to columns present in the frame."""
+        if dtypes:
+            df = df.astype({k: v for k, v in dtypes.items() if k in df.columns})
+        return df
+
+    def iter_vehicle_data(
+        self,
+        file_path: str,
+        chunk_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Load vehicle emissions data chunk by chunk.
+
+        Required columns are checked once, from the file header, before the
+        first chunk is read. Each chunk is then validated and the combined
+        report is stored in last_validation_report once the file is consumed.
+
+        Args:
+            file_path (str): The path to the vehicle data file.
+            chunk_size (Optional[int]): Rows per chunk, see iter_file.
+            columns (Optional[List[str]]): Columns to load. Defaults to all.
+            filters (Optional[Sequence[Filter]]): Row filters, see read_file.
+            dtypes (Optional[Dict[str, Any]]): Column dtypes, see read_file.
+
+        Yields:
+            pd.DataFrame: The next chunk of vehicle data.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Data file not found: {file_path}")
+        self._check_columns("vehicle_data", self.file_columns(file_path), columns)
+
+        validator = self.validators["vehicle_data"]
+        reports = []
+        for chunk in self.iter_file(file_path, chunk_size, columns, filters, dtypes):
+            chunk, report = validator.validate(chunk, columns)
+            reports.append(report)
+            yield chunk
+
+        self.last_validation_report = merge_reports(reports)
+        self._log_violations(self.last_validation_report)
+        logger.info(
+            f"Successfully streamed vehicle data with "
+            f"{self.last_validation_report['rows']} records"
+        )
+
+    def iter_forest_data(
+        self,
+        file_path: str,
+        chunk_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Load forest carbon data chunk by chunk.
+
+        Args:
+            file_path (str): The path to the forest data file.
+            chunk_size (Optional[int]): Rows per chunk, see iter_file.
+            columns (Optional[List[str]]): Columns to load. Defaults to all.
+            filters (Optional[Sequence[Filter]]): Row filters, see read_file.
+            dtypes (Optional[Dict[str, Any]]): Column dtypes, see read_file.
+
+        Yields:
+            pd.DataFrame: The next chunk of forest data.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Forest data file not found: {file_path}")
+        self._check_columns("forest_data", self.file_columns(file_path), columns)
+
+        validator = self.validators["forest_data"]
+        reports = []
+        missing_values = 0
+        for chunk in self.iter_file(file_path, chunk_size, columns, filters, dtypes):
+            chunk, report = validator.validate(chunk, columns)
+            reports.append(report)
+            missing_values += int(chunk.isnull().sum().sum())
+            yield chunk
+
+        self.last_validation_report = merge_reports(reports)
+        self._log_violations(self.last_validation_report)
+        if missing_values > 0:
+            logger.warning("Forest data contains missing values")
+
+    def load_directory(
+        self,
+        directory: str,
+        pattern: str = "*",
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+        source_column: Optional[str] = None,
+    ) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        """
+        Load every file matching a glob pattern concurrently and concatenate them.
+
+        Files are parsed on a thread pool (or a process pool for parsers that
+        hold the GIL). The JSON records of each file are normalized into a
+        frame by its worker, frames are aligned to the union of all columns,
+        and everything is concatenated once at the end. A file that fails to
+        parse or normalize is reported instead of aborting the load.
+
+        Args:
+            directory (str): The directory to search, e.g. "data/raw/traffic_api_data".
+            pattern (str): A glob pattern relative to the directory; "**" recurses.
+            columns (Optional[List[str]]): Columns to keep. Defaults to all.
+            dtypes (Optional[Dict[str, Any]]): Column dtypes applied per file and
+                again after concatenation so every file agrees.
+            max_workers (Optional[int]): Pool size. Defaults to the executor default.
+            use_processes (bool): Use a process pool instead of threads.
+            source_column (Optional[str]): If given, a categorical column holding
+                each row's file name.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict[str, str]]: The concatenated data and a
+                mapping of failed file paths to their error messages.
+        """
+        paths = sorted(
+            path
+            for path in glob.glob(os.path.join(directory, pattern), recursive=True)
+            if os.path.isfile(path)
+        )
+        if not paths:
+            logger.warning(f"No files match {pattern} in {directory}")
+            return pd.DataFrame(columns=columns), {}
+
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        frames, failures = [], {}
+        loaded = 0
+
+        with executor_class(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_load_log_file, path, columns, dtypes) for path in paths
+            ]
+            for path, future in zip(paths, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failures[path] = str(e)
+                    logger.warning(f"Failed to load {path}: {e}")
+                    continue
+
+                loaded += 1
+                if source_column is not None:
+                    result[source_column] = os.path.basename(path)
+                frames.append(result)
+
+        if not frames:
+            logger.error(f"All {len(paths)} files in {directory} failed to load")
+            return pd.DataFrame(columns=columns), failures
+
+        df = (
+            pd.concat(frames, ignore_index=True, sort=False)
+            if len(frames) > 1
+            else frames[0]
+        )
+        if columns is not None:
+            keep = list(columns)
+            if source_column is not None and source_column not in keep:
+                keep.append(source_column)
+            df = df.reindex(columns=keep)
+        if dtypes:
+            df = df.astype({k: v for k, v in dtypes.items() if k in df.columns})
+        if source_column is not None:
+            df[source_column] = df[source_column].astype("category")
+
+        logger.info(
+            f"Loaded {len(df)} records from {loaded} of {len(paths)} files "
+            f"in {directory}"
+        )
+        return df, failures
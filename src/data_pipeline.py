@@ -5,9 +5,11 @@ import argparse
 import yaml
 import logging
 import os
+import numpy as np
 import pandas as pd
 from src.data_loader import DataLoader
 from src.feature_engineering import calculate_sequestration_and_removal
+from src.joins import can_join, temporal_join
 from src.model_trainer import train_lgbm_model
 
 # Configure logging
@@ -38,7 +40,14 @@ def main(config_path):
     os.makedirs(output_path, exist_ok=True)
 
     # Initialize data loader
-    loader = DataLoader(data_path=input_path)
+    loader = DataLoader(data_path=input_path, config=config)
+
+    # Dummy sources share 10 wards x 30 days of join keys
+    dummy_keys = {
+        "city_id": ["Delhi"] * 300,
+        "ward_id": np.repeat(np.arange(10), 30),
+        "daily_date": np.tile(pd.date_range("2023-01-01", periods=30), 10),
+    }
 
     try:
         # Load data
@@ -53,6 +62,7 @@ def main(config_path):
             )
             vehicle_df = pd.DataFrame(
                 {
+                    **dummy_keys,
                     "vehicle_type": ["car", "truck", "twowheeler"] * 100,
                     "fuel_type": ["petrol", "diesel", "petrol"] * 100,
                     "distance": [10.5, 20.0, 5.0] * 100,
@@ -75,6 +85,7 @@ def main(config_path):
             )
             forest_df = pd.DataFrame(
                 {
+                    **dummy_keys,
                     "forest_type": ["deciduous", "coniferous"] * 150,
                     "carbon_sequestered": [1000.0, 1200.0] * 150,
                     "area_hectares": [50.0, 60.0] * 150,
@@ -92,9 +103,19 @@ def main(config_path):
                 os.path.join(input_path, "forest_data.csv")
             )
 
-        # Merge data (simplistic merge for demonstration)
-        # In reality, this would be a spatial or temporal join
-        merged_df = pd.concat([vehicle_df, forest_df], axis=1)
+        # Join on (city_id, ward_id, date); vehicle and forest sources may
+        # arrive at different cadences, so match the latest forest reading
+        join_config = config["data_processing"].get("join", {})
+        if can_join(vehicle_df, forest_df):
+            merged_df = temporal_join(
+                vehicle_df, forest_df, tolerance=join_config.get("tolerance")
+            )
+        else:
+            logger.warning(
+                "Sources lack city_id, ward_id and daily_date; "
+                "falling back to a positional merge."
+            )
+            merged_df = pd.concat([vehicle_df, forest_df], axis=1)
 
         # Feature Engineering
         processed_df = calculate_sequestration_and_removal(merged_df)
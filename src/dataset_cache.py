@@ -0,0 +1,254 @@
+"""
+This module contains a disk cache of binned LightGBM Datasets, stored in
+LightGBM's binary format.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Any, Dict, List, Tuple
+
+import lightgbm as lgb
+import pandas as pd
+
+from src.utils import fingerprint_frame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASET_CACHE_PATH = "data/cache/lgb_datasets/"
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# Parameters (and their aliases) that change how features are binned; any
+# other parameter can vary between trainings that share a Dataset
+BINNING_PARAMS = (
+    "max_bin",
+    "max_bin_by_feature",
+    "min_data_in_bin",
+    "bin_construct_sample_cnt",
+    "subsample_for_bin",
+    "min_data_in_leaf",
+    "min_child_samples",
+    "feature_pre_filter",
+    "use_missing",
+    "zero_as_missing",
+    "linear_tree",
+    "categorical_feature",
+    "data_random_seed",
+    "seed",
+    "random_state",
+)
+
+
+def binning_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the parameters of a training run that affect binning.
+
+    Args:
+        params (Dict[str, Any]): LightGBM parameters.
+
+    Returns:
+        Dict[str, Any]: The binning parameters, plus verbosity.
+    """
+    binning = {key: params[key] for key in BINNING_PARAMS if key in params}
+    binning["verbose"] = params.get("verbose", -1)
+    return binning
+
+
+class LGBMDatasetCache:
+    """
+    Cache of binned training and validation Datasets keyed by the content
+    fingerprint of the feature tables, the binning parameters and the
+    LightGBM version.
+
+    Labels are not part of an entry: the same binned features serve every
+    target, and load() attaches the labels of the target being trained.
+    Entries age out through least-recently-used eviction once the cache
+    grows past its disk budget.
+    """
+
+    def __init__(
+        self, path: str = DEFAULT_DATASET_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """
+        Initializes the LGBMDatasetCache.
+
+        Args:
+            path (str): The directory holding the cached Datasets.
+            max_bytes (int): The disk budget of the cache directory.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def key(
+        x_train: pd.DataFrame, x_valid: pd.DataFrame, params: Dict[str, Any]
+    ) -> str:
+        """
+        Return the cache key of a train/validation split and its binning.
+
+        Args:
+            x_train (pd.DataFrame): The training features.
+            x_valid (pd.DataFrame): The validation features.
+            params (Dict[str, Any]): LightGBM parameters.
+
+        Returns:
+            str: A hex digest.
+        """
+        payload = json.dumps(
+            {
+                "train": fingerprint_frame(x_train),
+                "valid": fingerprint_frame(x_valid),
+                "binning": binning_params(params),
+                "lightgbm": lgb.__version__,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        """Return the directory of a cache key."""
+        return os.path.join(self.path, key)
+
+    def get_or_build(
+        self, x_train: pd.DataFrame, x_valid: pd.DataFrame, params: Dict[str, Any]
+    ) -> Tuple[str, str, bool]:
+        """
+        Return the binary Dataset files of a split, binning it on a miss.
+
+        Args:
+            x_train (pd.DataFrame): The training features.
+            x_valid (pd.DataFrame): The validation features, binned with the
+                training set's bin boundaries.
+            params (Dict[str, Any]): LightGBM parameters.
+
+        Returns:
+            Tuple[str, str, bool]: The training and validation files, and
+                whether they were served from the cache.
+        """
+        entry = self._entry_path(self.key(x_train, x_valid, params))
+        train_path = os.path.join(entry, "train.bin")
+        valid_path = os.path.join(entry, "valid.bin")
+
+        if os.path.exists(valid_path):
+            # The modification time doubles as the LRU timestamp
+            os.utime(entry)
+            with self._lock:
+                self.hits += 1
+            return train_path, valid_path, True
+
+        with self._lock:
+            self.misses += 1
+
+        binning = binning_params(params)
+        tmp_dir = os.path.join(self.path, f".{uuid.uuid4().hex}.tmp")
+        os.makedirs(tmp_dir)
+        try:
+            train = lgb.Dataset(x_train, params=binning, free_raw_data=False)
+            valid = lgb.Dataset(x_valid, reference=train, params=binning)
+            train.save_binary(os.path.join(tmp_dir, "train.bin"))
+            valid.save_binary(os.path.join(tmp_dir, "valid.bin"))
+            os.replace(tmp_dir, entry)
+        except OSError:
+            # Another trainer stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.exists(valid_path):
+                raise
+
+        self.evict()
+        return train_path, valid_path, False
+
+    @staticmethod
+    def load(
+        train_path: str,
+        valid_path: str,
+        y_train: pd.Series,
+        y_valid: pd.Series,
+        params: Dict[str, Any],
+    ) -> Tuple[lgb.Dataset, lgb.Dataset]:
+        """
+        Load a cached split and attach the labels of one target.
+
+        Every call returns independent Datasets, so targets can be trained
+        concurrently from the same entry.
+
+        Args:
+            train_path (str): The training Dataset file.
+            valid_path (str): The validation Dataset file.
+            y_train (pd.Series): The training labels.
+            y_valid (pd.Series): The validation labels.
+            params (Dict[str, Any]): LightGBM parameters.
+
+        Returns:
+            Tuple[lgb.Dataset, lgb.Dataset]: The constructed Datasets.
+        """
+        binning = binning_params(params)
+        train = lgb.Dataset(train_path, params=binning).construct()
+        train.set_label(y_train)
+        valid = lgb.Dataset(valid_path, reference=train, params=binning).construct()
+        valid.set_label(y_valid)
+        return train, valid
+
+    def _entries(self) -> List[os.DirEntry]:
+        """List the cached entry directories."""
+        return [
+            entry
+            for entry in os.scandir(self.path)
+            if entry.is_dir() and not entry.name.startswith(".")
+        ]
+
+    @staticmethod
+    def _size(directory: str) -> int:
+        """Return the total size of the files in a directory."""
+        return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits its budget.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime_ns)
+            sizes = {entry.path: self._size(entry.path) for entry in entries}
+            total = sum(sizes.values())
+            removed = 0
+            while entries and total > self.max_bytes:
+                entry = entries.pop(0)
+                total -= sizes[entry.path]
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} LightGBM Dataset cache entries")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit counters and disk usage.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, hit rate, entries and bytes.
+        """
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(self._size(entry.path) for entry in entries),
+        }
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for entry in self._entries():
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -2,6 +2,7 @@
 import pandas as pd
 import numpy as np
 import logging
+from src.compact import constant_column
 from src.config import EMISSION_FACTORS, SEQUESTRATION_FACTORS, VEHICLE_DATA
 
 logger = logging.getLogger(__name__)
@@ -14,16 +15,23 @@ class FeatureEngineer:
 
     def calculate_vehicular_emissions(self, df):
         """Calculate detailed vehicular emissions with improved formulas."""
-        logger.info("Calculating vehicular emissions...")
+        logger.debug("Calculating vehicular emissions...")
 
         df = df.copy()
 
+        # Per-city constants may live in the compact-mode side table
+        car_prop = constant_column(df, "car_prop")
+        truck_prop = constant_column(df, "truck_prop")
+        twowheeler_prop = constant_column(df, "twowheeler_prop")
+
         # Calculate vehicle kilometers traveled (VKT) with congestion factor
         # Higher traffic index = more congestion = more emissions per km
         congestion_factor = 1 + (df["traffic_index_0_100"] / 100) * 0.5
 
         df["total_vkt_km"] = (
-            (df["total_vehicles"] * 0.1)  # 10% of vehicles active daily
+            (
+                constant_column(df, "total_vehicles") * 0.1
+            )  # 10% of vehicles active daily
             * congestion_factor
             * (50 - (df["traffic_index_0_100"] / 2))  # Distance varies with traffic
         )
@@ -31,20 +39,17 @@ class FeatureEngineer:
         # Calculate emissions for each vehicle type
         # CO2 Emissions
         df["co2_car_kg"] = (
-            df["total_vkt_km"]
-            * df["car_prop"]
-            * self.emission_factors["CO2"]["car"]
-            / 1000
+            df["total_vkt_km"] * car_prop * self.emission_factors["CO2"]["car"] / 1000
         )
         df["co2_truck_kg"] = (
             df["total_vkt_km"]
-            * df["truck_prop"]
+            * truck_prop
             * self.emission_factors["CO2"]["truck"]
             / 1000
         )
         df["co2_twowheeler_kg"] = (
             df["total_vkt_km"]
-            * df["twowheeler_prop"]
+            * twowheeler_prop
             * self.emission_factors["CO2"]["twowheeler"]
             / 1000
         )
@@ -54,20 +59,17 @@ class FeatureEngineer:
 
         # PM2.5 Emissions
         df["pm25_car_kg"] = (
-            df["total_vkt_km"]
-            * df["car_prop"]
-            * self.emission_factors["PM25"]["car"]
-            / 1000
+            df["total_vkt_km"] * car_prop * self.emission_factors["PM25"]["car"] / 1000
         )
         df["pm25_truck_kg"] = (
             df["total_vkt_km"]
-            * df["truck_prop"]
+            * truck_prop
             * self.emission_factors["PM25"]["truck"]
             / 1000
         )
         df["pm25_twowheeler_kg"] = (
             df["total_vkt_km"]
-            * df["twowheeler_prop"]
+            * twowheeler_prop
             * self.emission_factors["PM25"]["twowheeler"]
             / 1000
         )
@@ -77,20 +79,17 @@ class FeatureEngineer:
 
         # NOx Emissions
         df["nox_car_kg"] = (
-            df["total_vkt_km"]
-            * df["car_prop"]
-            * self.emission_factors["NOX"]["car"]
-            / 1000
+            df["total_vkt_km"] * car_prop * self.emission_factors["NOX"]["car"] / 1000
         )
         df["nox_truck_kg"] = (
             df["total_vkt_km"]
-            * df["truck_prop"]
+            * truck_prop
             * self.emission_factors["NOX"]["truck"]
             / 1000
         )
         df["nox_twowheeler_kg"] = (
             df["total_vkt_km"]
-            * df["twowheeler_prop"]
+            * twowheeler_prop
             * self.emission_factors["NOX"]["twowheeler"]
             / 1000
         )
@@ -98,14 +97,15 @@ class FeatureEngineer:
             ["nox_car_kg", "nox_truck_kg", "nox_twowheeler_kg"]
         ].sum(axis=1)
 
-        logger.info("Vehicular emissions calculation completed")
+        logger.debug("Vehicular emissions calculation completed")
         return df
 
     def calculate_sequestration_and_removal(self, df):
         """Calculate CO2 sequestration and pollutant removal with improved models."""
-        logger.info("Calculating sequestration and removal...")
+        logger.debug("Calculating sequestration and removal...")
 
         df = df.copy()
+        forest_area_sqkm = constant_column(df, "forest_area_sqkm")
 
         # 1. CO2 Sequestration (Improved model)
         # NDVI health factor (0 to 1.5)
@@ -141,7 +141,7 @@ class FeatureEngineer:
 
         # Total CO2 sequestration
         df["co2_sequestered_kg"] = (
-            df["forest_area_sqkm"]
+            forest_area_sqkm
             * self.sequestration_factors["CO2_BASE_KG_SQKM_DAY"]
             * df["f_ndvi"]
             * df["f_temp"]
@@ -155,7 +155,7 @@ class FeatureEngineer:
 
         # Calculate canopy area (assuming 15,000 sqm canopy per sqkm forest)
         canopy_density = 150000  # sqm canopy per sqkm forest
-        df["canopy_area_sqm"] = df["forest_area_sqkm"] * canopy_density
+        df["canopy_area_sqm"] = forest_area_sqkm * canopy_density
 
         # Deposition velocity adjustment based on weather
         wind_effect = np.where(
@@ -185,23 +185,22 @@ class FeatureEngineer:
             * time_seconds_day
         )
 
-        logger.info("Sequestration and removal calculation completed")
+        logger.debug("Sequestration and removal calculation completed")
         return df
 
     def calculate_net_pollutants(self, df):
         """Calculate net pollutant values (emission - removal)."""
         df = df.copy()
+        forest_area_sqkm = constant_column(df, "forest_area_sqkm")
 
         df["Net_CO2_kg"] = df["CO2_emission_kg"] - df["co2_sequestered_kg"]
         df["Net_PM25_kg"] = df["PM25_emission_kg"] - df["PM25_removed_kg"]
         df["Net_NOX_kg"] = df["NOX_emission_kg"] - df["NOX_removed_kg"]
 
         # Calculate efficiency metrics
-        df["sequestration_efficiency"] = (
-            df["co2_sequestered_kg"] / df["forest_area_sqkm"]
-        )
-        df["pm25_removal_efficiency"] = df["PM25_removed_kg"] / df["forest_area_sqkm"]
-        df["nox_removal_efficiency"] = df["NOX_removed_kg"] / df["forest_area_sqkm"]
+        df["sequestration_efficiency"] = df["co2_sequestered_kg"] / forest_area_sqkm
+        df["pm25_removal_efficiency"] = df["PM25_removed_kg"] / forest_area_sqkm
+        df["nox_removal_efficiency"] = df["NOX_removed_kg"] / forest_area_sqkm
 
         return df
 
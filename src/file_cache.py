@@ -0,0 +1,182 @@
+"""
+This module contains a disk cache of parsed data files, stored as Feather.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+import pyarrow.feather as feather
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "data/cache/parsed/"
+DEFAULT_MAX_BYTES = 1024**3
+
+
+class ParsedFileCache:
+    """
+    Cache of parsed, typed frames keyed by the source file's path, size and
+    modification time plus the read options (columns, filters, dtypes).
+
+    A changed source file gets a new key, so stale entries are never served;
+    they age out through least-recently-used eviction once the cache grows
+    past its disk budget.
+    """
+
+    def __init__(
+        self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """
+        Initializes the ParsedFileCache.
+
+        Args:
+            path (str): The directory holding the cached Feather files.
+            max_bytes (int): The disk budget of the cache directory.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def key(file_path: str, **options: Any) -> str:
+        """
+        Return the cache key of a file and its read options.
+
+        Args:
+            file_path (str): The source data file.
+            **options (Any): Read options that change the parsed frame.
+
+        Returns:
+            str: A hex digest.
+        """
+        stat = os.stat(file_path)
+        payload = json.dumps(
+            {
+                "path": os.path.abspath(file_path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "options": options,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        """Return the Feather file of a cache key."""
+        return os.path.join(self.path, f"{key}.feather")
+
+    def get_or_parse(
+        self, file_path: str, parse: Callable[[], pd.DataFrame], **options: Any
+    ) -> pd.DataFrame:
+        """
+        Return the cached frame for a file, parsing and storing it on a miss.
+
+        Args:
+            file_path (str): The source data file.
+            parse (Callable[[], pd.DataFrame]): Parses the file.
+            **options (Any): Read options that are part of the key.
+
+        Returns:
+            pd.DataFrame: The parsed frame.
+        """
+        entry = self._entry_path(self.key(file_path, **options))
+
+        if os.path.exists(entry):
+            try:
+                df = feather.read_feather(entry, memory_map=True)
+                # The modification time doubles as the LRU timestamp
+                os.utime(entry)
+                with self._lock:
+                    self.hits += 1
+                return df
+            except Exception as e:
+                logger.warning(f"Discarding unreadable cache entry {entry}: {e}")
+                self._remove(entry)
+
+        with self._lock:
+            self.misses += 1
+        df = parse()
+        self._store(entry, df)
+        return df
+
+    def _store(self, entry: str, df: pd.DataFrame) -> None:
+        """Write a frame atomically and evict entries over budget."""
+        tmp_path = os.path.join(self.path, f".{uuid.uuid4().hex}.tmp")
+        try:
+            # Feather needs a default index and string column names
+            feather.write_feather(
+                df.reset_index(drop=True).rename(columns=str), tmp_path
+            )
+            os.replace(tmp_path, entry)
+        except Exception as e:
+            logger.warning(f"Could not cache {entry}: {e}")
+            self._remove(tmp_path)
+            return
+        self.evict()
+
+    def _remove(self, path: str) -> None:
+        """Delete a file, ignoring files already gone."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entries(self) -> List[os.DirEntry]:
+        """List the cached Feather files."""
+        return [
+            entry
+            for entry in os.scandir(self.path)
+            if entry.is_file() and entry.name.endswith(".feather")
+        ]
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits its budget.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime_ns)
+            total = sum(entry.stat().st_size for entry in entries)
+            removed = 0
+            while entries and total > self.max_bytes:
+                entry = entries.pop(0)
+                total -= entry.stat().st_size
+                self._remove(entry.path)
+                removed += 1
+
+        if removed:
+            logger.info(f"Evicted {removed} parsed-file cache entries")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit counters and disk usage.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, hit rate, entries and bytes.
+        """
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(entry.stat().st_size for entry in entries),
+        }
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for entry in self._entries():
+            self._remove(entry.path)
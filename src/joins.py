@@ -0,0 +1,144 @@
+"""
+This module contains the keyed temporal join used to combine data sources
+observed per city, ward and date.
+"""
+import logging
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+JOIN_KEYS: Tuple[str, ...] = ("city_id", "ward_id")
+DATE_COLUMN = "daily_date"
+
+_ROW = "__row__"
+_TIME = "__time__"
+
+
+def can_join(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    keys: Sequence[str] = JOIN_KEYS,
+    date_column: str = DATE_COLUMN,
+    right_date_column: Optional[str] = None,
+) -> bool:
+    """
+    Return True if both frames carry the join keys and their date columns.
+
+    Args:
+        left (pd.DataFrame): The left source.
+        right (pd.DataFrame): The right source.
+        keys (Sequence[str]): The entity keys, partition column first.
+        date_column (str): The left date column.
+        right_date_column (Optional[str]): The right date column, if named
+            differently.
+
+    Returns:
+        bool: Whether temporal_join can be applied.
+    """
+    return all(col in left.columns for col in [*keys, date_column]) and all(
+        col in right.columns for col in [*keys, right_date_column or date_column]
+    )
+
+
+def temporal_join(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    keys: Sequence[str] = JOIN_KEYS,
+    date_column: str = DATE_COLUMN,
+    right_date_column: Optional[str] = None,
+    tolerance: Optional[Any] = None,
+    direction: str = "backward",
+    suffixes: Tuple[str, str] = ("", "_right"),
+) -> pd.DataFrame:
+    """
+    Left-join two sources on entity keys and time.
+
+    Without a tolerance, rows match only on an identical timestamp. With one,
+    each left row takes the nearest right row within the tolerance (the
+    latest earlier one for direction="backward"), so hourly traffic can be
+    joined to daily NDVI. Both sides are split by the first key (the city)
+    and each partition is sort-merged with pd.merge_asof on the remaining
+    keys, which keeps the cost at a sort plus a linear merge; inputs that
+    are already sorted by time are cheap to re-sort with a stable sort.
+
+    Right rows sharing the same keys and timestamp collapse to the last one.
+    The result has one row per left row, in the left frame's order.
+
+    Args:
+        left (pd.DataFrame): The source whose rows are kept.
+        right (pd.DataFrame): The source to attach.
+        keys (Sequence[str]): The entity keys, partition column first.
+        date_column (str): The left date column.
+        right_date_column (Optional[str]): The right date column, if named
+            differently. It is kept in the result to show which right row
+            matched.
+        tolerance (Optional[Any]): The largest allowed time gap, e.g. "1D".
+        direction (str): "backward", "forward" or "nearest".
+        suffixes (Tuple[str, str]): Suffixes for overlapping value columns.
+
+    Returns:
+        pd.DataFrame: The joined data.
+    """
+    right_date_column = right_date_column or date_column
+    if not can_join(left, right, keys, date_column, right_date_column):
+        raise ValueError(
+            f"Both sources need the join columns {list(keys)} and a date column"
+        )
+
+    partition, *by = keys
+    gap = pd.Timedelta(0) if tolerance is None else pd.Timedelta(tolerance)
+
+    left = left.assign(
+        **{
+            _ROW: np.arange(len(left)),
+            _TIME: pd.to_datetime(left[date_column]).astype("datetime64[ns]"),
+        }
+    )
+    right = right.assign(
+        **{_TIME: pd.to_datetime(right[right_date_column]).astype("datetime64[ns]")}
+    )
+    if right_date_column == date_column:
+        right = right.drop(columns=date_column)
+
+    value_columns = [col for col in right.columns if col not in (*keys, _TIME)]
+    output_columns = list(left.columns.drop([_ROW, _TIME])) + [
+        col + suffixes[1] if col in left.columns else col for col in value_columns
+    ]
+
+    right_partitions = {
+        value: part.drop(columns=partition).sort_values(_TIME, kind="stable")
+        for value, part in right.groupby(partition, sort=False, dropna=False)
+    }
+
+    parts = []
+    for value, part in left.groupby(partition, sort=False, dropna=False):
+        part = part.sort_values(_TIME, kind="stable")
+        right_part = right_partitions.get(value)
+        if right_part is None or right_part.empty:
+            parts.append(part)
+            continue
+        parts.append(
+            pd.merge_asof(
+                part,
+                right_part,
+                on=_TIME,
+                by=by or None,
+                tolerance=gap,
+                direction=direction,
+                suffixes=suffixes,
+            )
+        )
+
+    if not parts:
+        return pd.DataFrame(columns=output_columns)
+
+    joined = pd.concat(parts, ignore_index=True, sort=False)
+    joined = joined.sort_values(_ROW, kind="stable").reset_index(drop=True)
+    joined = joined.reindex(columns=output_columns)
+
+    matched = joined[value_columns[0]].notna().sum() if value_columns else 0
+    logger.info(f"Joined {len(joined)} rows; {matched} matched a right row")
+    return joined
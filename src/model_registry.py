@@ -0,0 +1,363 @@
+"""
+This module contains the ModelRegistry class, which serves per-city (or
+per-cluster) models loaded on demand under a memory budget, and the parallel
+training of those models.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.config import REGISTRY_CONFIG
+from src.model_trainer import ModelTrainer
+from src.utils import load_model, parse_size, save_model
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+
+def model_key(city: str, clusters: Dict[str, str]) -> str:
+    """Return the registry key of a city: its cluster, or the city itself."""
+    return clusters.get(city, city)
+
+
+class ModelRegistry:
+    """
+    Registry of models keyed by city or city cluster.
+
+    Models are loaded from ``path`` on their first request and kept in
+    least-recently-used order. Once the loaded models exceed the memory
+    budget, the least recently used ones are evicted; their size is
+    estimated from the model file, which is dominated by the boosters' tree
+    dumps. Cities without a model of their own are served by the global
+    fallback model, which is loaded once and never evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_memory: Any = None,
+        fallback_path: Optional[str] = None,
+        clusters: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Initializes the ModelRegistry.
+
+        Args:
+            path (Optional[str]): The directory of the city models.
+            max_memory (Any): The budget for loaded city models, in bytes or
+                as a size string such as "512MB".
+            fallback_path (Optional[str]): The global model file.
+            clusters (Optional[Dict[str, str]]): City to cluster mapping.
+                Defaults to the mapping the models were trained with.
+        """
+        self.path = path or REGISTRY_CONFIG["path"]
+        self.max_bytes = parse_size(max_memory or REGISTRY_CONFIG["max_memory"])
+        self.fallback_path = fallback_path or REGISTRY_CONFIG["fallback_path"]
+
+        self.manifest: Dict[str, Any] = {"models": {}, "clusters": {}}
+        manifest_path = os.path.join(self.path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                self.manifest = json.load(f)
+        self.clusters = (
+            clusters if clusters is not None else self.manifest.get("clusters", {})
+        )
+
+        self._models: "OrderedDict[str, Tuple[ModelTrainer, int]]" = OrderedDict()
+        self._fallback: Optional[ModelTrainer] = None
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.fallbacks = 0
+
+    def model_path(self, key: str) -> str:
+        """Return the file of a registry key."""
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def has_model(self, city: str) -> bool:
+        """Return whether a city is served by a model of its own."""
+        return os.path.exists(self.model_path(model_key(city, self.clusters)))
+
+    def get(self, city: str) -> ModelTrainer:
+        """
+        Return the model serving a city, loading it on first use.
+
+        Args:
+            city (str): The city ID.
+
+        Returns:
+            ModelTrainer: The city's (or its cluster's) model, or the
+                fallback model.
+        """
+        key = model_key(city, self.clusters)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key][0]
+
+        if not os.path.exists(self.model_path(key)):
+            with self._lock:
+                self.fallbacks += 1
+            return self.fallback()
+
+        # One thread loads a key while requests for other keys proceed; the
+        # key's lock is dropped once the load is over
+        with self._lock:
+            loading = self._loading.setdefault(key, threading.Lock())
+        with loading:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return self._models[key][0]
+
+            try:
+                started = time.perf_counter()
+                model = load_model(self.model_path(key))
+                size = os.path.getsize(self.model_path(key))
+                logger.info(
+                    f"Loaded model {key} ({size / 1024**2:.1f} MB) in "
+                    f"{time.perf_counter() - started:.2f}s"
+                )
+                with self._lock:
+                    self._models[key] = (model, size)
+                    self.loads += 1
+                    self._evict(keep=key)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+        return model
+
+    def fallback(self) -> ModelTrainer:
+        """
+        Return the global fallback model, loading it on first use.
+
+        Returns:
+            ModelTrainer: The global model.
+        """
+        with self._lock:
+            if self._fallback is None:
+                self._fallback = load_model(self.fallback_path)
+            return self._fallback
+
+    def _evict(self, keep: str) -> None:
+        """Evict least recently used models until the budget holds."""
+        total = sum(size for _, size in self._models.values())
+        while total > self.max_bytes and len(self._models) > 1:
+            key, (_, size) = next(iter(self._models.items()))
+            if key == keep:
+                break
+            del self._models[key]
+            total -= size
+            self.evictions += 1
+            logger.info(f"Evicted model {key} ({size / 1024**2:.1f} MB)")
+
+    def predict(self, x_features: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict every row with the model of its city.
+
+        Args:
+            x_features (pd.DataFrame): The input features, with city_id.
+
+        Returns:
+            pd.DataFrame: The predictions, in the order of the input rows.
+        """
+        rows = x_features.reset_index(drop=True)
+        frames = []
+        for city, group in rows.groupby("city_id", sort=False):
+            model = self.get(city)
+            columns = getattr(model, "input_columns", None) or list(
+                model.scaler.feature_names_in_
+            )
+            prediction = model.predict(group.reindex(columns=columns))
+            prediction.index = group.index
+            frames.append(prediction)
+        predictions = pd.concat(frames).sort_index()
+        predictions.index = x_features.index
+        return predictions
+
+    def loaded(self) -> List[str]:
+        """Return the loaded keys, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache counters and memory use.
+
+        Returns:
+            Dict[str, Any]: Hits, loads, evictions, requests served by the
+                fallback, loaded keys and their estimated bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "fallbacks": self.fallbacks,
+                "loaded": list(self._models),
+                "bytes": sum(size for _, size in self._models.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+
+def train_shard(
+    key: str,
+    x_features: pd.DataFrame,
+    y_features: pd.DataFrame,
+    model_config: Dict[str, Any],
+    path: str,
+) -> Dict[str, Any]:
+    """
+    Train and save the model of one registry key.
+
+    Args:
+        key (str): The city or cluster.
+        x_features (pd.DataFrame): The key's input features.
+        y_features (pd.DataFrame): The key's target features.
+        model_config (Dict[str, Any]): MODEL_CONFIG overrides.
+        path (str): The registry directory.
+
+    Returns:
+        Dict[str, Any]: The key's manifest entry.
+    """
+    started = time.perf_counter()
+    trainer = ModelTrainer(use_dataset_cache=False, config=model_config)
+    _, _, test_metrics = trainer.train(x_features, y_features)
+    model_path = os.path.join(path, f"{key}.pkl")
+    save_model(trainer, model_path)
+    return {
+        "rows": len(x_features),
+        "test_rmse": float(test_metrics["overall_rmse"]),
+        "test_r2": float(test_metrics["overall_r2"]),
+        "bytes": os.path.getsize(model_path),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def train_city_models(
+    x_features: pd.DataFrame,
+    y_features: pd.DataFrame,
+    cities: pd.Series,
+    path: Optional[str] = None,
+    clusters: Optional[Dict[str, str]] = None,
+    min_rows: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    model_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Train one model per city or cluster on a process pool.
+
+    The ``n_jobs`` core budget is split between the workers, and the
+    largest shards are submitted first. Keys with fewer than ``min_rows``
+    rows get no model and are served by the fallback. The manifest records
+    every model and the cluster mapping for ModelRegistry.
+
+    Args:
+        x_features (pd.DataFrame): The input features.
+        y_features (pd.DataFrame): The target features.
+        cities (pd.Series): The city of every row, in row order.
+        path (Optional[str]): The registry directory.
+        clusters (Optional[Dict[str, str]]): City to cluster mapping.
+        min_rows (Optional[int]): The fewest rows a key is trained on.
+        max_workers (Optional[int]): Training processes.
+        model_config (Optional[Dict[str, Any]]): MODEL_CONFIG overrides.
+
+    Returns:
+        Dict[str, Any]: The manifest.
+    """
+    path = path or REGISTRY_CONFIG["path"]
+    clusters = REGISTRY_CONFIG["clusters"] if clusters is None else clusters
+    min_rows = REGISTRY_CONFIG["min_rows"] if min_rows is None else min_rows
+    started = time.perf_counter()
+    os.makedirs(path, exist_ok=True)
+
+    keys = pd.Series(
+        [model_key(city, clusters) for city in cities.astype(str)], dtype=object
+    )
+    groups = {key: rows.index.to_numpy() for key, rows in keys.groupby(keys)}
+    skipped = sorted(key for key, index in groups.items() if len(index) < min_rows)
+    shards = sorted(
+        (key for key in groups if key not in skipped),
+        key=lambda key: len(groups[key]),
+        reverse=True,
+    )
+    if skipped:
+        logger.info(f"Served by the fallback model (too few rows): {skipped}")
+
+    workers = min(
+        max_workers or REGISTRY_CONFIG["max_workers"] or os.cpu_count() or 1,
+        max(len(shards), 1),
+    )
+    base = ModelTrainer(use_dataset_cache=False, config=model_config).config
+    threads = max(1, (base.get("n_jobs") or os.cpu_count() or 1) // workers)
+    shard_config = {**(model_config or {}), "n_jobs": threads}
+
+    models = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            key: pool.submit(
+                train_shard,
+                key,
+                x_features.iloc[groups[key]],
+                y_features.iloc[groups[key]],
+                shard_config,
+                path,
+            )
+            for key in shards
+        }
+        for key, future in futures.items():
+            models[key] = future.result()
+            logger.info(
+                f"Trained model {key} on {models[key]['rows']} rows in "
+                f"{models[key]['seconds']:.1f}s, test RMSE "
+                f"{models[key]['test_rmse']:.4g}"
+            )
+
+    manifest = {
+        "created_at": datetime.now().isoformat(),
+        "clusters": clusters,
+        "models": dict(sorted(models.items())),
+        "fallback_keys": skipped,
+        "workers": workers,
+        "threads_per_model": threads,
+        "wall_seconds": time.perf_counter() - started,
+    }
+    with open(os.path.join(path, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def registry_matches(manifest: Dict[str, Any], path: Optional[str] = None) -> bool:
+    """
+    Return whether a registry directory holds the models of a manifest.
+
+    Args:
+        manifest (Dict[str, Any]): A manifest returned by train_city_models.
+        path (Optional[str]): The registry directory.
+
+    Returns:
+        bool: True if the manifest on disk equals ``manifest`` and every
+            model file it lists exists.
+    """
+    path = path or REGISTRY_CONFIG["path"]
+    try:
+        with open(os.path.join(path, MANIFEST_FILE), "r") as f:
+            written = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return written == json.loads(json.dumps(manifest)) and all(
+        os.path.exists(os.path.join(path, f"{key}.pkl")) for key in manifest["models"]
+    )
@@ -1,36 +1,175 @@
 """
 This module contains the ModelTrainer class, which is responsible for training the model.
 """
+import os
+import threading
+import time
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 import logging
+import joblib
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.multioutput import MultiOutputRegressor
 from sklearn.metrics import mean_squared_error, r2_score
 import lightgbm as lgb
 import shap
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 from src.config import MODEL_CONFIG
-from src.utils import save_model, calculate_metrics
+from src.dataset_cache import LGBMDatasetCache, binning_params
+from src.utils import save_model, load_model, calculate_metrics, parse_size
 
 logger = logging.getLogger(__name__)
 
+# Identifier columns, label-encoded or passed to LightGBM as categoricals
+CATEGORICAL_COLUMNS = ["city_id", "ward_id"]
+
+# The model's outputs, in order
+TARGET_COLUMNS = ["Net_CO2_kg", "Net_PM25_kg", "Net_NOX_kg"]
+
+# SHAP explainers of the most recently explained model versions. Building an
+# explainer parses every tree and costs far more than explaining a row, so
+# they are kept outside the (pickled) trainer and shared by every trainer
+# holding the same model
+EXPLAINER_CACHE: "OrderedDict[str, List[shap.TreeExplainer]]" = OrderedDict()
+EXPLAINER_CACHE_SIZE = 4
+_explainer_lock = threading.Lock()
+
+
+class BoosterRegressor:
+    """
+    A trained lgb.Booster with the parts of the LGBMRegressor interface that
+    MultiOutputRegressor, predict() and SHAP explanations use.
+    """
+
+    def __init__(self, booster: lgb.Booster) -> None:
+        """
+        Initializes the BoosterRegressor.
+
+        Args:
+            booster (lgb.Booster): The trained booster.
+        """
+        self.booster_ = booster
+
+    @property
+    def best_iteration_(self) -> int:
+        """The best iteration found by early stopping."""
+        return self.booster_.best_iteration
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        """Split counts per feature, as LGBMRegressor reports them."""
+        return self.booster_.feature_importance()
+
+    def predict(self, x_features: pd.DataFrame) -> np.ndarray:
+        """Predict with the best iteration."""
+        return self.booster_.predict(x_features)
+
+
+def first_iteration_timer(started: float, record: Dict[str, float]) -> Any:
+    """
+    Return a LightGBM callback recording the seconds until the first iteration.
+
+    Args:
+        started (float): The perf_counter() value the fit started at.
+        record (Dict[str, float]): Receives the time under "seconds".
+
+    Returns:
+        Any: The callback.
+    """
+
+    def callback(env: Any) -> None:
+        if env.iteration == env.begin_iteration:
+            record["seconds"] = time.perf_counter() - started
+
+    return callback
+
+
+def latest_rows(
+    length: int, size: float, dates: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Mark the rows of the latest days, holding about ``size`` of the rows.
+
+    Args:
+        length (int): The number of rows.
+        size (float): The share of rows to mark.
+        dates (Optional[np.ndarray]): The date of each row. Without dates, or
+            with a single day, the last rows in their given order are marked.
+
+    Returns:
+        np.ndarray: A boolean mask of the latest rows.
+    """
+    if dates is not None:
+        days = pd.to_datetime(pd.Series(dates)).dt.normalize().to_numpy()
+        unique = np.unique(days)
+        if len(unique) > 1:
+            latest = min(max(1, round(len(unique) * size)), len(unique) - 1)
+            return days >= unique[-latest]
+    latest = min(max(1, round(length * size)), length - 1)
+    return np.arange(length) >= length - latest
+
 
 class ModelTrainer:
     """
     A class to train the model.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        use_dataset_cache: Optional[bool] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> None:
         """
         Initializes the ModelTrainer.
+
+        Args:
+            use_dataset_cache (Optional[bool]): Reuse binned LightGBM Datasets
+                across trainings on the same feature table. Defaults to the
+                ``dataset_cache`` setting of MODEL_CONFIG.
+            config (Optional[Dict[str, Any]]): Overrides of MODEL_CONFIG, such
+                as a tuned config from src.tuning.
         """
-        self.config: Dict[str, Any] = MODEL_CONFIG
+        self.config: Dict[str, Any] = {**MODEL_CONFIG, **(config or {})}
+        cache_config = self.config.get("dataset_cache", {})
+        if use_dataset_cache is None:
+            use_dataset_cache = cache_config.get("enabled", False)
+        self.dataset_cache: Optional[LGBMDatasetCache] = None
+        if use_dataset_cache:
+            self.dataset_cache = LGBMDatasetCache(
+                cache_config.get("path", "data/cache/lgb_datasets/"),
+                parse_size(cache_config.get("max_disk_usage", "2GB")),
+            )
         self.model: MultiOutputRegressor = None
         self.scaler: StandardScaler = StandardScaler()
         self.label_encoders: Dict[str, LabelEncoder] = {}
         self.feature_names: List[str] = []
+        self.input_columns: List[str] = []
+        self.categories: Dict[str, List[str]] = {}
+        self.feature_importance: pd.DataFrame = pd.DataFrame(
+            columns=["feature", "importance"]
+        )
+        self.training_report: Dict[str, Any] = {}
+        self.update_history: List[Dict[str, Any]] = []
+        self.model_version: Optional[str] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Drop the dataset cache when pickling.
+
+        The cache holds a lock and a machine-local directory, so a saved
+        trainer is loaded without one.
+        """
+        state = self.__dict__.copy()
+        state["dataset_cache"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled trainer without a dataset cache."""
+        state.setdefault("dataset_cache", None)
+        self.__dict__.update(state)
 
     def prepare_features(
         self, x_features: pd.DataFrame, y_features: pd.DataFrame = None
@@ -38,6 +177,10 @@ class ModelTrainer:
         """
         Prepare features for training with proper encoding and scaling.
 
+        With ``preprocessing: "native"`` in the config the ids are passed to
+        LightGBM as categoricals instead and nothing is scaled; see
+        prepare_native_features.
+
         Args:
             x_features (pd.DataFrame): The input features.
             y_features (pd.DataFrame, optional): The target features. Defaults to None.
@@ -45,13 +188,17 @@ class ModelTrainer:
         Returns:
             pd.DataFrame: The processed features.
         """
+        if y_features is not None:
+            self.input_columns = list(x_features.columns)
+        if self.config.get("preprocessing", "scaled") == "native":
+            return self.prepare_native_features(x_features, y_features is not None)
+
         logger.info("Preparing features for model training...")
 
         x_processed = x_features.copy()
 
         # Encode categorical variables
-        categorical_columns = ["city_id", "ward_id"]
-        for col in categorical_columns:
+        for col in CATEGORICAL_COLUMNS:
             if col in x_processed.columns:
                 if col not in self.label_encoders:
                     self.label_encoders[col] = LabelEncoder()
@@ -92,70 +239,448 @@ class ModelTrainer:
 
         return x_processed
 
-    def train(
-        self, x_features: pd.DataFrame, y_features: pd.DataFrame
-    ) -> Tuple[MultiOutputRegressor, Dict[str, Any], Dict[str, Any]]:
+    def prepare_native_features(
+        self, x_features: pd.DataFrame, training: bool
+    ) -> pd.DataFrame:
         """
-        Train the multi-output LightGBM model.
+        Prepare features for LightGBM without encoding or scaling.
+
+        Trees split on thresholds, so scaling changes nothing but the cost.
+        Ids become pandas categoricals with the categories seen in training,
+        which LightGBM splits on natively; unseen ids become missing values
+        (and are logged) instead of being mapped to a real id. Prediction is
+        a column gather in the training order.
 
         Args:
             x_features (pd.DataFrame): The input features.
-            y_features (pd.DataFrame): The target features.
+            training (bool): Record the columns and categories.
 
         Returns:
-            Tuple[MultiOutputRegressor, Dict[str, Any], Dict[str, Any]]: The trained model, training metrics, and test metrics.
+            pd.DataFrame: The features in training order.
         """
-        logger.info("Starting model training...")
+        if training:
+            self.feature_names = list(x_features.columns)
+            self.categories = {
+                col: sorted(x_features[col].dropna().astype(str).unique())
+                for col in CATEGORICAL_COLUMNS
+                if col in x_features.columns
+            }
+            x_processed = x_features
+        else:
+            x_processed = x_features[self.feature_names]
 
-        # Prepare features
-        x_processed = self.prepare_features(x_features, y_features)
+        if not self.categories:
+            return x_processed
 
-        # Split data
-        x_train, x_test, y_train, y_test = train_test_split(
-            x_processed,
-            y_features,
-            test_size=self.config["test_size"],
-            random_state=self.config["random_state"],
-        )
+        encoded = {}
+        for col, categories in self.categories.items():
+            values = pd.Categorical(x_processed[col].astype(str), categories=categories)
+            unseen = int((values.isna() & x_processed[col].notna().to_numpy()).sum())
+            if unseen:
+                logger.warning(f"{unseen} unseen {col} values treated as missing")
+            encoded[col] = values
+        return x_processed.assign(**encoded)
 
-        # Initialize LightGBM with better parameters
-        lgb_params = {
+    def native_matrix(self, x_features: pd.DataFrame) -> np.ndarray:
+        """
+        Return native-mode features as the float matrix LightGBM predicts on.
+
+        Ids become the codes of their training categories, NaN when unseen,
+        which is what LightGBM itself derives from pandas categoricals; doing
+        it once here spares every target's booster the conversion.
+
+        Args:
+            x_features (pd.DataFrame): The input features.
+
+        Returns:
+            np.ndarray: The features in training order.
+        """
+        x_processed = x_features[self.feature_names]
+        codes = {}
+        for col, categories in self.categories.items():
+            values = x_processed[col]
+            encoded = pd.Index(categories).get_indexer(values.astype(str))
+            encoded = encoded.astype(np.float64)
+            unseen = (encoded < 0) & values.notna().to_numpy()
+            if unseen.any():
+                logger.warning(
+                    f"{int(unseen.sum())} unseen {col} values treated as missing"
+                )
+            encoded[encoded < 0] = np.nan
+            codes[col] = encoded
+        return x_processed.assign(**codes).to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def lgb_params(self) -> Dict[str, Any]:
+        """
+        Return the LightGBM parameters for the current config.
+
+        Returns:
+            Dict[str, Any]: The objective, metric and seed, with the learning
+                rate and the ``lgb_params`` of the config.
+        """
+        return {
             "objective": "regression",
             "metric": "rmse",
-            "num_leaves": 31,
+            **self.config["lgb_params"],
             "learning_rate": self.config["learning_rate"],
-            "feature_fraction": 0.8,
-            "bagging_fraction": 0.8,
-            "bagging_freq": 5,
             "verbose": -1,
             "random_state": self.config["random_state"],
         }
 
-        # Create multi-output regressor
-        self.model = MultiOutputRegressor(
-            lgb.LGBMRegressor(**lgb_params, n_estimators=self.config["n_estimators"])
+    def split_data(
+        self, x_features: pd.DataFrame, y_features: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        Prepare the features and split them into training and test sets.
+
+        Args:
+            x_features (pd.DataFrame): The input features.
+            y_features (pd.DataFrame): The target features.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+                x_train, x_test, y_train and y_test.
+        """
+        x_processed = self.prepare_features(x_features, y_features)
+        return train_test_split(
+            x_processed,
+            y_features,
+            test_size=self.config["test_size"],
+            random_state=self.config["random_state"],
         )
 
-        # Train model with early stopping
-        self.model.fit(
-            x_train,
-            y_train,
-            eval_set=[(x_test, y_test)],
-            eval_metric="rmse",
-            early_stopping_rounds=self.config["early_stopping_rounds"],
-            verbose=False,
+    def train(
+        self, x_features: pd.DataFrame, y_features: pd.DataFrame
+    ) -> Tuple[MultiOutputRegressor, Dict[str, Any], Dict[str, Any]]:
+        """
+        Train the multi-output LightGBM model.
+
+        Args:
+            x_features (pd.DataFrame): The input features.
+            y_features (pd.DataFrame): The target features.
+
+        Returns:
+            Tuple[MultiOutputRegressor, Dict[str, Any], Dict[str, Any]]: The trained model, training metrics, and test metrics.
+        """
+        logger.info("Starting model training...")
+
+        # Prepare features and split data
+        x_train, x_test, y_train, y_test = self.split_data(x_features, y_features)
+
+        # Train one model per target with early stopping
+        self.model = self.fit_targets(
+            x_train, y_train, x_test, y_test, self.lgb_params()
         )
+        self.model_version = None
 
         # Evaluate model
         train_metrics = self.evaluate_model(x_train, y_train, "Training")
         test_metrics = self.evaluate_model(x_test, y_test, "Test")
 
         # Feature importance
-        self.calculate_feature_importance(x_processed.columns)
+        self.calculate_feature_importance(x_train.columns)
 
         logger.info("Model training completed successfully")
         return self.model, train_metrics, test_metrics
 
+    def fit_targets(
+        self,
+        x_train: pd.DataFrame,
+        y_train: pd.DataFrame,
+        x_valid: pd.DataFrame,
+        y_valid: pd.DataFrame,
+        lgb_params: Dict[str, Any],
+    ) -> MultiOutputRegressor:
+        """
+        Fit one LightGBM model per target, early-stopped on the validation split.
+
+        With ``parallel_targets`` in the config the targets are fitted
+        concurrently on threads (LightGBM releases the GIL while it trains)
+        and the ``n_jobs`` core budget is split evenly between them, so the
+        fits never run more threads than the budget in total. Otherwise they
+        are fitted one after another with the whole budget each. The fitted
+        models are assembled into a MultiOutputRegressor either way, so
+        predict() and saved models are unchanged.
+
+        With a dataset cache the split is binned once per feature-table
+        fingerprint and binning parameters, saved in LightGBM's binary
+        format, and every later training loads the bins instead of
+        recomputing them; the models are trained with lgb.train and wrapped
+        in BoosterRegressor.
+
+        Args:
+            x_train (pd.DataFrame): The training features.
+            y_train (pd.DataFrame): The training targets, one column each.
+            x_valid (pd.DataFrame): The validation features.
+            y_valid (pd.DataFrame): The validation targets.
+            lgb_params (Dict[str, Any]): The LightGBM parameters.
+
+        Returns:
+            MultiOutputRegressor: The fitted multi-output model.
+        """
+        targets = list(y_train.columns)
+        budget = self.config.get("n_jobs") or os.cpu_count() or 1
+        parallel = self.config.get("parallel_targets", False) and len(targets) > 1
+        workers = min(len(targets), budget) if parallel else 1
+        threads = max(1, budget // workers)
+
+        dataset_files, cache_hit, dataset_seconds = None, None, 0.0
+        if self.dataset_cache is not None:
+            started = time.perf_counter()
+            train_path, valid_path, cache_hit = self.dataset_cache.get_or_build(
+                x_train, x_valid, lgb_params
+            )
+            dataset_files = (train_path, valid_path)
+            dataset_seconds = time.perf_counter() - started
+
+        def fit(index: int) -> Tuple[Any, float, float]:
+            started = time.perf_counter()
+            first_iteration: Dict[str, float] = {}
+            callbacks = [
+                lgb.early_stopping(self.config["early_stopping_rounds"], verbose=False),
+                first_iteration_timer(started, first_iteration),
+            ]
+
+            if dataset_files is not None:
+                train_set, valid_set = self.dataset_cache.load(
+                    *dataset_files,
+                    y_train.iloc[:, index],
+                    y_valid.iloc[:, index],
+                    lgb_params,
+                )
+                booster = lgb.train(
+                    {**lgb_params, "num_threads": threads},
+                    train_set,
+                    num_boost_round=self.config["n_estimators"],
+                    valid_sets=[valid_set],
+                    callbacks=callbacks,
+                )
+                estimator = BoosterRegressor(booster)
+            else:
+                estimator = lgb.LGBMRegressor(
+                    **lgb_params,
+                    n_estimators=self.config["n_estimators"],
+                    n_jobs=threads,
+                )
+                estimator.fit(
+                    x_train,
+                    y_train.iloc[:, index],
+                    eval_set=[(x_valid, y_valid.iloc[:, index])],
+                    eval_metric="rmse",
+                    callbacks=callbacks,
+                )
+            return (
+                estimator,
+                time.perf_counter() - started,
+                first_iteration.get("seconds", 0.0),
+            )
+
+        wall_start = time.perf_counter()
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(fit, range(len(targets))))
+        else:
+            results = [fit(index) for index in range(len(targets))]
+        wall_seconds = time.perf_counter() - wall_start
+
+        model = MultiOutputRegressor(
+            lgb.LGBMRegressor(**lgb_params, n_estimators=self.config["n_estimators"])
+        )
+        model.estimators_ = [estimator for estimator, _, _ in results]
+        model.n_features_in_ = x_train.shape[1]
+        model.feature_names_in_ = np.asarray(x_train.columns, dtype=object)
+
+        self.training_report = {
+            "mode": "parallel" if workers > 1 else "sequential",
+            "n_jobs": budget,
+            "concurrent_targets": workers,
+            "threads_per_target": threads,
+            "wall_seconds": wall_seconds,
+            "target_seconds": {
+                target: seconds for target, (_, seconds, _) in zip(targets, results)
+            },
+            "first_iteration_seconds": {
+                target: first for target, (_, _, first) in zip(targets, results)
+            },
+            "best_iterations": {
+                target: int(estimator.best_iteration_ or 0)
+                for target, (estimator, _, _) in zip(targets, results)
+            },
+            "dataset_cache": (
+                None if cache_hit is None else ("hit" if cache_hit else "miss")
+            ),
+            "dataset_seconds": dataset_seconds,
+        }
+        logger.info(
+            f"Fitted {len(targets)} targets ({self.training_report['mode']}, "
+            f"{workers} x {threads} threads) in {wall_seconds:.2f}s"
+        )
+        return model
+
+    def update(
+        self,
+        x_features: pd.DataFrame,
+        y_features: pd.DataFrame,
+        mode: Optional[str] = None,
+        x_valid: Optional[pd.DataFrame] = None,
+        y_valid: Optional[pd.DataFrame] = None,
+        dates: Optional[pd.Series] = None,
+    ) -> Dict[str, Any]:
+        """
+        Update the trained model with new data instead of retraining it.
+
+        The new rows go through the stored label encoders and scaler. In
+        "continue" mode each target's booster, cut back to its best
+        iteration, keeps boosting on the new rows with early stopping; in
+        "refit" mode the tree structure is kept and only the leaf values are
+        refitted, blended with the old ones by ``refit_decay_rate``. Either
+        way the cost depends on the number of new rows, not the history.
+
+        A candidate replaces a target's current model only if its validation
+        RMSE is no worse than the current model's (within ``tolerance``).
+        Without an explicit validation set, the latest days holding
+        ``test_size`` of the new rows are held out for that decision. The
+        validation rows only decide the promotion: continued boosting
+        early-stops on the latest days of the remaining new rows. Updates
+        with too few rows to fill every split raise ValueError.
+
+        Args:
+            x_features (pd.DataFrame): The new input features.
+            y_features (pd.DataFrame): The new target features.
+            mode (Optional[str]): "continue" or "refit". Defaults to the
+                ``update`` config.
+            x_valid (Optional[pd.DataFrame]): Validation features.
+            y_valid (Optional[pd.DataFrame]): Validation targets.
+            dates (Optional[pd.Series]): The date of each new row. Without
+                dates the rows are taken to be in time order.
+
+        Returns:
+            Dict[str, Any]: Per target, the current and candidate validation
+                RMSE and whether the candidate was promoted, plus row counts
+                and timings.
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+
+        # Trainers saved before updates existed carry no update config
+        settings = {**MODEL_CONFIG["update"], **self.config.get("update", {})}
+        mode = mode or settings["mode"]
+        if mode not in ("continue", "refit"):
+            raise ValueError(f"Unsupported update mode: {mode}")
+
+        started = time.perf_counter()
+        x_processed = self.prepare_features(x_features)
+        if dates is not None:
+            dates = np.asarray(dates)
+        if x_valid is None:
+            latest = latest_rows(len(x_processed), self.config["test_size"], dates)
+            x_train, x_valid = x_processed[~latest], x_processed[latest]
+            y_train, y_valid = y_features[~latest], y_features[latest]
+            if dates is not None:
+                dates = dates[~latest]
+        else:
+            x_train, y_train = x_processed, y_features
+            x_valid = self.prepare_features(x_valid)
+
+        # Continued boosting early-stops on its own latest days, so the
+        # validation rows judge the candidate without having shaped it
+        x_fit, y_fit = x_train, y_train
+        if mode == "continue":
+            stop = latest_rows(len(x_train), self.config["test_size"], dates)
+            x_fit, x_stop = x_train[~stop], x_train[stop]
+            y_fit, y_stop = y_train[~stop], y_train[stop]
+
+        # LightGBM needs two rows to build a Dataset, and every split a row
+        stop_rows = len(x_train) - len(x_fit)
+        if (
+            len(x_fit) < 2
+            or len(x_valid) == 0
+            or (mode == "continue" and not stop_rows)
+        ):
+            raise ValueError(
+                f"Too few new rows for a {mode} update: {len(x_features)} rows "
+                f"leave {len(x_fit)} to train on (at least 2 needed), "
+                f"{len(x_valid)} to validate"
+                + (f" and {stop_rows} to early-stop on" if mode == "continue" else "")
+            )
+
+        lgb_params = {
+            **self.lgb_params(),
+            "num_threads": self.config.get("n_jobs") or os.cpu_count() or 1,
+        }
+        if settings.get("learning_rate"):
+            lgb_params["learning_rate"] = settings["learning_rate"]
+
+        report: Dict[str, Any] = {
+            "mode": mode,
+            "rows": len(x_features),
+            "fit_rows": len(x_fit),
+            "validation_rows": len(x_valid),
+            "targets": {},
+        }
+        estimators = list(self.model.estimators_)
+        for index, target in enumerate(y_features.columns):
+            current = estimators[index]
+            booster = current.booster_
+            booster = lgb.Booster(
+                model_str=booster.model_to_string(
+                    num_iteration=current.best_iteration_ or None
+                )
+            )
+
+            if mode == "continue":
+                train_set = lgb.Dataset(
+                    x_fit, y_fit.iloc[:, index], params=binning_params(lgb_params)
+                )
+                valid_set = train_set.create_valid(x_stop, y_stop.iloc[:, index])
+                booster = lgb.train(
+                    lgb_params,
+                    train_set,
+                    num_boost_round=settings["rounds"],
+                    init_model=booster,
+                    valid_sets=[valid_set],
+                    callbacks=[
+                        lgb.early_stopping(
+                            self.config["early_stopping_rounds"], verbose=False
+                        )
+                    ],
+                )
+            else:
+                booster = booster.refit(
+                    x_train,
+                    y_train.iloc[:, index],
+                    decay_rate=settings["refit_decay_rate"],
+                )
+            candidate = BoosterRegressor(booster)
+
+            current_rmse = np.sqrt(
+                mean_squared_error(y_valid.iloc[:, index], current.predict(x_valid))
+            )
+            candidate_rmse = np.sqrt(
+                mean_squared_error(y_valid.iloc[:, index], candidate.predict(x_valid))
+            )
+            promoted = candidate_rmse <= current_rmse * (1 + settings["tolerance"])
+            if promoted:
+                estimators[index] = candidate
+            report["targets"][target] = {
+                "current_rmse": float(current_rmse),
+                "candidate_rmse": float(candidate_rmse),
+                "promoted": bool(promoted),
+            }
+
+        self.model.estimators_ = estimators
+        self.model_version = None
+        self.calculate_feature_importance(x_train.columns)
+        report["seconds"] = time.perf_counter() - started
+        self.update_history = getattr(self, "update_history", []) + [report]
+
+        logger.info(
+            f"Model update ({mode}, {len(x_features)} rows) in "
+            f"{report['seconds']:.2f}s; promoted: "
+            f"{[t for t, r in report['targets'].items() if r['promoted']]}"
+        )
+        return report
+
     def evaluate_model(
         self, x_features: pd.DataFrame, y_features: pd.DataFrame, dataset_name: str
     ) -> Dict[str, Any]:
@@ -207,6 +732,7 @@ class ModelTrainer:
                     ),
                 }
             ).sort_values("importance", ascending=False)
+            self.feature_importance = importance_df
 
             logger.info("Top 10 most important features:")
             for _, row in importance_df.head(10).iterrows():
@@ -225,14 +751,136 @@ class ModelTrainer:
         if self.model is None:
             raise ValueError("Model not trained. Call train() first.")
 
-        x_processed = self.prepare_features(x_features)
-        predictions = self.model.predict(x_processed)
+        predictions = self.predict_matrix(self.model_input(x_features))
+        return pd.DataFrame(predictions, columns=TARGET_COLUMNS)
+
+    def predict_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Predict prepared features with the boosters directly.
 
-        return pd.DataFrame(
-            predictions, columns=["Net_CO2_kg", "Net_PM25_kg", "Net_NOX_kg"]
+        Skips MultiOutputRegressor's per-estimator input validation, which
+        costs more than the trees on small batches. Models without
+        per-target estimators, such as a distilled serving variant, predict
+        the matrix themselves.
+
+        Args:
+            matrix (np.ndarray): The prepared features, from model_input().
+
+        Returns:
+            np.ndarray: The predictions, one column per target.
+        """
+        if not hasattr(self.model, "estimators_"):
+            return self.model.predict(matrix)
+        return np.column_stack(
+            [estimator.booster_.predict(matrix) for estimator in self.model.estimators_]
+        )
+
+    def version(self) -> str:
+        """
+        Return the content hash of the trained boosters.
+
+        Computed on first use and reset whenever train() or update() change
+        the model, so trainers saved before versions existed get one too.
+
+        Returns:
+            str: A hex digest.
+        """
+        if self.model is None:
+            raise ValueError("Model not trained. Call train() first.")
+        if not getattr(self, "model_version", None):
+            self.model_version = joblib.hash(
+                [
+                    getattr(estimator, "booster_", estimator).model_to_string()
+                    for estimator in self.model.estimators_
+                ]
+            )
+        return self.model_version
+
+    def explainers(self) -> List[shap.TreeExplainer]:
+        """
+        Return the SHAP explainers of the model, one per target.
+
+        Explainers are built once per model version and kept in
+        EXPLAINER_CACHE, which holds the EXPLAINER_CACHE_SIZE most recently
+        used versions.
+
+        Returns:
+            List[shap.TreeExplainer]: The explainers.
+        """
+        version = self.version()
+        with _explainer_lock:
+            if version in EXPLAINER_CACHE:
+                EXPLAINER_CACHE.move_to_end(version)
+                return EXPLAINER_CACHE[version]
+
+        # Built outside the lock; a concurrent build of the same version
+        # only wastes work
+        started = time.perf_counter()
+        explainers = [
+            shap.TreeExplainer(getattr(estimator, "booster_", estimator))
+            for estimator in self.model.estimators_
+        ]
+        logger.info(
+            f"Built SHAP explainers for model {version[:8]} in "
+            f"{time.perf_counter() - started:.2f}s"
         )
+        with _explainer_lock:
+            EXPLAINER_CACHE[version] = explainers
+            EXPLAINER_CACHE.move_to_end(version)
+            while len(EXPLAINER_CACHE) > EXPLAINER_CACHE_SIZE:
+                EXPLAINER_CACHE.popitem(last=False)
+        return explainers
 
-    def explain_prediction(self, x_features: pd.DataFrame, sample_index: int = 0) -> Dict[str, Any]:
+    def model_input(self, x_features: pd.DataFrame) -> np.ndarray:
+        """
+        Return the matrix the boosters read for the given input features.
+
+        Args:
+            x_features (pd.DataFrame): The input features.
+
+        Returns:
+            np.ndarray: The prepared features, in feature_names order.
+        """
+        if self.config.get("preprocessing", "scaled") == "native":
+            return self.native_matrix(x_features)
+        return self.prepare_features(x_features).to_numpy(dtype=np.float64)
+
+    def explain_batch(
+        self, x_features: pd.DataFrame, n_jobs: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Compute SHAP values of many rows with the cached explainers.
+
+        Args:
+            x_features (pd.DataFrame): The input features.
+            n_jobs (Optional[int]): Threads the targets are explained on.
+                Defaults to one per target.
+
+        Returns:
+            Dict[str, Any]: Per target, SHAP values of shape (rows, features)
+                and the expected value, plus the feature names and the
+                model version.
+        """
+        explainers = self.explainers()
+        matrix = self.model_input(x_features)
+
+        with ThreadPoolExecutor(max_workers=n_jobs or len(explainers)) as pool:
+            shap_values = list(
+                pool.map(lambda explainer: explainer.shap_values(matrix), explainers)
+            )
+
+        return {
+            "shap_values": shap_values,
+            "expected_values": [
+                float(np.ravel(explainer.expected_value)[0]) for explainer in explainers
+            ],
+            "feature_names": self.feature_names,
+            "model_version": self.version(),
+        }
+
+    def explain_prediction(
+        self, x_features: pd.DataFrame, sample_index: int = 0
+    ) -> Dict[str, Any]:
         """
         Generate SHAP explanations for predictions.
 
@@ -246,29 +894,76 @@ class ModelTrainer:
         if self.model is None:
             raise ValueError("Model not trained. Call train() first.")
 
-        x_processed = self.prepare_features(x_features)
+        return self.explain_batch(x_features.iloc[sample_index : sample_index + 1])
 
-        # Calculate SHAP values for each target
-        explainers = []
-        shap_values_list = []
+    def global_importance(
+        self,
+        x_features: pd.DataFrame,
+        sample_size: int = 500,
+        n_jobs: Optional[int] = None,
+        random_state: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Estimate the mean absolute SHAP value of every feature from a sample.
 
-        for i, estimator in enumerate(self.model.estimators_):
-            explainer = shap.TreeExplainer(estimator)
-            shap_values = explainer.shap_values(
-                x_processed.iloc[sample_index : sample_index + 1]
-            )
-            explainers.append(explainer)
-            shap_values_list.append(shap_values)
+        The sampled rows are split into chunks that are explained per target
+        on a thread pool; SHAP computation runs in LightGBM, which releases
+        the GIL.
 
-        return {
-            "shap_values": shap_values_list,
-            "expected_values": [explainer.expected_value for explainer in explainers],
-            "feature_names": self.feature_names,
-        }
+        Args:
+            x_features (pd.DataFrame): The rows to sample from.
+            sample_size (int): The number of rows sampled.
+            n_jobs (Optional[int]): Threads. Defaults to the ``n_jobs``
+                config, then the CPU count.
+            random_state (Optional[int]): The sampling seed. Defaults to the
+                ``random_state`` config.
+
+        Returns:
+            pd.DataFrame: Per feature, the mean absolute SHAP value of each
+                target and their mean, sorted by the latter.
+        """
+        explainers = self.explainers()
+        n_jobs = n_jobs or self.config.get("n_jobs") or os.cpu_count() or 1
+        if random_state is None:
+            random_state = self.config["random_state"]
+
+        sample = x_features.sample(
+            min(sample_size, len(x_features)), random_state=random_state
+        )
+        chunks = np.array_split(self.model_input(sample), n_jobs)
+        tasks = [
+            (index, chunk)
+            for index in range(len(explainers))
+            for chunk in chunks
+            if len(chunk)
+        ]
+
+        def explain(task: Tuple[int, np.ndarray]) -> Tuple[int, np.ndarray]:
+            index, chunk = task
+            values = explainers[index].shap_values(chunk)
+            return index, np.abs(values).sum(axis=0)
+
+        totals = np.zeros((len(explainers), len(self.feature_names)))
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            for index, total in pool.map(explain, tasks):
+                totals[index] += total
+
+        importance = pd.DataFrame(
+            (totals / len(sample)).T,
+            columns=TARGET_COLUMNS,
+            index=self.feature_names,
+        )
+        importance["mean"] = importance.mean(axis=1)
+        importance = importance.sort_values("mean", ascending=False)
+        return importance.rename_axis("feature").reset_index()
 
 
 def train_lgbm_model(
-    x_features: pd.DataFrame, y_features: pd.DataFrame
+    x_features: pd.DataFrame,
+    y_features: pd.DataFrame,
+    use_dataset_cache: Optional[bool] = None,
+    config: Optional[Dict[str, Any]] = None,
+    save_path: Optional[str] = "models/trained_model.pkl",
 ) -> Tuple[ModelTrainer, Dict[str, Any], Dict[str, Any]]:
     """
     Main function to train the LightGBM model.
@@ -276,14 +971,95 @@ def train_lgbm_model(
     Args:
         x_features (pd.DataFrame): The input features.
         y_features (pd.DataFrame): The target features.
+        use_dataset_cache (Optional[bool]): Reuse binned LightGBM Datasets.
+            Defaults to the MODEL_CONFIG setting.
+        config (Optional[Dict[str, Any]]): Overrides of MODEL_CONFIG.
+        save_path (Optional[str]): Where the trainer is saved; None skips
+            saving, e.g. when a cached pipeline stage saves it.
 
     Returns:
         Tuple[ModelTrainer, Dict[str, Any], Dict[str, Any]]: The trainer, training metrics, and test metrics.
     """
-    trainer = ModelTrainer()
+    trainer = ModelTrainer(use_dataset_cache=use_dataset_cache, config=config)
     model, train_metrics, test_metrics = trainer.train(x_features, y_features)
 
     # Save model and preprocessing objects
-    save_model(trainer, "models/trained_model.pkl")
+    if save_path:
+        save_model(trainer, save_path)
 
     return trainer, train_metrics, test_metrics
+
+
+def benchmark_target_parallelism(
+    x_features: pd.DataFrame, y_features: pd.DataFrame, n_jobs: int = None
+) -> Dict[str, Any]:
+    """
+    Train sequentially and with parallel targets on the same data and compare.
+
+    Args:
+        x_features (pd.DataFrame): The input features.
+        y_features (pd.DataFrame): The target features.
+        n_jobs (int, optional): The core budget. Defaults to the CPU count.
+
+    Returns:
+        Dict[str, Any]: The fit wall time of each mode, the speedup, and the
+            largest prediction difference between the two models.
+    """
+    results = {}
+    for parallel in (False, True):
+        trainer = ModelTrainer()
+        trainer.config = {
+            **trainer.config,
+            "parallel_targets": parallel,
+            "n_jobs": n_jobs,
+        }
+        trainer.train(x_features, y_features)
+        results[parallel] = trainer
+
+    sequential, parallel = results[False], results[True]
+    difference = np.abs(
+        sequential.predict(x_features).to_numpy()
+        - parallel.predict(x_features).to_numpy()
+    ).max()
+    report = {
+        "n_jobs": parallel.training_report["n_jobs"],
+        "sequential_seconds": sequential.training_report["wall_seconds"],
+        "parallel_seconds": parallel.training_report["wall_seconds"],
+        "speedup": sequential.training_report["wall_seconds"]
+        / parallel.training_report["wall_seconds"],
+        "max_prediction_difference": float(difference),
+    }
+    logger.info(
+        f"Parallel targets: {report['speedup']:.2f}x speedup on "
+        f"{report['n_jobs']} cores"
+    )
+    return report
+
+
+def update_lgbm_model(
+    x_features: pd.DataFrame,
+    y_features: pd.DataFrame,
+    mode: Optional[str] = None,
+    model_path: str = "models/trained_model.pkl",
+    dates: Optional[pd.Series] = None,
+) -> Tuple[ModelTrainer, Dict[str, Any]]:
+    """
+    Update the saved model with new data and save it if any target improved.
+
+    Args:
+        x_features (pd.DataFrame): The new input features.
+        y_features (pd.DataFrame): The new target features.
+        mode (Optional[str]): "continue" or "refit". Defaults to the config.
+        model_path (str): The saved trainer.
+        dates (Optional[pd.Series]): The date of each new row.
+
+    Returns:
+        Tuple[ModelTrainer, Dict[str, Any]]: The trainer and the update report.
+    """
+    trainer = load_model(model_path)
+    report = trainer.update(x_features, y_features, mode=mode, dates=dates)
+    if any(target["promoted"] for target in report["targets"].values()):
+        save_model(trainer, model_path)
+    else:
+        logger.info("No target improved; keeping the saved model")
+    return trainer, report
@@ -0,0 +1,350 @@
+"""
+This module contains out-of-core training, which builds the binned LightGBM
+Datasets from the Parquet lake one part file at a time instead of from an
+in-memory feature table.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from sklearn.multioutput import MultiOutputRegressor
+from sklearn.preprocessing import LabelEncoder
+
+from src.compact import CITY_CONSTANT_COLUMNS, attach_constants
+from src.data_lake import ParquetDataLake
+from src.dataset_cache import binning_params
+from src.model_trainer import (
+    CATEGORICAL_COLUMNS,
+    TARGET_COLUMNS,
+    BoosterRegressor,
+    ModelTrainer,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PartFileReader:
+    """
+    Reads and prepares part files, holding only the last one in memory.
+
+    LightGBM samples rows in increasing order and pushes them in batches,
+    sequence by sequence, so a single-slot cache reads every file once per
+    pass over the data.
+    """
+
+    def __init__(
+        self, columns: List[str], prepare: Callable[[pd.DataFrame], np.ndarray]
+    ) -> None:
+        """
+        Initializes the PartFileReader.
+
+        Args:
+            columns (List[str]): The feature columns, in model order.
+            prepare (Callable[[pd.DataFrame], np.ndarray]): Turns a chunk of
+                features into the matrix the boosters read.
+        """
+        self.columns = columns
+        self.prepare = prepare
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._matrix: Optional[np.ndarray] = None
+        self.reads = 0
+
+    def read_frame(self, path: str) -> pd.DataFrame:
+        """Read the feature columns of a part file."""
+        schema = pq.read_schema(path).names
+        stored = [col for col in self.columns if col in schema]
+        # Compact tables keep per-city constants in a side table
+        constants = [col for col in self.columns if col not in schema]
+        if constants and "city_id" not in stored:
+            stored.append("city_id")
+        df = pq.read_table(path, columns=stored).to_pandas()
+        if constants:
+            df = attach_constants(df, constants)
+        return df[self.columns]
+
+    def matrix(self, path: str) -> np.ndarray:
+        """Return the prepared matrix of a part file."""
+        with self._lock:
+            if path != self._path:
+                self._matrix = np.ascontiguousarray(
+                    self.prepare(self.read_frame(path)), dtype=np.float64
+                )
+                self._path = path
+                self.reads += 1
+            return self._matrix
+
+
+class PartFileSequence(lgb.Sequence):
+    """The rows of one part file that belong to one split."""
+
+    def __init__(self, path: str, rows: np.ndarray, reader: PartFileReader) -> None:
+        """
+        Initializes the PartFileSequence.
+
+        Args:
+            path (str): The part file.
+            rows (np.ndarray): The positions of the split's rows in the file.
+            reader (PartFileReader): The shared reader.
+        """
+        self.path = path
+        self.rows = rows
+        self.reader = reader
+        self.batch_size = max(len(rows), 1)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, idx: Any) -> np.ndarray:
+        matrix = self.reader.matrix(self.path)
+        if isinstance(idx, slice):
+            return matrix[self.rows[idx]]
+        return matrix[self.rows[idx]].copy()
+
+
+def scan_partitions(
+    files: List[str],
+    target_columns: List[str],
+    id_columns: List[str],
+    test_size: float,
+    random_state: int,
+) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+    """
+    Read the ids and labels of every part file and split its rows.
+
+    Only the id and target columns are read. Each file's rows are split by
+    a generator seeded with the file's position, so the split does not
+    depend on how many files are read together.
+
+    Args:
+        files (List[str]): The part files.
+        target_columns (List[str]): The target columns.
+        id_columns (List[str]): The categorical id columns among the features.
+        test_size (float): The share of rows held out for validation.
+        random_state (int): The split seed.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, List[str]]]: Per file, the positions
+            and labels of the training and validation rows; and the sorted
+            values of every id column.
+    """
+    splits: Dict[str, Any] = {}
+    values: Dict[str, set] = {col: set() for col in id_columns}
+    for index, path in enumerate(files):
+        table = pq.read_table(path, columns=id_columns + target_columns).to_pandas()
+        for col in id_columns:
+            values[col].update(table[col].dropna().astype(str).unique())
+
+        valid = np.random.default_rng([random_state, index]).random(len(table))
+        valid = valid < test_size
+        labels = table[target_columns].to_numpy(dtype=np.float64)
+        splits[path] = {
+            "train": (np.flatnonzero(~valid), labels[~valid]),
+            "valid": (np.flatnonzero(valid), labels[valid]),
+        }
+    return splits, {col: sorted(found) for col, found in values.items()}
+
+
+def fit_preprocessing(
+    trainer: ModelTrainer,
+    reader: PartFileReader,
+    files: List[str],
+    categories: Dict[str, List[str]],
+) -> None:
+    """
+    Fit the trainer's preprocessing from per-file passes.
+
+    Native mode needs only the categories. Scaled mode fits the label
+    encoders on the id values and the scaler with one partial_fit per file,
+    encoding each chunk as prepare_features does.
+
+    Args:
+        trainer (ModelTrainer): The trainer to fit.
+        reader (PartFileReader): The reader of the feature columns.
+        files (List[str]): The part files.
+        categories (Dict[str, List[str]]): The values of every id column.
+    """
+    trainer.input_columns = list(reader.columns)
+    if trainer.config.get("preprocessing", "scaled") == "native":
+        trainer.feature_names = list(reader.columns)
+        trainer.categories = categories
+        return
+
+    trainer.label_encoders = {
+        col: LabelEncoder().fit(values) for col, values in categories.items()
+    }
+
+    def encode(chunk: pd.DataFrame) -> pd.DataFrame:
+        encoded = {
+            f"{col}_encoded": encoder.transform(chunk[col].astype(str))
+            for col, encoder in trainer.label_encoders.items()
+        }
+        return chunk.drop(columns=list(categories)).assign(**encoded)
+
+    for path in files:
+        trainer.scaler.partial_fit(encode(reader.read_frame(path)))
+    trainer.feature_names = list(trainer.scaler.feature_names_in_)
+
+
+def train_out_of_core(
+    lake_path: Optional[str] = None,
+    dataset: str = "features",
+    target_columns: Optional[List[str]] = None,
+    exclude_columns: Sequence[str] = (),
+    cities: Optional[List[str]] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> Tuple[ModelTrainer, Dict[str, Any]]:
+    """
+    Train a ModelTrainer from a lake dataset without loading it whole.
+
+    The rows are split per part file, and the preprocessing is fitted from
+    passes that read one file at a time. The training and validation
+    Datasets are then built from lgb.Sequence objects over the part files;
+    each batch is prepared as it is pushed. Peak memory is the binned
+    Datasets, the labels, LightGBM's bin-construction sample
+    (``bin_construct_sample_cnt`` rows) and one prepared part file. The
+    targets are trained one after another on the same binned Datasets, with
+    the whole ``n_jobs`` budget each.
+
+    Args:
+        lake_path (Optional[str]): The root of the Parquet lake.
+        dataset (str): The feature dataset.
+        target_columns (Optional[List[str]]): The targets. Defaults to the
+            model's outputs.
+        exclude_columns (Sequence[str]): Columns that are not features.
+        cities (Optional[List[str]]): Cities to train on. Defaults to all.
+        config (Optional[Dict[str, Any]]): Overrides of MODEL_CONFIG.
+
+    Returns:
+        Tuple[ModelTrainer, Dict[str, Any]]: The trained trainer, which
+            predicts like one trained in memory, and the validation metrics.
+    """
+    started = time.perf_counter()
+    target_columns = list(target_columns or TARGET_COLUMNS)
+    lake = ParquetDataLake(lake_path) if lake_path else ParquetDataLake()
+    files = lake.list_files(dataset, cities)
+    if not files:
+        raise ValueError(f"No partitions of '{dataset}' to train on")
+
+    schema = lake.columns(dataset)
+    columns = schema + [col for col in CITY_CONSTANT_COLUMNS if col not in schema]
+    feature_columns = [
+        col
+        for col in columns
+        if col not in exclude_columns and col not in target_columns
+    ]
+    id_columns = [col for col in CATEGORICAL_COLUMNS if col in feature_columns]
+
+    trainer = ModelTrainer(use_dataset_cache=False, config=config)
+    splits, categories = scan_partitions(
+        files,
+        target_columns,
+        id_columns,
+        trainer.config["test_size"],
+        trainer.config["random_state"],
+    )
+    reader = PartFileReader(feature_columns, trainer.model_input)
+    fit_preprocessing(trainer, reader, files, categories)
+
+    native = trainer.config.get("preprocessing", "scaled") == "native"
+    categorical = (
+        [trainer.feature_names.index(col) for col in trainer.categories]
+        if native
+        else "auto"
+    )
+    lgb_params = {
+        **trainer.lgb_params(),
+        "num_threads": trainer.config.get("n_jobs") or os.cpu_count() or 1,
+    }
+
+    def sequences(split: str) -> Tuple[List[PartFileSequence], np.ndarray]:
+        kept = [path for path in files if len(splits[path][split][0])]
+        return (
+            [PartFileSequence(path, splits[path][split][0], reader) for path in kept],
+            np.concatenate([splits[path][split][1] for path in kept]),
+        )
+
+    train_seqs, y_train = sequences("train")
+    valid_seqs, y_valid = sequences("valid")
+    dataset_start = time.perf_counter()
+    train_set = lgb.Dataset(
+        train_seqs,
+        label=y_train[:, 0],
+        feature_name=trainer.feature_names,
+        categorical_feature=categorical,
+        params=binning_params(lgb_params),
+    ).construct()
+    valid_set = lgb.Dataset(
+        valid_seqs,
+        label=y_valid[:, 0],
+        reference=train_set,
+        feature_name=trainer.feature_names,
+        categorical_feature=categorical,
+    ).construct()
+    dataset_seconds = time.perf_counter() - dataset_start
+
+    estimators, target_seconds = [], {}
+    for index, target in enumerate(target_columns):
+        target_start = time.perf_counter()
+        train_set.set_label(y_train[:, index])
+        valid_set.set_label(y_valid[:, index])
+        booster = lgb.train(
+            lgb_params,
+            train_set,
+            num_boost_round=trainer.config["n_estimators"],
+            valid_sets=[valid_set],
+            callbacks=[
+                lgb.early_stopping(
+                    trainer.config["early_stopping_rounds"], verbose=False
+                )
+            ],
+        )
+        estimators.append(BoosterRegressor(booster))
+        target_seconds[target] = time.perf_counter() - target_start
+
+    model = MultiOutputRegressor(
+        lgb.LGBMRegressor(**lgb_params, n_estimators=trainer.config["n_estimators"])
+    )
+    model.estimators_ = estimators
+    model.n_features_in_ = len(trainer.feature_names)
+    model.feature_names_in_ = np.asarray(trainer.feature_names, dtype=object)
+    trainer.model = model
+    trainer.model_version = None
+    trainer.calculate_feature_importance(trainer.feature_names)
+
+    # The early-stopping scores are the validation RMSE at the kept
+    # iteration, so the validation rows never have to be assembled
+    rmse = {
+        target: float(estimator.booster_.best_score["valid_0"]["rmse"])
+        for target, estimator in zip(target_columns, estimators)
+    }
+    valid_metrics = {
+        "overall_rmse": float(np.sqrt(np.mean(np.square(list(rmse.values()))))),
+        "target_metrics": {target: {"rmse": value} for target, value in rmse.items()},
+    }
+    trainer.training_report = {
+        "mode": "out_of_core",
+        "n_jobs": lgb_params["num_threads"],
+        "files": len(files),
+        "rows": {"train": len(y_train), "valid": len(y_valid)},
+        "file_reads": reader.reads,
+        "dataset_seconds": dataset_seconds,
+        "target_seconds": target_seconds,
+        "best_iterations": {
+            target: int(estimator.best_iteration_ or 0)
+            for target, estimator in zip(target_columns, estimators)
+        },
+        "wall_seconds": time.perf_counter() - started,
+    }
+    logger.info(
+        f"Trained out of core on {len(y_train)} rows from {len(files)} files "
+        f"in {trainer.training_report['wall_seconds']:.2f}s, validation RMSE "
+        f"{valid_metrics['overall_rmse']:.4g}"
+    )
+    return trainer, valid_metrics
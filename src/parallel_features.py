@@ -0,0 +1,211 @@
+"""
+This module runs the rolling-feature and feature-engineering stages per city
+on a process pool.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from src.feature_engineering import calculate_sequestration_and_removal
+from src.utils import calculate_rolling_features
+
+logger = logging.getLogger(__name__)
+
+ROLLING_SORT_KEYS = ["city_id", "ward_id", "daily_date"]
+
+_ROW = "__row__"
+_INDEX = "__index__"
+
+
+def engineer_features_serial(
+    df: pd.DataFrame,
+    rolling_columns: Optional[Sequence[str]] = None,
+    sequestration: bool = True,
+) -> pd.DataFrame:
+    """
+    Run the stages on the whole frame in this process.
+
+    Args:
+        df (pd.DataFrame): Observations with city_id, ward_id and daily_date.
+        rolling_columns (Optional[Sequence[str]]): Columns to add rolling
+            statistics for. Skipped when None.
+        sequestration (bool): Run calculate_sequestration_and_removal.
+
+    Returns:
+        pd.DataFrame: The engineered data.
+    """
+    if rolling_columns:
+        df = calculate_rolling_features(df, list(rolling_columns))
+    if sequestration:
+        df = calculate_sequestration_and_removal(df)
+    return df
+
+
+def _engineer_partition(
+    in_path: str,
+    out_path: str,
+    rolling_columns: Optional[Sequence[str]],
+    sequestration: bool,
+) -> float:
+    """Engineer one partition file into another; returns the CPU seconds used."""
+    df = feather.read_feather(in_path)
+    start = time.process_time()
+    df = engineer_features_serial(df, rolling_columns, sequestration)
+    elapsed = time.process_time() - start
+    feather.write_feather(df.reset_index(drop=True), out_path)
+    return elapsed
+
+
+def engineer_features_parallel(
+    df: pd.DataFrame,
+    rolling_columns: Optional[Sequence[str]] = None,
+    sequestration: bool = True,
+    max_workers: Optional[int] = None,
+    partition_column: str = "city_id",
+    workdir: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Run the stages per city on a process pool, matching serial mode exactly.
+
+    Each city is written to an uncompressed Feather file that a worker reads
+    and replaces with its engineered partition, so workers receive file
+    paths rather than pickled frames. Every stage works row by row or per
+    ward, so partitions are independent; the results are reassembled in the
+    order serial mode produces (sorted like calculate_rolling_features when
+    rolling features are added, the input order otherwise) with the original
+    index.
+
+    Args:
+        df (pd.DataFrame): Observations with city_id, ward_id and daily_date.
+        rolling_columns (Optional[Sequence[str]]): Columns to add rolling
+            statistics for. Skipped when None.
+        sequestration (bool): Run calculate_sequestration_and_removal.
+        max_workers (Optional[int]): Pool size. Defaults to the CPU count.
+        partition_column (str): The column to partition by.
+        workdir (Optional[str]): Where to put partition files. Defaults to a
+            temporary directory that is removed afterwards.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, Any]]: The engineered data and a scaling
+            report: partitions, workers, wall seconds, the CPU seconds spent
+            engineering partitions, cpu_parallelism (CPU seconds over wall time,
+            the average number of busy workers; not a measured speedup) and
+            worker_utilization (cpu_parallelism per worker).
+    """
+    wall_start = time.perf_counter()
+    directory = tempfile.mkdtemp(prefix="partitions-", dir=workdir)
+
+    try:
+        tagged = df.assign(**{_ROW: range(len(df))}).rename_axis(_INDEX)
+        tagged = tagged.reset_index()
+
+        jobs: List[Tuple[str, str]] = []
+        for number, (_, part) in enumerate(
+            tagged.groupby(partition_column, sort=True, observed=True)
+        ):
+            in_path = os.path.join(directory, f"in-{number}.feather")
+            out_path = os.path.join(directory, f"out-{number}.feather")
+            feather.write_feather(
+                part.reset_index(drop=True), in_path, compression="uncompressed"
+            )
+            jobs.append((in_path, out_path))
+
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs) or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _engineer_partition,
+                    in_path,
+                    out_path,
+                    rolling_columns,
+                    sequestration,
+                )
+                for in_path, out_path in jobs
+            ]
+            cpu_seconds = sum(future.result() for future in futures)
+
+        result = pd.concat(
+            [feather.read_feather(out_path) for _, out_path in jobs], ignore_index=True
+        )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    # calculate_rolling_features sorts with a stable multi-column sort, so the
+    # original position breaks ties the same way serial mode does
+    if rolling_columns:
+        result = result.sort_values(ROLLING_SORT_KEYS + [_ROW], kind="stable")
+    else:
+        result = result.sort_values(_ROW, kind="stable")
+
+    result = result.set_index(_INDEX).drop(columns=_ROW)
+    result.index.name = df.index.name
+
+    wall_seconds = time.perf_counter() - wall_start
+    parallelism = cpu_seconds / wall_seconds if wall_seconds else 0.0
+    report = {
+        "partitions": len(jobs),
+        "workers": workers,
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "cpu_parallelism": parallelism,
+        "worker_utilization": parallelism / workers,
+    }
+    logger.info(
+        f"Engineered {len(result)} rows in {report['partitions']} partitions on "
+        f"{report['workers']} workers: {wall_seconds:.2f}s wall, "
+        f"{parallelism:.2f} CPU-seconds per second, "
+        f"{report['worker_utilization']:.0%} worker utilization"
+    )
+    return result, report
+
+
+def benchmark_feature_parallelism(
+    df: pd.DataFrame,
+    rolling_columns: Optional[Sequence[str]] = None,
+    sequestration: bool = True,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Engineer the same frame serially and on the process pool and compare.
+
+    Args:
+        df (pd.DataFrame): Observations with city_id, ward_id and daily_date.
+        rolling_columns (Optional[Sequence[str]]): Columns to add rolling
+            statistics for. Skipped when None.
+        sequestration (bool): Run calculate_sequestration_and_removal.
+        max_workers (Optional[int]): Pool size. Defaults to the CPU count.
+
+    Returns:
+        Dict[str, Any]: The wall time of each mode, the speedup (serial over
+            parallel wall time), the efficiency (speedup per worker) and
+            whether both modes returned the same frame.
+    """
+    started = time.perf_counter()
+    serial = engineer_features_serial(df, rolling_columns, sequestration)
+    serial_seconds = time.perf_counter() - started
+
+    parallel, scaling = engineer_features_parallel(
+        df, rolling_columns, sequestration, max_workers=max_workers
+    )
+    speedup = serial_seconds / scaling["wall_seconds"]
+    report = {
+        "partitions": scaling["partitions"],
+        "workers": scaling["workers"],
+        "serial_seconds": serial_seconds,
+        "parallel_seconds": scaling["wall_seconds"],
+        "speedup": speedup,
+        "efficiency": speedup / scaling["workers"],
+        "identical": parallel.equals(serial),
+    }
+    logger.info(
+        f"Parallel features: {speedup:.2f}x speedup on {report['workers']} "
+        f"workers, efficiency {report['efficiency']:.0%}"
+    )
+    return report
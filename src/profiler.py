@@ -0,0 +1,184 @@
+"""
+This module contains the PipelineProfiler class, which records wall time, CPU
+time, memory and row counts for each pipeline stage.
+"""
+import cProfile
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def _shape(value: Any) -> tuple:
+    """Return (rows, columns) of a DataFrame, or (None, None) otherwise."""
+    if isinstance(value, pd.DataFrame):
+        return len(value), len(value.columns)
+    return None, None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Return the process's peak resident set size so far, in MB."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT / 1e6
+
+
+class PipelineProfiler:
+    """
+    Collects one record per pipeline stage and writes them as JSON.
+
+    Each record holds wall time, CPU time of this process and of worker
+    processes reaped during the stage, the tracemalloc peak of the stage,
+    the process's peak RSS where the platform reports it, and the rows and columns going in and out.
+    """
+
+    def __init__(
+        self,
+        output_path: str = "models/pipeline_profile.json",
+        trace_memory: bool = False,
+        cprofile_stages: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Initializes the PipelineProfiler.
+
+        Args:
+            output_path (str): Where write() puts the profile.
+            trace_memory (bool): Track per-stage peak allocations with
+                tracemalloc. Off by default, as tracing slows
+                allocation-heavy code down.
+            cprofile_stages (Optional[Iterable[str]]): Stages to run under
+                cProfile; "all" profiles every stage. Stats are dumped next to
+                the profile as profile_<stage>.prof.
+        """
+        self.output_path = output_path
+        self.trace_memory = trace_memory
+        self.cprofile_stages = set(cprofile_stages or [])
+        self.records: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, inputs: Sequence[Any] = ()) -> Iterator[Dict[str, Any]]:
+        """
+        Profile the body of a with-block as one stage.
+
+        The block may set ``record["output"]`` to the stage output to record
+        its shape, and add any other fields, such as a cache status.
+
+        Args:
+            name (str): The stage name.
+            inputs (Sequence[Any]): The stage inputs; DataFrames are counted.
+
+        Yields:
+            Dict[str, Any]: The stage record.
+        """
+        shapes = [_shape(value) for value in inputs]
+        record: Dict[str, Any] = {
+            "stage": name,
+            "rows_in": sum(rows for rows, _ in shapes if rows is not None),
+            "columns_in": sum(cols for _, cols in shapes if cols is not None),
+        }
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        profile = None
+        if name in self.cprofile_stages or "all" in self.cprofile_stages:
+            profile = cProfile.Profile()
+
+        times_before = os.times()
+        wall_before = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+
+        try:
+            yield record
+        except BaseException:
+            record["status"] = "failed"
+            raise
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall = time.perf_counter() - wall_before
+            times_after = os.times()
+
+            record["wall_seconds"] = wall
+            record["cpu_seconds"] = (times_after.user - times_before.user) + (
+                times_after.system - times_before.system
+            )
+            record["child_cpu_seconds"] = (
+                times_after.children_user - times_before.children_user
+            ) + (times_after.children_system - times_before.children_system)
+
+            if self.trace_memory:
+                record["peak_traced_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+                if started_tracing:
+                    tracemalloc.stop()
+            record["peak_rss_mb"] = _peak_rss_mb()
+
+            rows_out, columns_out = _shape(record.pop("output", None))
+            record["rows_out"] = rows_out
+            record["columns_out"] = columns_out
+
+            if profile is not None:
+                directory = os.path.dirname(self.output_path)
+                path = os.path.join(directory, f"profile_{name}.prof")
+                os.makedirs(directory or ".", exist_ok=True)
+                profile.dump_stats(path)
+                record["cprofile"] = path
+
+            self.records.append(record)
+            logger.info(
+                f"Stage '{name}': {wall:.2f}s wall, "
+                f"{record['cpu_seconds']:.2f}s CPU, rows {record['rows_in']} -> "
+                f"{rows_out}"
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the profile of the run so far.
+
+        Returns:
+            Dict[str, Any]: Run totals and the per-stage records.
+        """
+        return {
+            "created_at": datetime.now().isoformat(),
+            "total_wall_seconds": time.perf_counter() - self._started,
+            "peak_rss_mb": _peak_rss_mb(),
+            "stages": self.records,
+        }
+
+    def write(self) -> str:
+        """
+        Write the profile as JSON.
+
+        Returns:
+            str: The path written.
+        """
+        directory = os.path.dirname(self.output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.output_path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        logger.info(f"Pipeline profile saved to {self.output_path}")
+        return self.output_path
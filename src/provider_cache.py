@@ -0,0 +1,320 @@
+"""
+This module contains a disk-backed TTL cache for external provider responses.
+"""
+import functools
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+from src.config import CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderCache:
+    """
+    Bounded SQLite-backed cache keyed by provider, subject (city or ward) and
+    time bucket, with per-provider TTLs and stale-while-revalidate.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        stale_seconds: Optional[Dict[str, float]] = None,
+        bucket_seconds: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Initializes the ProviderCache.
+
+        Args:
+            path (Optional[str]): The SQLite file backing the cache.
+            max_entries (Optional[int]): The maximum number of stored responses.
+            ttl_seconds (Optional[Dict[str, float]]): Freshness window per provider.
+            stale_seconds (Optional[Dict[str, float]]): How long past its TTL a
+                response may still be served while it is refreshed.
+            bucket_seconds (Optional[Dict[str, float]]): Time bucket width per provider.
+        """
+        self.path = path or CACHE_CONFIG["path"]
+        self.max_entries = max_entries or CACHE_CONFIG["max_entries"]
+        self.ttl_seconds = {**CACHE_CONFIG["ttl_seconds"], **(ttl_seconds or {})}
+        self.stale_seconds = {
+            **CACHE_CONFIG["stale_seconds"],
+            **(stale_seconds or {}),
+        }
+        self.bucket_seconds = {
+            **CACHE_CONFIG["bucket_seconds"],
+            **(bucket_seconds or {}),
+        }
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                bucket_end REAL NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                value BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="provider-cache"
+        )
+        self._refreshing: Set[str] = set()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _bucket(self, provider: str, as_of: Optional[datetime]) -> tuple:
+        """Return the (start, end) epoch seconds of the bucket containing as_of."""
+        width = self.bucket_seconds.get(provider, 3600)
+        timestamp = as_of.timestamp() if as_of is not None else time.time()
+        start = (timestamp // width) * width
+        return start, start + width
+
+    def _record(self, provider: str, event: str) -> None:
+        """Increment a statistics counter."""
+        with self._lock:
+            counters = self._stats.setdefault(
+                provider,
+                {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0},
+            )
+            counters[event] += 1
+
+    def get_or_fetch(
+        self,
+        provider: str,
+        subject: Optional[str],
+        fetch: Callable[[], Any],
+        as_of: Optional[datetime] = None,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return a cached response, fetching it from the provider when needed.
+
+        Args:
+            provider (str): The provider name, e.g. "weather".
+            subject (Optional[str]): The city or ward the response is for.
+            fetch (Callable[[], Any]): Calls the provider and returns a response.
+            as_of (Optional[datetime]): The time the response describes.
+                Defaults to now.
+            cacheable (Optional[Callable[[Any], bool]]): Whether a fetched
+                response may be stored. Responses it rejects, such as
+                fallbacks returned on provider errors, are returned but not
+                stored. Defaults to storing every response.
+
+        Returns:
+            Any: The provider response.
+        """
+        bucket_start, bucket_end = self._bucket(provider, as_of)
+        key = f"{provider}|{subject or '*'}|{int(bucket_start)}"
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+
+        if row is not None:
+            stored_at, blob = row
+            age = now - stored_at
+            # A response stored after its bucket closed describes a finished
+            # period and will not change, so it never goes stale.
+            if age <= self.ttl_seconds.get(provider, 0) or stored_at >= bucket_end:
+                self._record(provider, "hits")
+                return pickle.loads(blob)
+
+            stale_limit = self.ttl_seconds.get(provider, 0) + self.stale_seconds.get(
+                provider, 0
+            )
+            if age <= stale_limit:
+                self._record(provider, "stale_hits")
+                self._schedule_refresh(provider, key, bucket_end, fetch, cacheable)
+                return pickle.loads(blob)
+
+        self._record(provider, "misses")
+        value = fetch()
+        if cacheable is None or cacheable(value):
+            self._store(provider, key, bucket_end, value)
+        else:
+            self._record(provider, "errors")
+        return value
+
+    def _schedule_refresh(
+        self,
+        provider: str,
+        key: str,
+        bucket_end: float,
+        fetch: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> None:
+        """Refresh a stale entry in the background, once per key."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                value = fetch()
+                if cacheable is not None and not cacheable(value):
+                    raise ValueError("provider returned a fallback response")
+                self._store(provider, key, bucket_end, value)
+                self._record(provider, "refreshes")
+            except Exception as e:
+                self._record(provider, "errors")
+                logger.warning(f"Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(refresh)
+
+    def _store(self, provider: str, key: str, bucket_end: float, value: Any) -> None:
+        """Persist a response and evict least recently used entries over budget."""
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, bucket_end, now, now, blob),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY last_access LIMIT ?
+                    )
+                    """,
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit-rate statistics, overall and per provider.
+
+        Returns:
+            Dict[str, Any]: Counters and hit rates.
+        """
+        providers = {}
+        totals = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+        with self._lock:
+            snapshot = {name: dict(counters) for name, counters in self._stats.items()}
+            (entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+
+        for provider, counters in snapshot.items():
+            lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+            providers[provider] = {
+                **counters,
+                "hit_rate": (
+                    (counters["hits"] + counters["stale_hits"]) / lookups
+                    if lookups
+                    else 0.0
+                ),
+            }
+            for name, value in counters.items():
+                totals[name] += value
+
+        lookups = totals["hits"] + totals["stale_hits"] + totals["misses"]
+
+        return {
+            **totals,
+            "hit_rate": (totals["hits"] + totals["stale_hits"]) / lookups
+            if lookups
+            else 0.0,
+            "entries": entries,
+            "providers": providers,
+        }
+
+    def clear(self) -> None:
+        """Remove every stored response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Wait for pending refreshes and close the database."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ProviderCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def is_provider_response(value: Any) -> bool:
+    """Return whether a getter's value came from the provider, not a fallback."""
+    return not (isinstance(value, dict) and value.get("fallback"))
+
+
+def cached_provider(provider: str) -> Callable:
+    """
+    Route a DataAcquisition getter through the instance's ProviderCache, if any.
+
+    Responses are keyed by the ward when one is given, else by the city.
+    Fallback responses (marked ``"fallback": True``) are not stored, so a
+    provider error is retried on the next lookup.
+
+    Args:
+        provider (str): The provider name used for TTLs and cache keys.
+
+    Returns:
+        Callable: The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(
+            self,
+            city: Optional[str] = None,
+            as_of: Optional[datetime] = None,
+            ward: Optional[str] = None,
+        ):
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return func(self, city, as_of, ward)
+            return cache.get_or_fetch(
+                provider,
+                ward or city,
+                lambda: func(self, city, as_of, ward),
+                as_of,
+                cacheable=is_provider_response,
+            )
+
+        return wrapper
+
+    return decorator
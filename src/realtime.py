@@ -0,0 +1,439 @@
+"""
+This module contains the real-time acquisition service, which polls the data
+providers continuously and maintains live emission and net pollution state
+for every ward.
+"""
+import argparse
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.config import CITIES, FOREST_COVER_DATA, REALTIME_CONFIG, VEHICLE_DATA
+from src.data_acquisition import DataAcquisition
+from src.feature_engineering import FeatureEngineer
+
+logger = logging.getLogger(__name__)
+
+# Provider response fields mapped to ward-state columns
+PROVIDER_FIELDS: Dict[str, Dict[str, str]] = {
+    "traffic": {
+        "traffic_index": "traffic_index_0_100",
+        "avg_speed_kph": "avg_speed_kph",
+    },
+    "weather": {
+        "max_temp_c": "max_temp_c",
+        "humidity_pct": "humidity_pct",
+        "wind_speed_ms": "wind_speed_ms",
+    },
+    "ndvi": {"median_ndvi": "median_ndvi"},
+    "air_quality": {
+        "pm25_ug_m3": "pm25_ambient_ug_m3",
+        "nox_ug_m3": "nox_ambient_ug_m3",
+    },
+}
+
+OUTPUT_COLUMNS: List[str] = [
+    "CO2_emission_kg",
+    "PM25_emission_kg",
+    "NOX_emission_kg",
+    "co2_sequestered_kg",
+    "PM25_removed_kg",
+    "NOX_removed_kg",
+    "Net_CO2_kg",
+    "Net_PM25_kg",
+    "Net_NOX_kg",
+]
+
+
+class WardStateTable:
+    """
+    In-memory table holding the latest inputs and derived pollution values
+    for every ward, recomputed only for wards whose inputs changed.
+
+    State lives in dense float arrays indexed by ward position so applying a
+    reading is a single fancy-indexed assignment.
+    """
+
+    STATIC_COLUMNS: List[str] = [
+        "forest_area_sqkm",
+        "total_vehicles",
+        "car_prop",
+        "truck_prop",
+        "twowheeler_prop",
+    ]
+
+    def __init__(self, cities: List[str], wards_per_city: int) -> None:
+        """
+        Initializes the WardStateTable.
+
+        Args:
+            cities (List[str]): The cities to track.
+            wards_per_city (int): The number of wards per city.
+        """
+        self.engineer = FeatureEngineer()
+        self.ward_ids: List[str] = []
+        self.city_ids: List[str] = []
+        self.wards_by_city: Dict[str, np.ndarray] = {}
+
+        for city in cities:
+            start = len(self.ward_ids)
+            for ward in range(1, wards_per_city + 1):
+                self.ward_ids.append(f"{city}_W{ward}")
+                self.city_ids.append(city)
+            self.wards_by_city[city] = np.arange(start, len(self.ward_ids))
+        self.ward_index = {ward_id: i for i, ward_id in enumerate(self.ward_ids)}
+
+        provider_columns = [
+            column for fields in PROVIDER_FIELDS.values() for column in fields.values()
+        ]
+        self.input_columns = self.STATIC_COLUMNS + provider_columns
+        self.column_index = {column: i for i, column in enumerate(self.input_columns)}
+
+        self.inputs = np.full((len(self.ward_ids), len(self.input_columns)), np.nan)
+        for city, rows in self.wards_by_city.items():
+            self.inputs[rows, : len(self.STATIC_COLUMNS)] = [
+                FOREST_COVER_DATA[city]["area_sqkm"] / wards_per_city,
+                VEHICLE_DATA[city]["total_vehicles"] / wards_per_city,
+                VEHICLE_DATA[city]["car_prop"],
+                VEHICLE_DATA[city]["truck_prop"],
+                VEHICLE_DATA[city]["twowheeler_prop"],
+            ]
+        self.outputs = np.full((len(self.ward_ids), len(OUTPUT_COLUMNS)), np.nan)
+        self.updated_at = np.full(len(self.ward_ids), np.nan)
+
+        self._dirty = np.zeros(len(self.ward_ids), dtype=bool)
+        self._lock = threading.Lock()
+
+    def apply(self, reading: Dict[str, Any]) -> int:
+        """
+        Apply a provider reading to the wards it covers.
+
+        Args:
+            reading (Dict[str, Any]): A reading with "provider", "city",
+                optional "ward_id" and "values" keys.
+
+        Returns:
+            int: The number of wards updated.
+        """
+        if reading.get("ward_id"):
+            rows = np.array([self.ward_index[reading["ward_id"]]])
+        else:
+            rows = self.wards_by_city.get(reading["city"])
+            if rows is None:
+                return 0
+
+        values = reading["values"]
+        fields = [
+            (self.column_index[column], values[field])
+            for field, column in PROVIDER_FIELDS[reading["provider"]].items()
+            if field in values
+        ]
+        if not fields:
+            return 0
+        columns, row_values = zip(*fields)
+
+        with self._lock:
+            self.inputs[np.ix_(rows, columns)] = row_values
+            self._dirty[rows] = True
+        return len(rows)
+
+    def recompute(self) -> int:
+        """
+        Recompute emissions and net pollution for the wards changed since the
+        last call. Wards still missing a provider input are left pending.
+
+        Returns:
+            int: The number of wards recomputed.
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._dirty & ~np.isnan(self.inputs).any(axis=1))
+            if len(rows) == 0:
+                return 0
+            inputs = pd.DataFrame(self.inputs[rows], columns=self.input_columns)
+            self._dirty[rows] = False
+
+        df = self.engineer.calculate_vehicular_emissions(inputs)
+        df = self.engineer.calculate_sequestration_and_removal(df)
+        df = self.engineer.calculate_net_pollutants(df)
+
+        with self._lock:
+            self.outputs[rows] = df[OUTPUT_COLUMNS].to_numpy()
+            self.updated_at[rows] = time.time()
+        return len(rows)
+
+    def snapshot(self) -> pd.DataFrame:
+        """Return the current ward state as a DataFrame indexed by ward_id."""
+        with self._lock:
+            frame = pd.DataFrame(
+                np.hstack([self.inputs, self.outputs]),
+                columns=self.input_columns + OUTPUT_COLUMNS,
+                index=pd.Index(self.ward_ids, name="ward_id"),
+            )
+            updated_at = self.updated_at.copy()
+
+        frame.insert(0, "city_id", self.city_ids)
+        frame["updated_at"] = pd.to_datetime(updated_at, unit="s")
+        return frame
+
+
+class RealtimeAcquisitionService:
+    """
+    Long-running service that polls each provider on its own interval, pushes
+    readings through a bounded queue and keeps a WardStateTable current.
+    """
+
+    def __init__(
+        self,
+        acquisition: Optional[DataAcquisition] = None,
+        cities: Optional[List[str]] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Initializes the RealtimeAcquisitionService.
+
+        Args:
+            acquisition (Optional[DataAcquisition]): The provider client.
+            cities (Optional[List[str]]): The cities to poll. Defaults to CITIES.
+            config (Optional[Dict[str, Any]]): Overrides for REALTIME_CONFIG.
+        """
+        self.config = {**REALTIME_CONFIG, **(config or {})}
+        self.acquisition = acquisition or DataAcquisition()
+        self.cities = cities or CITIES
+        self.state = WardStateTable(self.cities, self.config["wards_per_city"])
+        self.queue: queue.Queue = queue.Queue(maxsize=self.config["queue_maxsize"])
+
+        self._getters: Dict[str, Callable[[str], Dict[str, Any]]] = {
+            "traffic": self.acquisition.get_traffic_data,
+            "weather": self.acquisition.get_weather_data,
+            "ndvi": self.acquisition.get_ndvi_data,
+            "air_quality": self.acquisition.get_air_quality_data,
+        }
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lags: deque = deque(maxlen=self.config["lag_window"])
+        self._counters = {
+            "readings_enqueued": 0,
+            "readings_dropped": 0,
+            "readings_applied": 0,
+            "ward_updates": 0,
+            "ward_recomputes": 0,
+            "batches": 0,
+        }
+        self._counters_lock = threading.Lock()
+        self._max_queue_depth = 0
+        self._started_at: Optional[float] = None
+
+    def submit(self, reading: Dict[str, Any]) -> bool:
+        """
+        Enqueue a reading, waiting up to the configured timeout for space.
+
+        Args:
+            reading (Dict[str, Any]): The reading to enqueue.
+
+        Returns:
+            bool: False if the queue stayed full and the reading was dropped.
+        """
+        reading.setdefault("observed_at", time.time())
+        try:
+            self.queue.put(reading, timeout=self.config["enqueue_timeout_seconds"])
+        except queue.Full:
+            self._count("readings_dropped")
+            logger.warning(f"Reading queue full, dropped {reading['provider']} reading")
+            return False
+        self._count("readings_enqueued")
+        self._max_queue_depth = max(self._max_queue_depth, self.queue.qsize())
+        return True
+
+    def _count(self, name: str, value: int = 1) -> None:
+        """Increment a metrics counter."""
+        with self._counters_lock:
+            self._counters[name] += value
+
+    def poll_provider(self, provider: str) -> None:
+        """
+        Poll one provider for every city and enqueue the readings.
+
+        Args:
+            provider (str): The provider name.
+        """
+        getter = self._getters[provider]
+        for city in self.cities:
+            if self._stop.is_set():
+                return
+            try:
+                values = getter(city)
+            except Exception as e:
+                logger.error(f"Polling {provider} for {city} failed: {e}")
+                continue
+
+            observed_at = values.get("timestamp")
+            self.submit(
+                {
+                    "provider": provider,
+                    "city": city,
+                    "values": values,
+                    "observed_at": (
+                        observed_at.timestamp()
+                        if isinstance(observed_at, datetime)
+                        else time.time()
+                    ),
+                }
+            )
+
+    def _poll_loop(self, provider: str) -> None:
+        """Poll a provider until stopped, once per configured interval."""
+        interval = self.config["poll_interval_seconds"][provider]
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll_provider(provider)
+            self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def process_batch(self, timeout: float = 0.5) -> int:
+        """
+        Drain up to batch_size readings, apply them and recompute the affected
+        wards once.
+
+        Args:
+            timeout (float): Seconds to wait for the first reading.
+
+        Returns:
+            int: The number of readings applied.
+        """
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except queue.Empty:
+            return 0
+
+        while len(batch) < self.config["batch_size"]:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+
+        ward_updates = sum(self.state.apply(reading) for reading in batch)
+        recomputed = self.state.recompute()
+
+        now = time.time()
+        self._lags.extend(now - reading["observed_at"] for reading in batch)
+        self._count("readings_applied", len(batch))
+        self._count("ward_updates", ward_updates)
+        self._count("ward_recomputes", recomputed)
+        self._count("batches")
+        return len(batch)
+
+    def _consume_loop(self) -> None:
+        """Apply readings until stopped and the queue is drained."""
+        while not (self._stop.is_set() and self.queue.empty()):
+            self.process_batch()
+
+    def start(self) -> None:
+        """Prime the ward state with one poll of every provider and start the loops."""
+        logger.info(f"Starting real-time acquisition for {len(self.cities)} cities")
+        self._started_at = time.time()
+        self._stop.clear()
+
+        for provider in self._getters:
+            self.poll_provider(provider)
+        while not self.queue.empty():
+            self.process_batch(timeout=0)
+
+        self._threads = [
+            threading.Thread(
+                target=self._poll_loop,
+                args=(provider,),
+                name=f"poll-{provider}",
+                daemon=True,
+            )
+            for provider in self._getters
+        ]
+        self._threads.append(
+            threading.Thread(target=self._consume_loop, name="ward-state", daemon=True)
+        )
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop polling, drain the queue and wait for the worker threads.
+
+        Args:
+            timeout (float): Seconds to wait for each thread.
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        logger.info("Real-time acquisition stopped")
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Return throughput, lag and queue-depth metrics.
+
+        Returns:
+            Dict[str, Any]: The service metrics.
+        """
+        lags = np.array(self._lags) if self._lags else np.array([0.0])
+        elapsed = time.time() - self._started_at if self._started_at else 0.0
+        with self._counters_lock:
+            counters = dict(self._counters)
+
+        return {
+            **counters,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self._max_queue_depth,
+            "lag_p50_seconds": float(np.percentile(lags, 50)),
+            "lag_p95_seconds": float(np.percentile(lags, 95)),
+            "lag_max_seconds": float(lags.max()),
+            "ward_updates_per_second": (
+                counters["ward_updates"] / elapsed if elapsed else 0.0
+            ),
+            "uptime_seconds": elapsed,
+        }
+
+
+def main(duration: Optional[float], report_every: float = 30.0) -> None:
+    """Run the service and log metrics periodically."""
+    service = RealtimeAcquisitionService()
+    service.start()
+    deadline = time.time() + duration if duration else None
+
+    try:
+        while deadline is None or time.time() < deadline:
+            wait = report_every
+            if deadline is not None:
+                wait = max(0.0, min(report_every, deadline - time.time()))
+            time.sleep(wait)
+            metrics = service.metrics()
+            logger.info(
+                f"Ward updates/s: {metrics['ward_updates_per_second']:.1f}, "
+                f"lag p95: {metrics['lag_p95_seconds']:.3f}s, "
+                f"queue depth: {metrics['queue_depth']}"
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Run real-time acquisition")
+    parser.add_argument(
+        "--duration", type=float, default=None, help="Seconds to run (default: forever)"
+    )
+    parser.add_argument(
+        "--report-every", type=float, default=30.0, help="Seconds between metric logs"
+    )
+    args = parser.parse_args()
+
+    main(args.duration, args.report_every)
@@ -13,8 +13,37 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def generate_report(output_dir, data_path="data/processed/processed_data.csv"):
-    """Generate a daily report from processed data."""
+REPORT_COLUMNS = ["Net_CO2_kg", "Net_PM25_kg"]
+
+
+def load_report_data(lake_path, dataset="features", start_date=None, end_date=None):
+    """Load only the report columns from the Parquet lake, pruned by date."""
+    from src.data_lake import ParquetDataLake
+
+    lake = ParquetDataLake(lake_path)
+    if not lake.exists(dataset):
+        return None
+
+    available = lake.columns(dataset)
+    columns = [col for col in REPORT_COLUMNS if col in available]
+    return lake.read(dataset, columns=columns, start_date=start_date, end_date=end_date)
+
+
+def generate_report(
+    output_dir,
+    data_path="data/processed/processed_data.csv",
+    lake_path=None,
+    start_date=None,
+    end_date=None,
+    use_cache=False,
+):
+    """Generate a daily report from processed data.
+
+    When ``lake_path`` points at a Parquet lake with a ``features`` dataset,
+    only the report columns of the requested date range are read instead of
+    the full processed CSV. With ``use_cache`` the CSV is read through the
+    DataLoader's parsed-file cache.
+    """
     logger.info(f"Generating report in {output_dir}...")
 
     # Ensure output directory exists
@@ -27,9 +56,18 @@ def generate_report(output_dir, data_path="data/processed/processed_data.csv"):
     }
 
     try:
-        if os.path.exists(data_path):
-            df = pd.read_csv(data_path)
-
+        df = None
+        if lake_path is not None:
+            df = load_report_data(lake_path, start_date=start_date, end_date=end_date)
+        if df is None and os.path.exists(data_path):
+            if use_cache:
+                from src.data_loader import DataLoader
+
+                df = DataLoader(use_cache=True).load_file(data_path)
+            else:
+                df = pd.read_csv(data_path)
+
+        if df is not None:
             # Calculate some basic metrics
             if "Net_CO2_kg" in df.columns:
                 report_data["metrics"]["total_net_co2_kg"] = float(
@@ -72,6 +110,20 @@ if __name__ == "__main__":
     parser.add_argument(
         "--output", type=str, required=True, help="Output directory for reports"
     )
+    parser.add_argument(
+        "--lake", type=str, default=None, help="Parquet lake to read instead of CSV"
+    )
+    parser.add_argument("--start-date", type=str, default=None)
+    parser.add_argument("--end-date", type=str, default=None)
+    parser.add_argument(
+        "--cache", action="store_true", help="Reuse parsed CSVs from the file cache"
+    )
     args = parser.parse_args()
 
-    generate_report(args.output)
+    generate_report(
+        args.output,
+        lake_path=args.lake,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        use_cache=args.cache,
+    )
@@ -0,0 +1,490 @@
+"""
+This module contains the compaction of a trained model into serving variants:
+boosters pruned to the fewest trees within an accuracy tolerance, or distilled
+into one ensemble shared by the targets, with a report of each variant's
+accuracy against its per-row latency.
+"""
+import copy
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.config import SERVING_CONFIG
+from src.model_trainer import TARGET_COLUMNS, BoosterRegressor, ModelTrainer
+from src.utils import calculate_metrics, load_model, save_model
+
+logger = logging.getLogger(__name__)
+
+REPORT_FILE = "report.json"
+
+# The variants build_serving_variants can write, and the names a client may
+# ask for; "auto" is the one the report selected
+VARIANT_NAMES = ("full", "pruned", "distilled")
+SERVING_VARIANTS = VARIANT_NAMES + ("auto",)
+
+
+class SharedEnsembleRegressor:
+    """
+    One LightGBM ensemble predicting every target.
+
+    Each input row is scored once per target with the target's index as an
+    extra feature, and the standardized outputs are scaled back per target.
+    """
+
+    def __init__(
+        self, booster: lgb.Booster, means: np.ndarray, scales: np.ndarray
+    ) -> None:
+        """
+        Initializes the SharedEnsembleRegressor.
+
+        Args:
+            booster (lgb.Booster): The trained ensemble.
+            means (np.ndarray): The mean of every target.
+            scales (np.ndarray): The standard deviation of every target.
+        """
+        self.booster_ = booster
+        self.means = means
+        self.scales = scales
+
+    @staticmethod
+    def stack(matrix: np.ndarray, n_targets: int) -> np.ndarray:
+        """Repeat the rows once per target, with the target index appended."""
+        index = np.repeat(np.arange(n_targets, dtype=np.float64), len(matrix))
+        return np.column_stack([np.tile(matrix, (n_targets, 1)), index])
+
+    def predict(self, matrix: np.ndarray) -> np.ndarray:
+        """Predict every target, one column per target."""
+        n_targets = len(self.means)
+        scores = self.booster_.predict(self.stack(matrix, n_targets))
+        return scores.reshape(n_targets, len(matrix)).T * self.scales + self.means
+
+
+def with_model(trainer: ModelTrainer, model: Any, variant: str) -> ModelTrainer:
+    """
+    Return a copy of a trainer serving another model.
+
+    The copy shares the preprocessing of the original, so every variant
+    takes the same input features.
+
+    Args:
+        trainer (ModelTrainer): The trained trainer.
+        model (Any): The variant's model.
+        variant (str): The variant name, recorded in the training report.
+
+    Returns:
+        ModelTrainer: The variant.
+    """
+    served = copy.copy(trainer)
+    served.model = model
+    served.model_version = None
+    served.training_report = {**trainer.training_report, "variant": variant}
+    return served
+
+
+def truncated(booster: lgb.Booster, iterations: int) -> BoosterRegressor:
+    """
+    Return a booster holding only its first iterations.
+
+    Args:
+        booster (lgb.Booster): The trained booster.
+        iterations (int): The iterations to keep; 0 keeps all.
+
+    Returns:
+        BoosterRegressor: The truncated booster, whose best iteration is its
+            last.
+    """
+    pruned = lgb.Booster(model_str=booster.model_to_string(num_iteration=iterations))
+    pruned.best_iteration = pruned.current_iteration()
+    return BoosterRegressor(pruned)
+
+
+def prune_to_tolerance(
+    trainer: ModelTrainer,
+    matrix: np.ndarray,
+    y_valid: np.ndarray,
+    tolerance: float,
+    step: int,
+) -> Tuple[ModelTrainer, Dict[str, int]]:
+    """
+    Keep the fewest trees per target within a tolerance of the best RMSE.
+
+    The validation RMSE of every target is computed every ``step``
+    iterations up to its best iteration; each target keeps the first
+    checkpoint within ``tolerance`` (a share) of the RMSE at its best
+    iteration. Trees after the best iteration are always dropped, so a
+    tolerance of 0 keeps exactly the best iteration. (Boosters trained by
+    lgb.train are already saved at their best iteration.)
+
+    Args:
+        trainer (ModelTrainer): The trained trainer.
+        matrix (np.ndarray): The prepared validation features.
+        y_valid (np.ndarray): The validation targets, one column per target.
+        tolerance (float): The accepted relative RMSE increase.
+        step (int): Iterations between checkpoints.
+
+    Returns:
+        Tuple[ModelTrainer, Dict[str, int]]: The pruned variant and the
+            iterations kept per target.
+    """
+    estimators, kept = [], {}
+    for index, estimator in enumerate(trainer.model.estimators_):
+        booster = estimator.booster_
+        best = estimator.best_iteration_ or booster.current_iteration()
+
+        def rmse(iterations: int) -> float:
+            predictions = booster.predict(matrix, num_iteration=iterations)
+            return float(np.sqrt(np.mean((y_valid[:, index] - predictions) ** 2)))
+
+        limit = rmse(best) * (1 + tolerance)
+        iterations = next(
+            (n for n in range(step, best, step) if rmse(n) <= limit), best
+        )
+        estimators.append(truncated(booster, iterations))
+        kept[TARGET_COLUMNS[index]] = iterations
+
+    model = copy.copy(trainer.model)
+    model.estimators_ = estimators
+    return with_model(trainer, model, "pruned"), kept
+
+
+def distill(
+    trainer: ModelTrainer,
+    x_train: np.ndarray,
+    x_valid: np.ndarray,
+    y_valid: np.ndarray,
+    config: Dict[str, Any],
+) -> ModelTrainer:
+    """
+    Distill the per-target boosters into one shared ensemble.
+
+    The student learns the teacher's predictions on the training rows, with
+    every target standardized so that one ensemble fits them all, and stops
+    early on the true validation targets. Every tree is forced to split on
+    the target index first; otherwise leaf-wise growth spends most leaves on
+    whichever target has the largest standardized error.
+
+    Args:
+        trainer (ModelTrainer): The trained trainer (the teacher).
+        x_train (np.ndarray): The prepared training features.
+        x_valid (np.ndarray): The prepared validation features.
+        y_valid (np.ndarray): The validation targets, one column per target.
+        config (Dict[str, Any]): The ``distill`` settings of SERVING_CONFIG.
+
+    Returns:
+        ModelTrainer: The distilled variant.
+    """
+    teacher = trainer.predict_matrix(x_train)
+    means, scales = teacher.mean(axis=0), teacher.std(axis=0)
+    scales[scales == 0] = 1.0
+    n_targets = teacher.shape[1]
+
+    target_index = len(trainer.feature_names)
+    forced: Optional[Dict[str, Any]] = None
+    for threshold in reversed(range(n_targets - 1)):
+        forced = {
+            "feature": target_index,
+            "threshold": threshold + 0.5,
+            "right": forced,
+        }
+
+    categorical = [trainer.feature_names.index(col) for col in trainer.categories]
+    train_set = lgb.Dataset(
+        SharedEnsembleRegressor.stack(x_train, n_targets),
+        ((teacher - means) / scales).T.ravel(),
+        categorical_feature=categorical or "auto",
+    )
+    valid_set = train_set.create_valid(
+        SharedEnsembleRegressor.stack(x_valid, n_targets),
+        ((y_valid - means) / scales).T.ravel(),
+    )
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(forced, f)
+    try:
+        booster = lgb.train(
+            {
+                **trainer.lgb_params(),
+                "num_leaves": config["num_leaves"],
+                "learning_rate": config["learning_rate"],
+                # A forced split needs its feature in every tree
+                "feature_fraction": 1.0,
+                "forcedsplits_filename": f.name,
+                "num_threads": trainer.config.get("n_jobs") or os.cpu_count() or 1,
+            },
+            train_set,
+            num_boost_round=config["n_estimators"],
+            valid_sets=[valid_set],
+            callbacks=[
+                lgb.early_stopping(config["early_stopping_rounds"], verbose=False)
+            ],
+        )
+    finally:
+        os.remove(f.name)
+
+    booster = truncated(booster, booster.best_iteration).booster_
+    return with_model(
+        trainer, SharedEnsembleRegressor(booster, means, scales), "distilled"
+    )
+
+
+def count_trees(trainer: ModelTrainer) -> int:
+    """Return the number of trees a prediction evaluates."""
+    if hasattr(trainer.model, "estimators_"):
+        return sum(
+            estimator.best_iteration_ or estimator.booster_.current_iteration()
+            for estimator in trainer.model.estimators_
+        )
+    return trainer.model.booster_.current_iteration() * len(trainer.model.means)
+
+
+def measure_latency(
+    trainer: ModelTrainer, x_features: pd.DataFrame, rows: int, repeats: int = 5
+) -> Dict[str, float]:
+    """
+    Time the predictions of a variant.
+
+    Args:
+        trainer (ModelTrainer): The variant.
+        x_features (pd.DataFrame): Rows to predict.
+        rows (int): How many of the rows to time.
+        repeats (int): Batch timings kept at their fastest of this many.
+
+    Returns:
+        Dict[str, float]: The median and 95th percentile milliseconds of a
+            single-row predict(), and the microseconds per row of a batch
+            predict() and of the model alone on prepared features.
+    """
+    sample = x_features.iloc[:rows]
+    trainer.predict(sample.iloc[:1])  # Warm-up
+
+    single = []
+    for index in range(len(sample)):
+        started = time.perf_counter()
+        trainer.predict(sample.iloc[index : index + 1])
+        single.append((time.perf_counter() - started) * 1000)
+
+    def fastest(predict: Any, inputs: Any) -> float:
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            predict(inputs)
+            timings.append(time.perf_counter() - started)
+        return min(timings) / len(sample) * 1e6
+
+    return {
+        "single_row_p50_ms": float(np.median(single)),
+        "single_row_p95_ms": float(np.percentile(single, 95)),
+        "batch_us_per_row": fastest(trainer.predict, sample),
+        "model_us_per_row": fastest(
+            trainer.predict_matrix, trainer.model_input(sample)
+        ),
+    }
+
+
+def evaluate_variant(
+    trainer: ModelTrainer,
+    matrix: np.ndarray,
+    y_valid: np.ndarray,
+    x_latency: pd.DataFrame,
+    rows: int,
+) -> Dict[str, Any]:
+    """
+    Report the accuracy, size and latency of a variant.
+
+    Args:
+        trainer (ModelTrainer): The variant.
+        matrix (np.ndarray): The prepared validation features.
+        y_valid (np.ndarray): The validation targets, one column per target.
+        x_latency (pd.DataFrame): Raw rows to time predictions on.
+        rows (int): How many of the rows to time.
+
+    Returns:
+        Dict[str, Any]: The variant's report entry.
+    """
+    predictions = trainer.predict_matrix(matrix)
+    return {
+        "trees": count_trees(trainer),
+        "overall_rmse": float(np.sqrt(np.mean((y_valid - predictions) ** 2))),
+        "target_metrics": {
+            target: {
+                name: float(value)
+                for name, value in calculate_metrics(
+                    y_valid[:, index], predictions[:, index]
+                ).items()
+            }
+            for index, target in enumerate(TARGET_COLUMNS)
+        },
+        "latency": measure_latency(trainer, x_latency, rows),
+    }
+
+
+def select_variant(report: Dict[str, Any], budget_us: Optional[float]) -> str:
+    """
+    Pick the most accurate variant within a per-row latency budget.
+
+    The budget applies to batch predictions, where the trees dominate;
+    a single-row predict() is dominated by preprocessing, which every
+    variant shares.
+
+    Args:
+        report (Dict[str, Any]): A report from build_serving_variants.
+        budget_us (Optional[float]): The microseconds per row of a batch
+            predict(). Without one, the most accurate variant is picked.
+
+    Returns:
+        str: The variant name; the fastest variant when none fits the budget.
+    """
+    variants = report["variants"]
+
+    def cost(name: str) -> float:
+        return variants[name]["latency"]["batch_us_per_row"]
+
+    fitting = [
+        name for name in variants if budget_us is None or cost(name) <= budget_us
+    ]
+    if not fitting:
+        return min(variants, key=cost)
+    return min(fitting, key=lambda name: variants[name]["overall_rmse"])
+
+
+def build_serving_variants(
+    trainer: ModelTrainer,
+    x_features: pd.DataFrame,
+    y_features: pd.DataFrame,
+    serving_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Compact a trained model into serving variants and report their trade-off.
+
+    The features are split as the trainer split them, so the variants are
+    scored on the rows the full model early-stopped on (the pruned variant
+    is chosen on them too). Each variant is saved as a trainer under
+    ``path`` and serves like the full model.
+
+    Args:
+        trainer (ModelTrainer): The trained trainer.
+        x_features (pd.DataFrame): The input features it was trained on.
+        y_features (pd.DataFrame): The target features.
+        serving_config (Optional[Dict[str, Any]]): Overrides of
+            SERVING_CONFIG.
+
+    Returns:
+        Dict[str, Any]: Per variant, its trees, accuracy and latency, plus
+            the variant selected for the latency budget. The report is also
+            written to ``path``.
+    """
+    serving = {**SERVING_CONFIG, **(serving_config or {})}
+    started = time.perf_counter()
+    x_train, x_valid, _, y_valid = train_test_split(
+        x_features,
+        y_features,
+        test_size=trainer.config["test_size"],
+        random_state=trainer.config["random_state"],
+    )
+    train_matrix = trainer.model_input(x_train)
+    valid_matrix = trainer.model_input(x_valid)
+    y_valid = y_valid.to_numpy(dtype=np.float64)
+
+    variants = {"full": trainer}
+    variants["pruned"], kept = prune_to_tolerance(
+        trainer,
+        valid_matrix,
+        y_valid,
+        serving["rmse_tolerance"],
+        serving["tree_step"],
+    )
+    if serving["distill"]["enabled"]:
+        variants["distilled"] = distill(
+            trainer, train_matrix, valid_matrix, y_valid, serving["distill"]
+        )
+
+    path = serving["path"]
+    os.makedirs(path, exist_ok=True)
+    entries = {}
+    for name, variant in variants.items():
+        entries[name] = evaluate_variant(
+            variant, valid_matrix, y_valid, x_valid, serving["latency_rows"]
+        )
+        save_model(variant, os.path.join(path, f"{name}.pkl"))
+        entries[name]["bytes"] = os.path.getsize(os.path.join(path, f"{name}.pkl"))
+        logger.info(
+            f"Variant {name}: {entries[name]['trees']} trees, RMSE "
+            f"{entries[name]['overall_rmse']:.4g}, single row "
+            f"{entries[name]['latency']['single_row_p50_ms']:.2f} ms, batch "
+            f"{entries[name]['latency']['batch_us_per_row']:.1f} us/row"
+        )
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "rows": {"train": len(x_train), "valid": len(x_valid)},
+        "rmse_tolerance": serving["rmse_tolerance"],
+        "pruned_iterations": kept,
+        "variants": entries,
+        "latency_budget_us": serving["latency_budget_us"],
+        "wall_seconds": time.perf_counter() - started,
+    }
+    report["selected"] = select_variant(report, serving["latency_budget_us"])
+    with open(os.path.join(path, REPORT_FILE), "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def variants_match(report: Dict[str, Any], path: Optional[str] = None) -> bool:
+    """
+    Return whether a directory holds the variants of a serving report.
+
+    Args:
+        report (Dict[str, Any]): A report returned by build_serving_variants.
+        path (Optional[str]): The variants' directory.
+
+    Returns:
+        bool: True if the report on disk equals ``report`` and every variant
+            file it lists exists.
+    """
+    path = path or SERVING_CONFIG["path"]
+    try:
+        with open(os.path.join(path, REPORT_FILE), "r") as f:
+            written = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return written == json.loads(json.dumps(report)) and all(
+        os.path.exists(os.path.join(path, f"{name}.pkl")) for name in report["variants"]
+    )
+
+
+def load_variant(name: str, path: Optional[str] = None) -> ModelTrainer:
+    """
+    Load a serving variant.
+
+    Names become file paths, so only the known variants are loaded: an
+    unknown name, or an unknown name selected by the report, raises
+    ValueError.
+
+    Args:
+        name (str): The variant, or "auto" for the one the report selected.
+        path (Optional[str]): The variants' directory.
+
+    Returns:
+        ModelTrainer: The variant.
+    """
+    if name not in SERVING_VARIANTS:
+        raise ValueError(f"Unknown serving variant '{name}'")
+    path = path or SERVING_CONFIG["path"]
+    if name == "auto":
+        with open(os.path.join(path, REPORT_FILE), "r") as f:
+            name = json.load(f)["selected"]
+        if name not in VARIANT_NAMES:
+            raise ValueError(f"The serving report selects an unknown variant '{name}'")
+    variant_path = os.path.join(path, f"{name}.pkl")
+    if not os.path.exists(variant_path):
+        raise FileNotFoundError(f"No serving variant '{name}' in {path}")
+    return load_model(variant_path)
@@ -0,0 +1,261 @@
+"""
+This module contains the StagePipeline class, which caches the output of each
+named pipeline stage under a content-addressed fingerprint.
+"""
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import uuid
+from contextlib import nullcontext
+from datetime import datetime
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+import joblib
+import pandas as pd
+
+from src.profiler import PipelineProfiler
+from src.utils import fingerprint_frame
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_STAGES = [
+    "acquire",
+    "engineer",
+    "prepare",
+    "tune",
+    "cv",
+    "train",
+    "city_models",
+    "variants",
+    "report",
+]
+DEFAULT_STAGE_PATH = "data/stages/"
+
+
+def fingerprint_output(output: Any) -> str:
+    """
+    Hash a stage output by content.
+
+    Args:
+        output (Any): A DataFrame or any picklable object.
+
+    Returns:
+        str: A hex digest.
+    """
+    if isinstance(output, pd.DataFrame):
+        return fingerprint_frame(output)
+    return joblib.hash(output)
+
+
+def fingerprint_code(modules: Iterable[Any]) -> str:
+    """
+    Hash the source of the modules or functions that implement a stage.
+
+    Functions contribute only their own source, so editing one stage function
+    in a module does not invalidate the stages defined next to it.
+
+    Args:
+        modules (Iterable[Any]): Modules or functions.
+
+    Returns:
+        str: A hex digest.
+    """
+    digest = hashlib.sha256()
+    for module in modules:
+        if isinstance(module, ModuleType):
+            with open(inspect.getsourcefile(module), "rb") as f:
+                digest.update(f.read())
+        else:
+            digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()
+
+
+class StagePipeline:
+    """
+    Runs named stages and skips those whose fingerprint has a stored artifact.
+
+    A stage's fingerprint hashes its name, its parameters (including any
+    config it reads), the source of the code that implements it and the
+    content hash of each upstream output. A stage whose code changed but
+    whose output did not therefore leaves downstream stages cached.
+
+    Artifacts live in ``<root>/<stage>/<fingerprint>/``: DataFrames as
+    Parquet, anything else with joblib, next to a manifest.json.
+    """
+
+    def __init__(
+        self,
+        root: str = DEFAULT_STAGE_PATH,
+        force: Optional[Iterable[str]] = None,
+        profiler: Optional[PipelineProfiler] = None,
+    ) -> None:
+        """
+        Initializes the StagePipeline.
+
+        Args:
+            root (str): The artifact directory.
+            force (Optional[Iterable[str]]): Stages to recompute regardless of
+                the cache; "all" forces every stage.
+            profiler (Optional[PipelineProfiler]): Records every stage run,
+                including cache loads.
+        """
+        self.root = root
+        self.force = set(force or [])
+        self.profiler = profiler
+        self.outputs: Dict[str, Any] = {}
+        self.output_hashes: Dict[str, str] = {}
+        self.status: Dict[str, str] = {}
+
+    def fingerprint(
+        self,
+        name: str,
+        inputs: Sequence[str],
+        params: Dict[str, Any],
+        code: Iterable[Any],
+    ) -> str:
+        """
+        Compute the fingerprint of a stage.
+
+        Args:
+            name (str): The stage name.
+            inputs (Sequence[str]): Upstream stage names.
+            params (Dict[str, Any]): JSON-serializable parameters.
+            code (Iterable[Any]): Modules or functions implementing the stage.
+
+        Returns:
+            str: A hex digest.
+        """
+        payload = json.dumps(
+            {
+                "stage": name,
+                "params": params,
+                "code": fingerprint_code(code),
+                "inputs": {stage: self.output_hashes[stage] for stage in inputs},
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _artifact_dir(self, name: str, fingerprint: str) -> str:
+        """Return the directory of a stage artifact."""
+        return os.path.join(self.root, name, fingerprint)
+
+    def run(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        inputs: Sequence[str] = (),
+        params: Optional[Dict[str, Any]] = None,
+        code: Iterable[Any] = (),
+        options: Optional[Dict[str, Any]] = None,
+        valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Run a stage, or load its cached output when the fingerprint matches.
+
+        Args:
+            name (str): The stage name.
+            func (Callable[..., Any]): Called with the upstream outputs in the
+                order of ``inputs``, followed by ``params`` and ``options`` as
+                keywords.
+            inputs (Sequence[str]): Upstream stage names, already run.
+            params (Optional[Dict[str, Any]]): JSON-serializable parameters.
+            code (Iterable[Any]): Modules or functions implementing the stage;
+                ``func`` is always included.
+            options (Optional[Dict[str, Any]]): Keywords that do not change the
+                output, such as worker counts; left out of the fingerprint.
+            valid (Optional[Callable[[Any], bool]]): Called with a cached
+                output before it is used; the stage reruns when it returns
+                False, e.g. because files the stage wrote are gone.
+
+        Returns:
+            Any: The stage output.
+        """
+        params = params or {}
+        fingerprint = self.fingerprint(name, inputs, params, [func, *code])
+        directory = self._artifact_dir(name, fingerprint)
+        forced = name in self.force or "all" in self.force
+
+        upstream = [self.outputs[stage] for stage in inputs]
+        profiled = (
+            self.profiler.stage(name, upstream)
+            if self.profiler is not None
+            else nullcontext({})
+        )
+
+        with profiled as record:
+            loaded = False
+            if not forced and os.path.exists(os.path.join(directory, "manifest.json")):
+                try:
+                    output, output_hash = self._load(directory)
+                    loaded = True
+                except Exception as e:
+                    logger.warning(f"Discarding unreadable artifact of '{name}': {e}")
+                if loaded and valid is not None and not valid(output):
+                    loaded = False
+                    logger.info(f"Rerunning stage '{name}': its outputs are stale")
+                if loaded:
+                    self.status[name] = "cached"
+                    logger.info(f"Stage '{name}' is up to date ({fingerprint[:12]})")
+
+            if not loaded:
+                logger.info(f"Running stage '{name}' ({fingerprint[:12]})")
+                output = func(*upstream, **params, **(options or {}))
+                output_hash = self._store(directory, name, fingerprint, output)
+                self.status[name] = "forced" if forced else "computed"
+
+            record["status"] = self.status[name]
+            record["output"] = output
+
+        self.outputs[name] = output
+        self.output_hashes[name] = output_hash
+        return output
+
+    def _store(self, directory: str, name: str, fingerprint: str, output: Any) -> str:
+        """Write an artifact atomically and return the output hash."""
+        output_hash = fingerprint_output(output)
+        parent = os.path.dirname(directory)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = os.path.join(parent, f".{uuid.uuid4().hex}.tmp")
+        os.makedirs(tmp_dir)
+
+        if isinstance(output, pd.DataFrame):
+            filename = "output.parquet"
+            output.to_parquet(os.path.join(tmp_dir, filename))
+        else:
+            filename = "output.joblib"
+            joblib.dump(output, os.path.join(tmp_dir, filename))
+
+        with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(
+                {
+                    "stage": name,
+                    "fingerprint": fingerprint,
+                    "output": filename,
+                    "output_hash": output_hash,
+                    "created_at": datetime.now().isoformat(),
+                },
+                f,
+                indent=2,
+            )
+
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.replace(tmp_dir, directory)
+        return output_hash
+
+    def _load(self, directory: str) -> tuple:
+        """Load an artifact and its recorded output hash."""
+        with open(os.path.join(directory, "manifest.json"), "r") as f:
+            manifest = json.load(f)
+        path = os.path.join(directory, manifest["output"])
+        if manifest["output"].endswith(".parquet"):
+            output = pd.read_parquet(path)
+        else:
+            output = joblib.load(path)
+        return output, manifest["output_hash"]
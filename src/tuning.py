@@ -0,0 +1,397 @@
+"""
+This module contains the hyperparameter search, which runs LightGBM trials on a
+process pool over one prebuilt binned Dataset and prunes trials that trail the
+leaders.
+"""
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.config import TUNING_CONFIG
+from src.dataset_cache import LGBMDatasetCache
+from src.model_trainer import ModelTrainer
+from src.utils import fingerprint_frame
+
+logger = logging.getLogger(__name__)
+
+
+class TrialPruned(Exception):
+    """Raised inside a trial to stop it early."""
+
+
+def sample_params(
+    search_space: Dict[str, List[Any]], rng: np.random.Generator
+) -> Dict[str, Any]:
+    """
+    Draw one parameter set from the search space.
+
+    Args:
+        search_space (Dict[str, List[Any]]): Per parameter, a ["float", low,
+            high], ["log", low, high] or ["int", low, high] specification.
+        rng (np.random.Generator): The random generator.
+
+    Returns:
+        Dict[str, Any]: The sampled parameters.
+    """
+    params = {}
+    for name, (kind, low, high) in search_space.items():
+        if kind == "int":
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == "log":
+            params[name] = float(math.exp(rng.uniform(math.log(low), math.log(high))))
+        elif kind == "float":
+            params[name] = float(rng.uniform(low, high))
+        else:
+            raise ValueError(f"Unknown search space kind for {name}: {kind}")
+    return params
+
+
+def pruning_thresholds(
+    trials: List[Dict[str, Any]], percentile: float, min_trials: int
+) -> Dict[str, Dict[int, float]]:
+    """
+    Compute the validation RMSE a trial must beat at each checkpoint.
+
+    Args:
+        trials (List[Dict[str, Any]]): Finished trials with their curves.
+        percentile (float): The percentile of the leaders' RMSE to beat.
+        min_trials (int): Checkpoints reached by fewer trials never prune.
+
+    Returns:
+        Dict[str, Dict[int, float]]: Per target, the threshold per iteration.
+    """
+    values: Dict[str, Dict[int, List[float]]] = {}
+    for trial in trials:
+        for target, curve in trial["curves"].items():
+            for iteration, rmse in curve.items():
+                values.setdefault(target, {}).setdefault(int(iteration), []).append(
+                    rmse
+                )
+
+    return {
+        target: {
+            iteration: float(np.percentile(rmses, percentile))
+            for iteration, rmses in checkpoints.items()
+            if len(rmses) >= min_trials
+        }
+        for target, checkpoints in values.items()
+    }
+
+
+def pruning_callback(
+    thresholds: Dict[int, float],
+    curve: Dict[int, float],
+    interval: int,
+    deadline: float,
+) -> Any:
+    """
+    Return a LightGBM callback that records and checks the validation RMSE.
+
+    Args:
+        thresholds (Dict[int, float]): The RMSE to beat per iteration.
+        curve (Dict[int, float]): Receives the RMSE at every checkpoint.
+        interval (int): Iterations between checkpoints.
+        deadline (float): The time.time() at which the search budget ends.
+
+    Returns:
+        Any: The callback.
+    """
+
+    def callback(env: Any) -> None:
+        iteration = env.iteration + 1
+        if iteration % interval:
+            return
+        rmse = env.evaluation_result_list[0][2]
+        curve[iteration] = rmse
+        if time.time() > deadline:
+            raise TrialPruned(f"time budget exhausted at iteration {iteration}")
+        if rmse > thresholds.get(iteration, math.inf):
+            raise TrialPruned(
+                f"RMSE {rmse:.4g} trails the leaders' "
+                f"{thresholds[iteration]:.4g} at iteration {iteration}"
+            )
+
+    return callback
+
+
+def run_trial(
+    number: int,
+    params: Dict[str, Any],
+    dataset_files: Tuple[str, str],
+    labels: Dict[str, Tuple[np.ndarray, np.ndarray]],
+    n_estimators: int,
+    early_stopping_rounds: int,
+    thresholds: Dict[str, Dict[int, float]],
+    interval: int,
+    deadline: float,
+) -> Dict[str, Any]:
+    """
+    Train every target with one parameter set on the shared Dataset files.
+
+    Args:
+        number (int): The trial number.
+        params (Dict[str, Any]): The full LightGBM parameters of the trial.
+        dataset_files (Tuple[str, str]): The binary training and validation
+            Datasets.
+        labels (Dict[str, Tuple[np.ndarray, np.ndarray]]): Per target, the
+            training and validation labels.
+        n_estimators (int): The largest number of boosting rounds.
+        early_stopping_rounds (int): Rounds without improvement before stopping.
+        thresholds (Dict[str, Dict[int, float]]): Pruning thresholds per target.
+        interval (int): Iterations between pruning checks.
+        deadline (float): The time.time() at which the search budget ends.
+
+    Returns:
+        Dict[str, Any]: The trial record: status, score, per-target best RMSE
+            and iteration, checkpoint curves and seconds.
+    """
+    started = time.perf_counter()
+    record: Dict[str, Any] = {
+        "trial": number,
+        "params": params,
+        "status": "complete",
+        "curves": {},
+        "best_rmse": {},
+        "best_iterations": {},
+    }
+
+    for target, (y_train, y_valid) in labels.items():
+        train_set, valid_set = LGBMDatasetCache.load(
+            *dataset_files, y_train, y_valid, params
+        )
+        curve: Dict[int, float] = {}
+        record["curves"][target] = curve
+        try:
+            booster = lgb.train(
+                params,
+                train_set,
+                num_boost_round=n_estimators,
+                valid_sets=[valid_set],
+                callbacks=[
+                    lgb.early_stopping(early_stopping_rounds, verbose=False),
+                    pruning_callback(
+                        thresholds.get(target, {}), curve, interval, deadline
+                    ),
+                ],
+            )
+        except TrialPruned as e:
+            record["status"] = "pruned"
+            record["reason"] = f"{target}: {e}"
+            break
+        record["best_rmse"][target] = booster.best_score["valid_0"]["rmse"]
+        record["best_iterations"][target] = booster.best_iteration
+
+    if record["status"] == "complete":
+        # Matches ModelTrainer's overall RMSE: the root of the mean squared
+        # error over all targets of the validation rows
+        record["score"] = math.sqrt(
+            np.mean([rmse**2 for rmse in record["best_rmse"].values()])
+        )
+    record["seconds"] = time.perf_counter() - started
+    return record
+
+
+def run_search(
+    x_features: pd.DataFrame,
+    y_features: pd.DataFrame,
+    tuning_config: Optional[Dict[str, Any]] = None,
+    model_config: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Search LightGBM parameters on a process pool within a wall-clock budget.
+
+    The features are prepared and split exactly as ModelTrainer.train does,
+    and a ``valid_size`` share of the training rows is held out for early
+    stopping and ranking the trials; the test rows are not seen by any
+    trial. The search split is binned once into binary Dataset files that
+    every trial loads, so no trial repeats the binning. Parameter sets are drawn up front from a
+    seeded generator. Each finished trial updates the pruning thresholds
+    (a percentile of the validation RMSE that finished trials reached at
+    each checkpoint) handed to the trials started after it, and trials
+    still running when the budget ends are stopped at their next
+    checkpoint.
+
+    Once the search is over, the best and the base configs are each fitted
+    on the search split and scored once on the test rows, which gives an
+    unbiased estimate of what the search gained. The trials and the best
+    config are written to ``output_path``; the best config can be passed as
+    ModelTrainer(config=...) or ``main.py --tuned-config`` to retrain with
+    it.
+
+    Args:
+        x_features (pd.DataFrame): The input features.
+        y_features (pd.DataFrame): The target features.
+        tuning_config (Optional[Dict[str, Any]]): Overrides of TUNING_CONFIG.
+        model_config (Optional[Dict[str, Any]]): Overrides of MODEL_CONFIG the
+            trials start from.
+
+    Returns:
+        Dict[str, Any]: The best config and a summary of the search, with
+            the test RMSE of the best and the base configs.
+    """
+    tuning = {**TUNING_CONFIG, **(tuning_config or {})}
+    started = time.perf_counter()
+    deadline = time.time() + tuning["time_budget_seconds"]
+
+    trainer = ModelTrainer(use_dataset_cache=False, config=model_config)
+    x_train, x_test, y_train, y_test = trainer.split_data(x_features, y_features)
+    x_train, x_valid, y_train, y_valid = train_test_split(
+        x_train,
+        y_train,
+        test_size=tuning["valid_size"],
+        random_state=trainer.config["random_state"],
+    )
+    base_params = trainer.lgb_params()
+
+    workers = min(tuning["max_workers"] or os.cpu_count() or 1, tuning["n_trials"])
+    threads = max(1, (trainer.config.get("n_jobs") or os.cpu_count() or 1) // workers)
+
+    rng = np.random.default_rng(tuning["seed"])
+    candidates = [
+        {
+            **base_params,
+            **sample_params(tuning["search_space"], rng),
+            "num_threads": threads,
+        }
+        for _ in range(tuning["n_trials"])
+    ]
+    labels = {
+        target: (y_train[target].to_numpy(), y_valid[target].to_numpy())
+        for target in y_train.columns
+    }
+
+    directory = tempfile.mkdtemp(prefix="tuning-")
+    try:
+        dataset_files = LGBMDatasetCache(directory).get_or_build(
+            x_train, x_valid, base_params
+        )[:2]
+
+        trials: List[Dict[str, Any]] = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            running = {}
+            pending = list(enumerate(candidates))
+
+            def submit() -> None:
+                number, params = pending.pop(0)
+                thresholds = pruning_thresholds(
+                    trials, tuning["prune_percentile"], tuning["min_trials_to_prune"]
+                )
+                future = pool.submit(
+                    run_trial,
+                    number,
+                    params,
+                    dataset_files,
+                    labels,
+                    trainer.config["n_estimators"],
+                    trainer.config["early_stopping_rounds"],
+                    thresholds,
+                    tuning["prune_interval"],
+                    deadline,
+                )
+                running[future] = number
+
+            while pending and len(running) < workers:
+                submit()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    trial = future.result()
+                    trials.append(trial)
+                    logger.info(
+                        f"Trial {trial['trial']} {trial['status']} in "
+                        f"{trial['seconds']:.1f}s"
+                        + (f", RMSE {trial['score']:.4g}" if "score" in trial else "")
+                    )
+                    if pending and time.time() < deadline:
+                        submit()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    complete = [trial for trial in trials if trial["status"] == "complete"]
+    if not complete:
+        raise RuntimeError("No trial completed within the time budget")
+    best = min(complete, key=lambda trial: trial["score"])
+
+    tuned = {
+        name: best["params"][name]
+        for name in tuning["search_space"]
+        if name != "learning_rate"
+    }
+    best_config = {
+        "learning_rate": best["params"]["learning_rate"],
+        "lgb_params": {**trainer.config["lgb_params"], **tuned},
+        "n_estimators": trainer.config["n_estimators"],
+        "early_stopping_rounds": trainer.config["early_stopping_rounds"],
+    }
+
+    # Score both configs once on the test rows, which no trial has seen
+    test_rmse = {}
+    for name, params in (("base", base_params), ("best", best["params"])):
+        params = {key: value for key, value in params.items() if key != "num_threads"}
+        trainer.model = trainer.fit_targets(x_train, y_train, x_valid, y_valid, params)
+        test_rmse[name] = trainer.evaluate_model(
+            x_test, y_test, f"Tuning {name} config test"
+        )["overall_rmse"]
+
+    summary = {
+        "created_at": datetime.now().isoformat(),
+        "data_fingerprint": fingerprint_frame(x_features),
+        "seed": tuning["seed"],
+        "workers": workers,
+        "threads_per_trial": threads,
+        "wall_seconds": time.perf_counter() - started,
+        "trials_started": len(trials),
+        "trials_complete": len(complete),
+        "trials_pruned": sum(trial["status"] == "pruned" for trial in trials),
+        "trials_skipped": len(candidates) - len(trials),
+        "best_trial": best["trial"],
+        "best_score": best["score"],
+        "base_test_rmse": test_rmse["base"],
+        "best_test_rmse": test_rmse["best"],
+        "best_config": best_config,
+    }
+
+    output_path = tuning["output_path"]
+    os.makedirs(output_path, exist_ok=True)
+    with open(os.path.join(output_path, "trials.json"), "w") as f:
+        json.dump(sorted(trials, key=lambda trial: trial["trial"]), f, indent=2)
+    with open(os.path.join(output_path, "best_config.json"), "w") as f:
+        json.dump(best_config, f, indent=2)
+    with open(os.path.join(output_path, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    logger.info(
+        f"Search finished in {summary['wall_seconds']:.1f}s: "
+        f"{summary['trials_complete']} complete, {summary['trials_pruned']} "
+        f"pruned, best validation RMSE {best['score']:.4g} (trial "
+        f"{best['trial']}), test RMSE {test_rmse['base']:.4g} -> "
+        f"{test_rmse['best']:.4g}"
+    )
+    return summary
+
+
+def load_tuned_config(path: str) -> Dict[str, Any]:
+    """
+    Load a best config written by run_search.
+
+    Args:
+        path (str): The best_config.json file.
+
+    Returns:
+        Dict[str, Any]: MODEL_CONFIG overrides.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
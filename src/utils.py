@@ -1,6 +1,7 @@
 """
 This module contains utility functions for the application.
 """
+import hashlib
 import pandas as pd
 import numpy as np
 import logging
@@ -63,6 +64,52 @@ def calculate_rolling_features(
     return df
 
 
+SIZE_UNITS: Dict[str, int] = {
+    "B": 1,
+    "KB": 1024,
+    "MB": 1024**2,
+    "GB": 1024**3,
+    "TB": 1024**4,
+}
+
+
+def parse_size(size: Any) -> int:
+    """
+    Parse a human-readable size such as "2GB" or "512 MB" into bytes.
+
+    Args:
+        size (Any): A size string, or a number of bytes.
+
+    Returns:
+        int: The size in bytes.
+    """
+    if isinstance(size, (int, float)):
+        return int(size)
+
+    text = str(size).strip().upper().replace(" ", "")
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[: -len(unit)]) * SIZE_UNITS[unit])
+    return int(float(text))
+
+
+def fingerprint_frame(df: pd.DataFrame) -> str:
+    """
+    Hash the content of a DataFrame, including its column names and dtypes.
+
+    Args:
+        df (pd.DataFrame): The frame to hash.
+
+    Returns:
+        str: A hex digest that changes whenever any value, column or dtype does.
+    """
+    digest = hashlib.sha256()
+    schema = [(str(col), str(dtype)) for col, dtype in df.dtypes.items()]
+    digest.update(repr(schema).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
 def save_model(model: Any, filepath: str) -> None:
     """
     Save trained model to file.
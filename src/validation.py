@@ -0,0 +1,249 @@
+"""
+This module contains the SchemaValidator class, which compiles the validation
+rules of data_config.yaml into vectorized checks.
+"""
+import logging
+import operator
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Examples of offending values kept per violation in a report
+MAX_EXAMPLES = 5
+
+_RANGE_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+
+def _parse_range(rule: str) -> Tuple[str, float]:
+    """Split a range rule such as "> 0" into its operator and bound."""
+    text = str(rule).strip()
+    for symbol in _RANGE_OPERATORS:
+        if text.startswith(symbol):
+            return symbol, float(text[len(symbol) :])
+    raise ValueError(f"Unsupported range rule: {rule}")
+
+
+def _coerce(series: pd.Series, kind: str) -> pd.Series:
+    """Convert a column to a declared type; unparseable values become missing."""
+    if kind in ("float", "int"):
+        if kind == "float" and pd.api.types.is_float_dtype(series):
+            return series
+        if kind == "int" and pd.api.types.is_integer_dtype(series):
+            return series
+        numeric = pd.to_numeric(series, errors="coerce")
+        return numeric.astype("float64") if kind == "float" else numeric
+    if kind == "string":
+        if isinstance(series.dtype, pd.CategoricalDtype) or (
+            pd.api.types.is_string_dtype(series)
+        ):
+            return series
+        return series.astype("str").where(series.notna())
+    if kind == "category":
+        return series.astype("category")
+    if kind == "datetime":
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        return pd.to_datetime(series, errors="coerce")
+    if kind == "bool":
+        return series.astype("boolean")
+    raise ValueError(f"Unsupported data type: {kind}")
+
+
+class SchemaValidator:
+    """
+    Vectorized validation of one dataset: required columns, type coercion,
+    numeric ranges and allowed values.
+
+    Every rule runs once per column over the whole frame, and failures are
+    collected into a compact report instead of raising on the first bad row.
+    """
+
+    def __init__(
+        self,
+        dataset: str,
+        required_columns: Optional[Sequence[str]] = None,
+        data_types: Optional[Dict[str, str]] = None,
+        ranges: Optional[Dict[str, Any]] = None,
+        allowed_values: Optional[Dict[str, Sequence[Any]]] = None,
+    ) -> None:
+        """
+        Initializes the SchemaValidator.
+
+        Args:
+            dataset (str): The dataset name, e.g. "vehicle_data".
+            required_columns (Optional[Sequence[str]]): Columns that must exist.
+            data_types (Optional[Dict[str, str]]): Declared types per column:
+                string, float, int, bool, datetime or category.
+            ranges (Optional[Dict[str, Any]]): Range rules per column, e.g.
+                "> 0" or ["> 0", "<= 1000"].
+            allowed_values (Optional[Dict[str, Sequence[Any]]]): Permitted
+                values per column.
+        """
+        self.dataset = dataset
+        self.required_columns = list(required_columns or [])
+        self.data_types = dict(data_types or {})
+        self.ranges: Dict[str, List[Tuple[str, float]]] = {
+            column: [
+                _parse_range(rule)
+                for rule in (rules if isinstance(rules, list) else [rules])
+            ]
+            for column, rules in (ranges or {}).items()
+        }
+        self.allowed_values = {
+            column: list(values) for column, values in (allowed_values or {}).items()
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict, dataset: str) -> "SchemaValidator":
+        """
+        Compile the validation section of data_config.yaml for one dataset.
+
+        Args:
+            config (Dict): The parsed data_config.yaml.
+            dataset (str): The dataset name, e.g. "vehicle_data".
+
+        Returns:
+            SchemaValidator: The compiled validator.
+        """
+        rules = config.get("data_processing", {}).get("validation", {})
+        return cls(
+            dataset,
+            required_columns=rules.get("required_columns", {}).get(dataset, []),
+            data_types=rules.get("data_types", {}),
+            ranges=rules.get("ranges", {}),
+            allowed_values=rules.get("allowed_values", {}),
+        )
+
+    def missing_columns(
+        self, available: Sequence[str], requested: Optional[Sequence[str]] = None
+    ) -> List[str]:
+        """
+        Return the required columns (of those requested) that are not available.
+
+        Args:
+            available (Sequence[str]): The columns present.
+            requested (Optional[Sequence[str]]): A column projection, if any.
+
+        Returns:
+            List[str]: The missing required columns.
+        """
+        required = self.required_columns
+        if requested is not None:
+            required = [col for col in required if col in requested]
+        return [col for col in required if col not in available]
+
+    def validate(
+        self, df: pd.DataFrame, requested: Optional[Sequence[str]] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Coerce declared types and check every rule over the whole frame.
+
+        Rows are never dropped: values that fail type coercion become missing,
+        and every failure is counted in the report.
+
+        Args:
+            df (pd.DataFrame): The loaded data.
+            requested (Optional[Sequence[str]]): A column projection, if any.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict[str, Any]]: The coerced frame and a report
+                with the row counts, missing columns and a list of violations
+                (column, check, count and a few example values).
+        """
+        violations = []
+        invalid = np.zeros(len(df), dtype=bool)
+        coerced = {}
+
+        def record(column: str, check: str, mask: pd.Series, values: pd.Series):
+            count = int(mask.sum())
+            if count:
+                np.logical_or(invalid, mask.to_numpy(), out=invalid)
+                violations.append(
+                    {
+                        "column": column,
+                        "check": check,
+                        "count": count,
+                        "examples": values[mask].head(MAX_EXAMPLES).tolist(),
+                    }
+                )
+
+        for column, kind in self.data_types.items():
+            if column not in df.columns:
+                continue
+            original = df[column]
+            series = _coerce(original, kind)
+            if series is not original:
+                coerced[column] = series
+            record(column, f"type {kind}", series.isna() & original.notna(), original)
+
+        if coerced:
+            df = df.assign(**coerced)
+
+        for column, rules in self.ranges.items():
+            if column not in df.columns:
+                continue
+            values = pd.to_numeric(df[column], errors="coerce")
+            for symbol, bound in rules:
+                passed = _RANGE_OPERATORS[symbol](values, bound)
+                record(column, f"{symbol} {bound:g}", values.notna() & ~passed, values)
+
+        for column, allowed in self.allowed_values.items():
+            if column not in df.columns:
+                continue
+            values = df[column]
+            record(
+                column,
+                "allowed values",
+                values.notna() & ~values.isin(allowed),
+                values,
+            )
+
+        report = {
+            "dataset": self.dataset,
+            "rows": len(df),
+            "invalid_rows": int(invalid.sum()),
+            "missing_columns": self.missing_columns(df.columns, requested),
+            "violations": violations,
+        }
+        return df, report
+
+
+def merge_reports(reports: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the reports of several chunks of the same dataset.
+
+    Args:
+        reports (Sequence[Dict[str, Any]]): Reports from SchemaValidator.validate.
+
+    Returns:
+        Dict[str, Any]: One report over all chunks.
+    """
+    merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for report in reports:
+        for violation in report["violations"]:
+            key = (violation["column"], violation["check"])
+            if key not in merged:
+                merged[key] = {**violation, "examples": list(violation["examples"])}
+                continue
+            entry = merged[key]
+            entry["count"] += violation["count"]
+            room = MAX_EXAMPLES - len(entry["examples"])
+            entry["examples"].extend(violation["examples"][:room])
+
+    return {
+        "dataset": reports[0]["dataset"] if reports else None,
+        "rows": sum(report["rows"] for report in reports),
+        "invalid_rows": sum(report["invalid_rows"] for report in reports),
+        "missing_columns": reports[0]["missing_columns"] if reports else [],
+        "violations": list(merged.values()),
+    }
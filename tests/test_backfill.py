@@ -0,0 +1,93 @@
+import pytest
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from backfill import day_seed, plan_tasks, run_backfill
+from data_lake import ParquetDataLake
+
+
+class TestBackfill:
+    """Test suite for the historical backfill."""
+
+    def test_plan_tasks_splits_by_city_and_month(self):
+        """Tasks are clipped to the requested range at month boundaries."""
+        tasks = plan_tasks("2023-01-20", "2023-02-10", cities=["Delhi", "Pune"])
+
+        assert [(t["city"], t["start"], t["end"]) for t in tasks] == [
+            ("Delhi", "2023-01-20", "2023-01-31"),
+            ("Delhi", "2023-02-01", "2023-02-10"),
+            ("Pune", "2023-01-20", "2023-01-31"),
+            ("Pune", "2023-02-01", "2023-02-10"),
+        ]
+
+    def test_day_seed_is_deterministic(self):
+        """Seeds depend only on the base seed, city and day."""
+        day = pd.Timestamp("2023-03-01")
+
+        assert day_seed(42, "Delhi", day) == day_seed(42, "Delhi", day)
+        assert day_seed(42, "Delhi", day) != day_seed(42, "Pune", day)
+        assert day_seed(42, "Delhi", day) != day_seed(7, "Delhi", day)
+
+    def test_backfill_resumes_from_checkpoints(self, tmp_path):
+        """A second run skips finished tasks and reproduces the same data."""
+        lake_path = str(tmp_path / "lake")
+        kwargs = dict(
+            cities=["Pune"], lake_path=lake_path, warmup_days=3, max_workers=2
+        )
+
+        first = run_backfill("2023-01-28", "2023-02-03", **kwargs)
+        data = ParquetDataLake(lake_path).read("observations")
+        second = run_backfill("2023-01-28", "2023-02-03", **kwargs)
+
+        assert first["completed"] == 2
+        assert second["completed"] == 0
+        assert second["skipped"] == 2
+        assert len(data) == 7 * 5
+
+        third = run_backfill("2023-01-28", "2023-02-03", resume=False, **kwargs)
+        assert third["completed"] == 2
+        pd.testing.assert_frame_equal(
+            ParquetDataLake(lake_path).read("observations"), data
+        )
+
+    def test_backfills_of_one_month_keep_each_other(self, tmp_path):
+        """A second backfill in the same city-month adds to the first."""
+        lake_path = str(tmp_path / "lake")
+        kwargs = dict(
+            cities=["Pune"], lake_path=lake_path, warmup_days=3, max_workers=1
+        )
+
+        run_backfill("2023-01-15", "2023-01-31", **kwargs)
+        run_backfill("2023-01-01", "2023-01-14", **kwargs)
+        data = ParquetDataLake(lake_path).read("observations")
+
+        days = pd.to_datetime(data["daily_date"]).dt.day
+        assert sorted(days.unique()) == list(range(1, 32))
+        assert len(data) == 31 * 5
+
+        # A rerun of the whole month replaces both parts
+        run_backfill("2023-01-01", "2023-01-31", resume=False, **kwargs)
+        rerun = ParquetDataLake(lake_path).read("observations")
+        assert len(rerun) == 31 * 5
+        assert len(ParquetDataLake(lake_path).list_files("observations")) == 1
+
+    def test_overlapping_backfills_replace_days(self, tmp_path):
+        """A rerun over part of an earlier range replaces those days only."""
+        lake_path = str(tmp_path / "lake")
+        kwargs = dict(
+            cities=["Pune"], lake_path=lake_path, warmup_days=3, max_workers=1
+        )
+
+        run_backfill("2023-01-01", "2023-01-15", **kwargs)
+        run_backfill("2023-01-10", "2023-01-31", **kwargs)
+        data = ParquetDataLake(lake_path).read("observations")
+
+        assert not data.duplicated(["ward_id", "daily_date"]).any()
+        assert len(data) == 31 * 5
+        assert sorted(
+            os.path.basename(path)
+            for path in ParquetDataLake(lake_path).list_files("observations")
+        ) == ["part-20230101-20230109.parquet", "part-20230110-20230131.parquet"]
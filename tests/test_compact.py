@@ -0,0 +1,59 @@
+import pytest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from compact import (
+    CITY_CONSTANT_COLUMNS,
+    DEFAULT_RTOL,
+    attach_constants,
+    compact_frame,
+)
+from data_acquisition import DataAcquisition
+from feature_engineering import calculate_sequestration_and_removal
+
+
+class TestCompact:
+    """Test suite for the compact feature table."""
+
+    @pytest.fixture
+    def training_data(self):
+        """Training data for two cities."""
+        return DataAcquisition().generate_training_data(
+            "2023-01-01", 15, cities=["Delhi", "Pune"]
+        )
+
+    def test_compact_frame(self, training_data):
+        """Compact mode saves memory within the tolerance."""
+        compact, report = compact_frame(training_data)
+
+        assert report["bytes_after"] < report["bytes_before"] / 2
+        assert report["max_rel_deviation"] <= DEFAULT_RTOL
+        assert sorted(report["constant_columns"]) == sorted(CITY_CONSTANT_COLUMNS)
+        assert isinstance(compact["city_id"].dtype, pd.CategoricalDtype)
+        assert compact["traffic_index_0_100"].dtype == np.float32
+
+    def test_attach_constants_round_trip(self, training_data):
+        """Attaching the side table restores the dropped columns exactly."""
+        compact, _ = compact_frame(training_data)
+        restored = attach_constants(compact)
+
+        for column in CITY_CONSTANT_COLUMNS:
+            np.testing.assert_array_equal(
+                restored[column].to_numpy(), training_data[column].to_numpy()
+            )
+
+    def test_features_from_compact_table(self, training_data):
+        """Features engineered from the compact table match the full table."""
+        full = calculate_sequestration_and_removal(training_data)
+        compact, _ = compact_frame(training_data)
+        result = calculate_sequestration_and_removal(compact)
+
+        for column in ["CO2_emission_kg", "co2_sequestered_kg", "Net_NOX_kg"]:
+            np.testing.assert_allclose(
+                result[column].to_numpy(dtype=float), full[column], rtol=1e-5
+            )
@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cross_validation import cross_validate, rolling_origin_splits
+
+
+class TestCrossValidation:
+    """Test suite for rolling-origin cross-validation."""
+
+    @pytest.fixture
+    def panel(self):
+        """Sixty days of three wards, shuffled."""
+        rng = np.random.default_rng(0)
+        dates = np.repeat(pd.date_range("2023-01-01", periods=60), 3)
+        wards = np.tile(["W1", "W2", "W3"], 60)
+        x = pd.DataFrame(
+            {
+                "traffic": rng.uniform(0, 100, 180),
+                "ndvi": rng.uniform(0, 1, 180),
+            }
+        )
+        y = pd.DataFrame(
+            {
+                "Net_CO2_kg": 3 * x["traffic"] - 50 * x["ndvi"],
+                "Net_PM25_kg": 0.1 * x["traffic"],
+                "Net_NOX_kg": x["traffic"] * x["ndvi"],
+            }
+        )
+        order = rng.permutation(180)
+        return (
+            x.iloc[order],
+            y.iloc[order],
+            pd.Series(dates[order]),
+            pd.Series(wards[order]),
+        )
+
+    def test_splits_never_train_on_the_future(self):
+        """Every fold trains before its test block and blocks tile the tail."""
+        dates = pd.Series(np.repeat(pd.date_range("2023-01-01", periods=30), 2))
+        folds = rolling_origin_splits(dates, 3, 5, gap_days=1, valid_days=4)
+
+        assert [fold["test_start"] for fold in folds] == [
+            "2023-01-16",
+            "2023-01-21",
+            "2023-01-26",
+        ]
+        for fold in folds:
+            assert fold["train"][1] == fold["valid"][0]
+            assert fold["valid"][1] + 2 == fold["test"][0]  # one gap day
+            assert fold["test"][1] - fold["test"][0] == 10
+        assert folds[-1]["test"][1] == len(dates)
+
+        with pytest.raises(ValueError):
+            rolling_origin_splits(dates, 10, 5)
+
+    def test_parallel_folds_report_metrics(self, panel, tmp_path):
+        """Folds on a process pool match a single worker and are reported."""
+        x, y, dates, wards = panel
+        model_config = {"n_estimators": 30, "n_jobs": 2}
+        cv_config = {"n_folds": 3, "test_days": 7, "valid_days": 7}
+        output_path = str(tmp_path / "cv.json")
+
+        parallel = cross_validate(
+            x,
+            y,
+            dates,
+            wards,
+            cv_config={**cv_config, "max_workers": 2, "output_path": output_path},
+            model_config=model_config,
+        )
+        single = cross_validate(
+            x,
+            y,
+            dates,
+            wards,
+            cv_config={**cv_config, "max_workers": 1, "output_path": None},
+            model_config=model_config,
+        )
+
+        assert parallel["workers"] == 2
+        assert [fold["fold"] for fold in parallel["folds"]] == [0, 1, 2]
+        assert parallel["folds"][0]["rows"] == {"train": 96, "valid": 21, "test": 21}
+        assert parallel["folds"][0]["wards"] == 3
+        assert set(parallel["aggregate"]) == set(y.columns)
+        assert parallel["aggregate"]["Net_CO2_kg"]["r2_mean"] > 0.5
+        for a, b in zip(parallel["folds"], single["folds"]):
+            for target in y.columns:
+                assert a["metrics"][target] == pytest.approx(b["metrics"][target])
+        assert os.path.exists(output_path)
@@ -0,0 +1,106 @@
+import pytest
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_lake import ParquetDataLake
+
+
+class TestParquetDataLake:
+    """Test suite for the ParquetDataLake class."""
+
+    @pytest.fixture
+    def lake(self, tmp_path):
+        """A lake rooted in a temporary directory."""
+        return ParquetDataLake(str(tmp_path / "lake"))
+
+    @pytest.fixture
+    def observations(self):
+        """Two cities over two months of daily observations."""
+        dates = pd.date_range("2023-01-20", "2023-02-10")
+        return pd.DataFrame(
+            {
+                "daily_date": list(dates) * 2,
+                "city_id": ["Delhi"] * len(dates) + ["Pune"] * len(dates),
+                "ward_id": ["Delhi_W1"] * len(dates) + ["Pune_W1"] * len(dates),
+                "Net_CO2_kg": range(2 * len(dates)),
+            }
+        )
+
+    def test_write_partitions_by_city_and_month(self, lake, observations):
+        """Each city-month lands in its own partition directory."""
+        lake.write(observations, "observations")
+
+        partitions = lake.list_partitions("observations")
+        assert [(city, month) for city, month, _ in partitions] == [
+            ("Delhi", "2023-01"),
+            ("Delhi", "2023-02"),
+            ("Pune", "2023-01"),
+            ("Pune", "2023-02"),
+        ]
+        assert lake.count_rows("observations") == len(observations)
+
+    def test_read_prunes_partitions_and_projects_columns(self, lake, observations):
+        """A city-month read only opens that partition's files."""
+        lake.write(observations, "observations")
+
+        files = lake.list_files(
+            "observations",
+            cities=["Pune"],
+            start_date="2023-02-01",
+            end_date="2023-02-28",
+        )
+        df = lake.read(
+            "observations",
+            columns=["Net_CO2_kg"],
+            cities=["Pune"],
+            start_date="2023-02-01",
+            end_date="2023-02-28",
+        )
+
+        assert len(files) == 1
+        assert list(df.columns) == ["Net_CO2_kg"]
+        assert len(df) == 10
+
+    def test_append_new_days(self, lake, observations):
+        """Appending a new day adds rows without rewriting existing parts."""
+        lake.write(observations, "observations")
+        new_day = observations[observations["daily_date"] == "2023-02-10"].copy()
+        new_day["daily_date"] = pd.Timestamp("2023-02-11")
+
+        lake.write(new_day, "observations", mode="append")
+        lake.write(new_day, "observations", mode="append")
+
+        assert lake.count_rows("observations") == len(observations) + 2
+
+    def test_overwrite_replaces_partition(self, lake, observations):
+        """Overwriting a partition drops its previous parts."""
+        lake.write(observations, "observations")
+        lake.write(observations.head(3), "observations", mode="overwrite")
+
+        df = lake.read("observations", cities=["Delhi"], end_date="2023-01-31")
+        assert len(df) == 3
+
+    def test_replace_rewrites_overlapping_days(self, lake, observations):
+        """Replacing days trims them from overlapping parts of the partition."""
+        lake.write(observations, "observations")
+        delhi = observations[observations["city_id"] == "Delhi"]
+        update = delhi[delhi["daily_date"].between("2023-01-25", "2023-01-27")]
+
+        lake.write(update.assign(Net_CO2_kg=-1), "observations", mode="replace")
+
+        df = lake.read("observations", cities=["Delhi"], end_date="2023-01-31")
+        assert len(df) == 12
+        assert not df["daily_date"].duplicated().any()
+        replaced = df.loc[df["Net_CO2_kg"] == -1, "daily_date"]
+        assert list(replaced.dt.day) == [25, 26, 27]
+        names = sorted(
+            os.path.basename(path)
+            for path in lake.list_files("observations", cities=["Delhi"])
+        )
+        assert names[:2] == [
+            "part-20230120-20230131.parquet",
+            "part-20230125-20230127.parquet",
+        ]
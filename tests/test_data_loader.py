@@ -0,0 +1,198 @@
+import json
+import pytest
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_loader import DataLoader
+
+
+class TestDataLoader:
+    """Test suite for the DataLoader class."""
+
+    @pytest.fixture
+    def vehicle_data(self):
+        """Vehicle records over two cities and several days."""
+        return pd.DataFrame(
+            {
+                "vehicle_type": ["car", "truck", "twowheeler", "car"] * 5,
+                "fuel_type": ["petrol", "diesel", "petrol", "electric"] * 5,
+                "distance": [10.0, 20.0, 5.0, 12.0] * 5,
+                "emissions": [2.1, 5.0, 0.6, 0.6] * 5,
+                "city_id": ["Delhi", "Pune"] * 10,
+                "daily_date": pd.date_range("2023-01-01", periods=20),
+            }
+        )
+
+    @pytest.mark.parametrize("extension", [".parquet", ".feather", ".arrow", ".csv"])
+    def test_projection_and_filters(self, tmp_path, vehicle_data, extension):
+        """Columns are projected and rows filtered for every format."""
+        path = str(tmp_path / f"vehicles{extension}")
+        if extension == ".parquet":
+            vehicle_data.to_parquet(path)
+        elif extension == ".csv":
+            vehicle_data.to_csv(path, index=False)
+        else:
+            vehicle_data.to_feather(path)
+
+        df = DataLoader().load_vehicle_data(
+            path,
+            columns=["vehicle_type", "fuel_type", "distance"],
+            filters=[("city_id", "==", "Delhi"), ("daily_date", ">=", "2023-01-11")],
+        )
+
+        assert list(df.columns) == ["vehicle_type", "fuel_type", "distance"]
+        assert len(df) == 5
+
+    @pytest.mark.parametrize("extension", [".parquet", ".csv"])
+    def test_timestamp_filters(self, tmp_path, vehicle_data, extension):
+        """Timestamp filters work on CSV, whose dates are read as strings."""
+        path = str(tmp_path / f"vehicles{extension}")
+        if extension == ".parquet":
+            vehicle_data.to_parquet(path)
+        else:
+            vehicle_data.to_csv(path, index=False)
+
+        df = DataLoader().load_vehicle_data(
+            path,
+            filters=[
+                ("daily_date", ">=", pd.Timestamp("2023-01-11")),
+                ("daily_date", "<", pd.Timestamp("2023-01-15")),
+            ],
+        )
+
+        assert len(df) == 4
+
+    def test_categorical_dtypes(self, tmp_path, vehicle_data):
+        """Explicit dtypes load string columns as categoricals."""
+        path = str(tmp_path / "vehicles.parquet")
+        vehicle_data.to_parquet(path)
+
+        df = DataLoader().load_vehicle_data(
+            path, dtypes={"vehicle_type": "category", "fuel_type": "category"}
+        )
+
+        assert isinstance(df["vehicle_type"].dtype, pd.CategoricalDtype)
+        assert isinstance(df["fuel_type"].dtype, pd.CategoricalDtype)
+
+    def test_unsupported_operator(self, tmp_path, vehicle_data):
+        """Unknown filter operators are rejected."""
+        path = str(tmp_path / "vehicles.parquet")
+        vehicle_data.to_parquet(path)
+
+        with pytest.raises(ValueError):
+            DataLoader().load_vehicle_data(path, filters=[("distance", "~", 1)])
+
+    @pytest.mark.parametrize("extension", [".csv", ".jsonl", ".parquet"])
+    def test_iter_vehicle_data_chunks(self, tmp_path, vehicle_data, extension):
+        """Chunks have the requested size and cover every row."""
+        path = str(tmp_path / f"vehicles{extension}")
+        if extension == ".csv":
+            vehicle_data.to_csv(path, index=False)
+        elif extension == ".jsonl":
+            vehicle_data.to_json(path, orient="records", lines=True, date_format="iso")
+        else:
+            vehicle_data.to_parquet(path, row_group_size=3)
+
+        chunks = list(DataLoader().iter_vehicle_data(path, chunk_size=8))
+
+        assert [len(chunk) for chunk in chunks] == [8, 8, 4]
+        assert sum(chunk["distance"].sum() for chunk in chunks) == pytest.approx(
+            vehicle_data["distance"].sum()
+        )
+
+    def test_iter_vehicle_data_checks_schema_first(self, tmp_path, vehicle_data):
+        """A missing required column fails before any chunk is produced."""
+        path = str(tmp_path / "vehicles.csv")
+        vehicle_data.drop(columns=["emissions"]).to_csv(path, index=False)
+
+        with pytest.raises(ValueError):
+            next(DataLoader().iter_vehicle_data(path))
+
+    def test_default_chunk_size_from_config(self):
+        """The chunk size defaults to processing.chunk_size."""
+        loader = DataLoader(
+            config={"data_processing": {"processing": {"chunk_size": 123}}}
+        )
+        assert loader.chunk_size == 123
+
+    def test_load_directory_mixed_files(self, tmp_path):
+        """JSON objects, JSON lists and CSV files are combined into one frame."""
+        (tmp_path / "2023010100.json").write_text(
+            json.dumps({"city_id": "Delhi", "traffic_index": 40.0})
+        )
+        (tmp_path / "2023010101.json").write_text(
+            json.dumps(
+                [
+                    {"city_id": "Delhi", "traffic_index": 41.0},
+                    {"city_id": "Mumbai", "traffic_index": 55.0, "extra": 1},
+                ]
+            )
+        )
+        pd.DataFrame({" city_id": ["Pune"], "traffic_index": [30.0]}).to_csv(
+            tmp_path / "2023010102.csv", index=False
+        )
+
+        df, failures = DataLoader().load_directory(
+            str(tmp_path),
+            columns=["city_id", "traffic_index"],
+            dtypes={"city_id": "category"},
+            source_column="source_file",
+        )
+
+        assert failures == {}
+        assert len(df) == 4
+        assert list(df.columns) == ["city_id", "traffic_index", "source_file"]
+        assert isinstance(df["city_id"].dtype, pd.CategoricalDtype)
+        assert set(df["city_id"]) == {"Delhi", "Mumbai", "Pune"}
+        assert df["source_file"].value_counts()["2023010101.json"] == 2
+
+    def test_load_directory_reports_corrupt_files(self, tmp_path):
+        """A corrupt file is reported without aborting the load."""
+        (tmp_path / "good.json").write_text(json.dumps({"traffic_index": 1.0}))
+        (tmp_path / "broken.json").write_text("{not json")
+        (tmp_path / "scalars.json").write_text(json.dumps([1, 2, 3]))
+
+        df, failures = DataLoader().load_directory(str(tmp_path), pattern="*.json")
+
+        assert len(df) == 1
+        assert sorted(failures) == [
+            str(tmp_path / "broken.json"),
+            str(tmp_path / "scalars.json"),
+        ]
+
+    def test_validation_report(self, tmp_path, vehicle_data):
+        """Rule violations are coerced and reported instead of raised."""
+        vehicle_data["distance"] = vehicle_data["distance"].astype(object)
+        vehicle_data.loc[0, "distance"] = "unknown"
+        vehicle_data.loc[1, "distance"] = -3.0
+        vehicle_data.loc[2, "fuel_type"] = "coal"
+        path = str(tmp_path / "vehicles.csv")
+        vehicle_data.to_csv(path, index=False)
+
+        loader = DataLoader()
+        df = loader.load_vehicle_data(path)
+        report = loader.last_validation_report
+
+        assert df["distance"].dtype == "float64"
+        assert pd.isna(df.loc[0, "distance"])
+        assert report["rows"] == 20
+        assert report["invalid_rows"] == 3
+        checks = {(v["column"], v["check"]): v for v in report["violations"]}
+        assert checks[("distance", "type float")]["examples"] == ["unknown"]
+        assert checks[("distance", "> 0")]["count"] == 1
+        assert checks[("fuel_type", "allowed values")]["examples"] == ["coal"]
+
+    def test_chunked_validation_report(self, tmp_path, vehicle_data):
+        """Chunk reports are merged once the file is consumed."""
+        vehicle_data.loc[[0, 15], "fuel_type"] = "coal"
+        path = str(tmp_path / "vehicles.csv")
+        vehicle_data.to_csv(path, index=False)
+
+        loader = DataLoader()
+        list(loader.iter_vehicle_data(path, chunk_size=8))
+
+        assert loader.last_validation_report["rows"] == 20
+        assert loader.last_validation_report["violations"][0]["count"] == 2
@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from dataset_cache import LGBMDatasetCache
+from model_trainer import ModelTrainer
+from utils import load_model, save_model
+
+
+class TestLGBMDatasetCache:
+    """Test suite for the binned LightGBM Dataset cache."""
+
+    @pytest.fixture
+    def training_data(self):
+        """A small regression problem with three targets."""
+        rng = np.random.default_rng(0)
+        x = pd.DataFrame(
+            {"traffic": rng.uniform(0, 100, 300), "ndvi": rng.uniform(0, 1, 300)}
+        )
+        y = pd.DataFrame(
+            {
+                "Net_CO2_kg": 3 * x["traffic"] - 50 * x["ndvi"],
+                "Net_PM25_kg": 0.1 * x["traffic"],
+                "Net_NOX_kg": x["traffic"] * x["ndvi"],
+            }
+        )
+        return x, y
+
+    def make_trainer(self, tmp_path, use_dataset_cache):
+        """A trainer with a short schedule and a temporary cache."""
+        trainer = ModelTrainer(use_dataset_cache=False)
+        trainer.config = {**trainer.config, "n_estimators": 50}
+        if use_dataset_cache:
+            trainer.dataset_cache = LGBMDatasetCache(str(tmp_path / "datasets"))
+        return trainer
+
+    def test_cached_training_matches(self, training_data, tmp_path):
+        """Trainings from cached bins match a plain training."""
+        x, y = training_data
+        plain = self.make_trainer(tmp_path, use_dataset_cache=False)
+        first = self.make_trainer(tmp_path, use_dataset_cache=True)
+        second = self.make_trainer(tmp_path, use_dataset_cache=True)
+        plain.train(x, y)
+        first.train(x, y)
+        second.train(x, y)
+
+        assert plain.training_report["dataset_cache"] is None
+        assert first.training_report["dataset_cache"] == "miss"
+        assert second.training_report["dataset_cache"] == "hit"
+        np.testing.assert_allclose(
+            second.predict(x).to_numpy(), plain.predict(x).to_numpy()
+        )
+        assert "shap_values" in second.explain_prediction(x)
+
+    def test_key_tracks_binning_only(self, training_data):
+        """Only binning parameters and the features change the key."""
+        x, _ = training_data
+        params = {"learning_rate": 0.05, "max_bin": 255}
+        key = LGBMDatasetCache.key(x, x, params)
+
+        assert LGBMDatasetCache.key(x, x, {**params, "learning_rate": 0.1}) == key
+        assert LGBMDatasetCache.key(x, x, {**params, "max_bin": 63}) != key
+        assert LGBMDatasetCache.key(x * 2, x, params) != key
+
+    def test_cached_trainer_round_trip(self, training_data, tmp_path):
+        """A trainer with a cache saves and loads without it."""
+        x, y = training_data
+        trainer = ModelTrainer(
+            config={
+                "n_estimators": 50,
+                "dataset_cache": {"enabled": True, "path": str(tmp_path / "datasets")},
+            }
+        )
+        trainer.train(x, y)
+        assert trainer.training_report["dataset_cache"] == "miss"
+
+        path = str(tmp_path / "trained_model.pkl")
+        save_model(trainer, path)
+        loaded = load_model(path)
+
+        assert loaded.dataset_cache is None
+        assert trainer.dataset_cache is not None
+        pd.testing.assert_frame_equal(loaded.predict(x), trainer.predict(x))
@@ -0,0 +1,83 @@
+import pytest
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_loader import DataLoader
+from file_cache import ParsedFileCache
+
+
+class TestParsedFileCache:
+    """Test suite for the parsed-file cache."""
+
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        """A small vehicle CSV."""
+        path = tmp_path / "vehicles.csv"
+        pd.DataFrame(
+            {
+                "vehicle_type": ["car", "truck"] * 50,
+                "fuel_type": ["petrol", "diesel"] * 50,
+                "distance": np.arange(100, dtype=float),
+                "emissions": np.arange(100, dtype=float) * 2,
+            }
+        ).to_csv(path, index=False)
+        return str(path)
+
+    def test_hit_returns_typed_frame(self, tmp_path, csv_path):
+        """A second load is served from the cache with the same dtypes."""
+        cache = ParsedFileCache(str(tmp_path / "cache"))
+        loader = DataLoader()
+        loader.cache = cache
+        dtypes = {"fuel_type": "category"}
+
+        first = loader.load_vehicle_data(csv_path, dtypes=dtypes)
+        second = loader.load_vehicle_data(csv_path, dtypes=dtypes)
+
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert isinstance(second["fuel_type"].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_changed_file_or_options_miss(self, tmp_path, csv_path):
+        """Editing the file or changing the dtypes bypasses old entries."""
+        cache = ParsedFileCache(str(tmp_path / "cache"))
+        loader = DataLoader()
+        loader.cache = cache
+
+        loader.load_file(csv_path)
+        loader.load_file(csv_path, dtypes={"fuel_type": "category"})
+
+        df = pd.read_csv(csv_path).head(10)
+        df.to_csv(csv_path, index=False)
+        stat = os.stat(csv_path)
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert len(loader.load_file(csv_path)) == 10
+        assert cache.stats()["misses"] == 3
+
+    def test_eviction_respects_budget(self, tmp_path, csv_path):
+        """Least recently used entries are evicted past the disk budget."""
+        cache = ParsedFileCache(str(tmp_path / "cache"))
+        frame = pd.read_csv(csv_path)[["distance"]]
+        cache.get_or_parse(csv_path, lambda: frame, version=1)
+        cache.max_bytes = int(2.5 * cache.stats()["bytes"])
+
+        time.sleep(0.01)
+        cache.get_or_parse(csv_path, lambda: frame, version=2)
+        time.sleep(0.01)
+        cache.get_or_parse(csv_path, lambda: frame, version=1)
+        time.sleep(0.01)
+        cache.get_or_parse(csv_path, lambda: frame, version=3)
+
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] <= cache.max_bytes
+        cache.get_or_parse(csv_path, lambda: frame, version=1)
+        cache.get_or_parse(csv_path, lambda: frame, version=2)
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 4
@@ -0,0 +1,61 @@
+import pytest
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_acquisition import DataAcquisition, ROLLING_FEATURE_COLUMNS
+from data_lake import ParquetDataLake
+from incremental import run_incremental
+from parallel_features import engineer_features_serial
+
+SORT_KEYS = ["city_id", "ward_id", "daily_date"]
+
+
+class TestIncremental:
+    """Test suite for incremental daily processing."""
+
+    @pytest.fixture
+    def observations(self):
+        """Forty days of observations for two cities."""
+        return DataAcquisition().generate_training_data(
+            "2023-01-01", 40, cities=["Delhi", "Pune"]
+        )
+
+    def test_matches_full_recompute(self, observations, tmp_path):
+        """Daily increments reproduce the features of a full recompute."""
+        lake_path = str(tmp_path / "lake")
+        lake = ParquetDataLake(lake_path)
+        days = sorted(observations["daily_date"].unique())
+
+        lake.write(observations[observations["daily_date"] <= days[-3]], "observations")
+        run_incremental(lake_path)
+        for day in days[-2:]:
+            lake.write(observations[observations["daily_date"] == day], "observations")
+            summary = run_incremental(lake_path)
+
+        # A daily run reads the seed window and the new day only
+        assert summary["rows_written"] == 10
+        assert summary["rows_read"] == 10 * 31
+        assert summary["watermarks"] == {"Delhi": "2023-02-09", "Pune": "2023-02-09"}
+
+        result = lake.read("features").sort_values(SORT_KEYS, ignore_index=True)
+        expected = engineer_features_serial(observations, ROLLING_FEATURE_COLUMNS)
+        expected = expected.sort_values(SORT_KEYS, ignore_index=True)
+        expected["daily_date"] = expected["daily_date"].astype(
+            result["daily_date"].dtype
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_nothing_new(self, observations, tmp_path):
+        """A run without new partitions writes nothing."""
+        lake_path = str(tmp_path / "lake")
+        ParquetDataLake(lake_path).write(observations, "observations")
+
+        run_incremental(lake_path)
+        summary = run_incremental(lake_path)
+
+        assert summary["rows_read"] == 0
+        assert summary["rows_written"] == 0
+        assert os.path.exists(os.path.join(lake_path, "_incremental", "features.json"))
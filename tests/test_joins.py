@@ -0,0 +1,76 @@
+import pytest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from joins import temporal_join
+
+
+class TestTemporalJoin:
+    """Test suite for the keyed temporal join."""
+
+    @pytest.fixture
+    def daily(self):
+        """Daily NDVI for two wards in two cities."""
+        dates = pd.date_range("2023-01-01", periods=3)
+        return pd.DataFrame(
+            {
+                "city_id": np.repeat(["Delhi", "Pune"], 6),
+                "ward_id": np.tile(np.repeat([1, 2], 3), 2),
+                "daily_date": np.tile(dates, 4),
+                "ndvi": np.arange(12) / 10,
+            }
+        )
+
+    def test_exact_join_ignores_length_and_order(self, daily):
+        """Rows match on keys and date, not on position."""
+        left = pd.DataFrame(
+            {
+                "city_id": ["Pune", "Delhi", "Delhi", "Mumbai"],
+                "ward_id": [2, 1, 1, 1],
+                "daily_date": pd.to_datetime(
+                    ["2023-01-03", "2023-01-02", "2023-01-09", "2023-01-01"]
+                ),
+                "distance": [1.0, 2.0, 3.0, 4.0],
+            }
+        )
+
+        joined = temporal_join(left, daily.iloc[::-1])
+
+        assert list(joined["distance"]) == [1.0, 2.0, 3.0, 4.0]
+        assert joined["ndvi"].iloc[:2].tolist() == [1.1, 0.1]
+        assert joined["ndvi"].iloc[2:].isna().all()
+
+    def test_asof_join_hourly_to_daily(self, daily):
+        """Hourly rows take the latest daily reading within the tolerance."""
+        hours = pd.date_range("2023-01-02 00:00", periods=48, freq="h")
+        left = pd.DataFrame(
+            {
+                "city_id": "Delhi",
+                "ward_id": 2,
+                "timestamp": hours,
+                "traffic": np.arange(48),
+            }
+        ).sample(frac=1, random_state=0)
+
+        joined = temporal_join(
+            left,
+            daily,
+            date_column="timestamp",
+            right_date_column="daily_date",
+            tolerance="1D",
+        )
+
+        assert list(joined["traffic"]) == list(left["traffic"])
+        expected = pd.to_datetime(left["timestamp"].dt.normalize()).tolist()
+        assert joined["daily_date"].tolist() == expected
+        assert joined["ndvi"].notna().all()
+
+    def test_missing_keys_raise(self, daily):
+        """Sources without the join columns are rejected."""
+        with pytest.raises(ValueError):
+            temporal_join(daily.drop(columns=["ward_id"]), daily)
@@ -0,0 +1,110 @@
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from model_registry import ModelRegistry, registry_matches, train_city_models
+from model_trainer import ModelTrainer
+from utils import save_model
+
+
+class TestModelRegistry:
+    """Test suite for the per-city model registry."""
+
+    @pytest.fixture
+    def city_data(self):
+        """Three cities with different responses to traffic."""
+        rng = np.random.default_rng(0)
+        cities = pd.Series(np.repeat(["Delhi", "Pune", "Surat"], [300, 300, 40]))
+        x = pd.DataFrame(
+            {
+                "traffic": rng.uniform(0, 100, len(cities)),
+                "ndvi": rng.uniform(0, 1, len(cities)),
+            }
+        )
+        slope = cities.map({"Delhi": 3.0, "Pune": -2.0, "Surat": 1.0})
+        y = pd.DataFrame(
+            {
+                "Net_CO2_kg": slope * x["traffic"] - 50 * x["ndvi"],
+                "Net_PM25_kg": 0.1 * x["traffic"],
+                "Net_NOX_kg": x["traffic"] * x["ndvi"],
+            }
+        )
+        return x, y, cities
+
+    @pytest.fixture
+    def registry_path(self, city_data, tmp_path):
+        """A registry trained on two processes, with a global fallback."""
+        x, y, cities = city_data
+        config = {"n_estimators": 50, "n_jobs": 2}
+        fallback = ModelTrainer(config=config)
+        fallback.train(x, y)
+        save_model(fallback, str(tmp_path / "global.pkl"))
+
+        manifest = train_city_models(
+            x,
+            y,
+            cities,
+            path=str(tmp_path / "registry"),
+            min_rows=100,
+            max_workers=2,
+            model_config=config,
+        )
+        assert sorted(manifest["models"]) == ["Delhi", "Pune"]
+        assert manifest["fallback_keys"] == ["Surat"]
+        assert manifest["threads_per_model"] == 1
+        return tmp_path
+
+    def test_routes_cities_and_falls_back(self, city_data, registry_path):
+        """Each city is predicted by its own model; others use the fallback."""
+        x, y, cities = city_data
+        registry = ModelRegistry(
+            str(registry_path / "registry"),
+            max_memory="1GB",
+            fallback_path=str(registry_path / "global.pkl"),
+        )
+
+        predictions = registry.predict(x.assign(city_id=cities.to_numpy()))
+
+        delhi = (cities == "Delhi").to_numpy()
+        np.testing.assert_allclose(
+            predictions[delhi].to_numpy(),
+            registry.get("Delhi").predict(x[delhi]).to_numpy(),
+        )
+        assert registry.get("Surat") is registry.fallback()
+        assert registry.has_model("Pune") and not registry.has_model("Surat")
+        assert registry.loaded() == ["Pune", "Delhi"]
+        # Surat's rows and the get() above; fallback() itself is not a request
+        assert registry.stats()["fallbacks"] == 2
+        assert registry._loading == {}
+
+    def test_evicts_least_recently_used(self, registry_path):
+        """Past the memory budget the least recently used model is evicted."""
+        path = str(registry_path / "registry")
+        size = os.path.getsize(os.path.join(path, "Delhi.pkl"))
+        registry = ModelRegistry(path, max_memory=size + 1)
+
+        delhi = registry.get("Delhi")
+        assert registry.get("Delhi") is delhi
+        registry.get("Pune")
+
+        stats = registry.stats()
+        assert stats["loaded"] == ["Pune"]
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 1
+        assert registry.get("Delhi") is not delhi  # Reloaded from disk
+
+    def test_registry_matches_manifest(self, registry_path):
+        """A registry whose files were removed no longer matches its manifest."""
+        path = str(registry_path / "registry")
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        assert registry_matches(manifest, path)
+
+        os.remove(os.path.join(path, "Delhi.pkl"))
+        assert not registry_matches(manifest, path)
+        assert not registry_matches(manifest, str(registry_path / "missing"))
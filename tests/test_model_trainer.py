@@ -0,0 +1,192 @@
+import pytest
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from model_trainer import ModelTrainer
+from utils import load_model, save_model
+
+
+class TestModelTrainer:
+    """Test suite for the ModelTrainer class."""
+
+    @pytest.fixture
+    def training_data(self):
+        """A small regression problem with three targets."""
+        rng = np.random.default_rng(0)
+        x = pd.DataFrame(
+            {
+                "traffic": rng.uniform(0, 100, 300),
+                "ndvi": rng.uniform(0, 1, 300),
+                "city_id": rng.choice(["Delhi", "Pune"], 300),
+            }
+        )
+        y = pd.DataFrame(
+            {
+                "Net_CO2_kg": 3 * x["traffic"] - 50 * x["ndvi"],
+                "Net_PM25_kg": 0.1 * x["traffic"],
+                "Net_NOX_kg": x["traffic"] * x["ndvi"],
+            }
+        )
+        return x, y
+
+    def make_trainer(self, parallel):
+        """A trainer with a short training schedule."""
+        trainer = ModelTrainer()
+        trainer.config = {
+            **trainer.config,
+            "n_estimators": 50,
+            "parallel_targets": parallel,
+            "n_jobs": 2,
+        }
+        return trainer
+
+    def test_parallel_matches_sequential(self, training_data):
+        """Fitting targets concurrently yields the same models."""
+        x, y = training_data
+        sequential = self.make_trainer(parallel=False)
+        parallel = self.make_trainer(parallel=True)
+        sequential.train(x, y)
+        parallel.train(x, y)
+
+        assert parallel.training_report["mode"] == "parallel"
+        assert parallel.training_report["threads_per_target"] == 1
+        assert sequential.training_report["threads_per_target"] == 2
+        np.testing.assert_allclose(
+            parallel.predict(x).to_numpy(), sequential.predict(x).to_numpy()
+        )
+
+    def test_saved_model_predicts(self, training_data, tmp_path):
+        """A model trained in parallel mode round-trips through save_model."""
+        x, y = training_data
+        trainer = self.make_trainer(parallel=True)
+        trainer.train(x, y)
+        path = str(tmp_path / "model.pkl")
+        save_model(trainer, path)
+
+        predictions = load_model(path).predict(x.head(5))
+
+        assert list(predictions.columns) == list(y.columns)
+        assert not trainer.feature_importance.empty
+
+    def test_update_continues_boosting(self, training_data):
+        """An update on shifted data is promoted and tracks the new data."""
+        x, y = training_data
+        trainer = self.make_trainer(parallel=False)
+        trainer.train(x, y)
+        before = trainer.predict(x)
+
+        report = trainer.update(x, y * 1.5, mode="continue")
+
+        assert all(target["promoted"] for target in report["targets"].values())
+        after = trainer.predict(x)
+        error_before = np.abs(before.to_numpy() - 1.5 * y.to_numpy()).mean()
+        error_after = np.abs(after.to_numpy() - 1.5 * y.to_numpy()).mean()
+        assert error_after < error_before
+        assert trainer.update_history == [report]
+
+    def test_update_holds_out_latest_days(self, training_data):
+        """Promotion and early stopping use separate, latest days."""
+        x, y = training_data
+        trainer = self.make_trainer(parallel=False)
+        trainer.train(x, y)
+        # 30 days of 10 rows each, shuffled
+        dates = pd.Series(
+            pd.date_range("2023-07-01", periods=30).repeat(10)
+        ).sample(frac=1, random_state=0)
+
+        report = trainer.update(
+            x, y * 1.5, mode="continue", dates=dates.reset_index(drop=True)
+        )
+
+        # test_size 0.2: 6 days decide the promotion, 5 of the remaining 24
+        # days early-stop the candidate and 19 days are boosted on
+        assert report["validation_rows"] == 60
+        assert report["fit_rows"] == 190
+
+    @pytest.mark.parametrize("rows", [1, 2, 3])
+    def test_update_rejects_too_few_rows(self, training_data, rows):
+        """Updates too small to split fail clearly, before reaching LightGBM."""
+        x, y = training_data
+        trainer = self.make_trainer(parallel=False)
+        trainer.train(x, y)
+
+        with pytest.raises(ValueError, match="Too few new rows"):
+            trainer.update(x.iloc[:rows], y.iloc[:rows], mode="continue")
+        assert trainer.update_history == []
+
+    def test_update_guard_keeps_better_model(self, training_data):
+        """A candidate with worse validation error is not promoted."""
+        x, y = training_data
+        trainer = self.make_trainer(parallel=False)
+        trainer.train(x, y)
+        before = trainer.predict(x)
+        noise = pd.DataFrame(
+            np.random.default_rng(1).normal(0, 100, y.shape), columns=y.columns
+        )
+
+        report = trainer.update(x, noise, mode="refit", x_valid=x, y_valid=y)
+
+        assert not any(target["promoted"] for target in report["targets"].values())
+        pd.testing.assert_frame_equal(trainer.predict(x), before)
+
+    def test_native_preprocessing(self, training_data, tmp_path, caplog):
+        """Native mode keeps raw features and treats unseen ids as missing."""
+        x, y = training_data
+        trainer = self.make_trainer(parallel=False)
+        trainer.config["preprocessing"] = "native"
+        trainer.train(x, y)
+
+        assert not hasattr(trainer.scaler, "mean_")
+        assert trainer.categories == {"city_id": ["Delhi", "Pune"]}
+        path = str(tmp_path / "model.pkl")
+        save_model(trainer, path)
+        loaded = load_model(path)
+        # The matrix fast path matches LightGBM's own pandas conversion
+        np.testing.assert_allclose(
+            loaded.predict(x).to_numpy(),
+            loaded.model.predict(loaded.prepare_features(x)),
+        )
+
+        unseen = x.head(3).assign(city_id="Surat")
+        predictions = loaded.predict(unseen[["ndvi", "city_id", "traffic"]])
+        assert predictions.notna().all().all()
+        assert "3 unseen city_id values treated as missing" in caplog.text
+
+    def test_explanations_are_cached_and_additive(self, training_data):
+        """Explainers are built once per model version; SHAP values add up."""
+        x, y = training_data
+        trainer = self.make_trainer(parallel=False)
+        trainer.train(x, y)
+
+        explainers = trainer.explainers()
+        explanation = trainer.explain_batch(x.head(20))
+        assert trainer.explainers() is explainers
+        assert len(explanation["shap_values"]) == 3
+        assert explanation["shap_values"][0].shape == (20, len(trainer.feature_names))
+
+        totals = np.column_stack(
+            [
+                values.sum(axis=1) + expected
+                for values, expected in zip(
+                    explanation["shap_values"], explanation["expected_values"]
+                )
+            ]
+        )
+        np.testing.assert_allclose(totals, trainer.predict(x.head(20)), rtol=1e-6)
+
+        single = trainer.explain_prediction(x, sample_index=3)
+        np.testing.assert_allclose(
+            single["shap_values"][0][0], explanation["shap_values"][0][3]
+        )
+
+        importance = trainer.global_importance(x, sample_size=100, n_jobs=2)
+        assert importance["feature"].iloc[0] == "traffic"
+        assert list(importance.columns[1:]) == list(y.columns) + ["mean"]
+
+        # A retrained model gets a new version and new explainers
+        trainer.train(x, 2 * y)
+        assert trainer.explainers() is not explainers
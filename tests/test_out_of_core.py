@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_acquisition import DataAcquisition
+from data_lake import ParquetDataLake
+from feature_engineering import calculate_sequestration_and_removal
+from model_trainer import TARGET_COLUMNS
+from out_of_core import train_out_of_core
+
+EXCLUDE_COLUMNS = ["daily_date", "city_id", "ward_id", "total_vehicles"]
+
+
+class TestOutOfCore:
+    """Test suite for out-of-core training from the Parquet lake."""
+
+    @pytest.fixture
+    def lake_path(self, tmp_path):
+        """A feature dataset of two cities over two months."""
+        features = calculate_sequestration_and_removal(
+            DataAcquisition().generate_training_data(
+                "2023-01-01", 45, cities=["Delhi", "Pune"]
+            )
+        )
+        path = str(tmp_path / "lake")
+        ParquetDataLake(path).write(features, "features")
+        return path
+
+    @pytest.mark.parametrize("preprocessing", ["scaled", "native"])
+    def test_trains_from_partitions(self, lake_path, preprocessing):
+        """The model is built file by file and predicts in-memory frames."""
+        trainer, metrics = train_out_of_core(
+            lake_path,
+            exclude_columns=[c for c in EXCLUDE_COLUMNS if c != "city_id"],
+            config={"n_estimators": 30, "preprocessing": preprocessing},
+        )
+
+        report = trainer.training_report
+        assert report["mode"] == "out_of_core"
+        assert report["files"] == 4
+        assert report["rows"]["train"] + report["rows"]["valid"] == 450
+        assert set(metrics["target_metrics"]) == set(TARGET_COLUMNS)
+
+        frame = ParquetDataLake(lake_path).read("features")
+        predictions = trainer.predict(frame[trainer.input_columns])
+        assert predictions.shape == (450, 3)
+        assert np.isfinite(predictions.to_numpy()).all()
+
+        if preprocessing == "scaled":
+            # partial_fit over the files matches one fit on the whole table
+            encoded = frame[trainer.input_columns].assign(
+                city_id=trainer.label_encoders["city_id"].transform(frame["city_id"])
+            )
+            np.testing.assert_allclose(
+                trainer.scaler.mean_,
+                encoded[[c.replace("_encoded", "") for c in trainer.feature_names]]
+                .astype(float)
+                .mean()
+                .to_numpy(),
+            )
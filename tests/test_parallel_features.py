@@ -0,0 +1,65 @@
+import pytest
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_acquisition import DataAcquisition, ROLLING_FEATURE_COLUMNS
+from parallel_features import (
+    benchmark_feature_parallelism,
+    engineer_features_parallel,
+    engineer_features_serial,
+)
+from utils import create_time_features
+
+
+class TestParallelFeatures:
+    """Test suite for per-city parallel feature engineering."""
+
+    @pytest.fixture
+    def observations(self):
+        """Shuffled observations for three cities with a non-default index."""
+        df = DataAcquisition().generate_observations(
+            "2023-01-01", 20, cities=["Delhi", "Mumbai", "Pune"]
+        )
+        df = create_time_features(df).sample(frac=1, random_state=0)
+        df.index = df.index + 1000
+        return df
+
+    @pytest.mark.parametrize("rolling", [True, False])
+    def test_matches_serial(self, observations, rolling):
+        """Parallel mode returns exactly the serial result."""
+        columns = ROLLING_FEATURE_COLUMNS if rolling else None
+
+        serial = engineer_features_serial(observations, columns)
+        parallel, _ = engineer_features_parallel(observations, columns, max_workers=2)
+
+        pd.testing.assert_frame_equal(parallel, serial)
+
+    def test_scaling_report(self, observations, tmp_path):
+        """The report describes the partitions and leaves no files behind."""
+        _, report = engineer_features_parallel(
+            observations, max_workers=2, workdir=str(tmp_path)
+        )
+
+        assert report["partitions"] == 3
+        assert report["workers"] == 2
+        assert report["cpu_parallelism"] > 0
+        assert report["worker_utilization"] == pytest.approx(
+            report["cpu_parallelism"] / 2
+        )
+        assert os.listdir(tmp_path) == []
+
+    def test_benchmark_measures_speedup(self, observations):
+        """The benchmark times both modes on the same frame."""
+        report = benchmark_feature_parallelism(
+            observations, ROLLING_FEATURE_COLUMNS, max_workers=2
+        )
+
+        assert report["identical"]
+        assert report["speedup"] == pytest.approx(
+            report["serial_seconds"] / report["parallel_seconds"]
+        )
+        assert report["efficiency"] == pytest.approx(report["speedup"] / 2)
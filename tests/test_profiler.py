@@ -0,0 +1,62 @@
+import pytest
+import json
+import os
+import pstats
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from profiler import PipelineProfiler
+
+
+class TestPipelineProfiler:
+    """Test suite for the PipelineProfiler class."""
+
+    def test_records_stage_metrics(self, tmp_path):
+        """A stage record holds timings, memory and shapes."""
+        profiler = PipelineProfiler(
+            str(tmp_path / "pipeline_profile.json"), trace_memory=True
+        )
+        source = pd.DataFrame({"a": range(100), "b": 1.0})
+
+        with profiler.stage("engineer", [source]) as record:
+            record["output"] = source.assign(c=[0.0] * 100).head(10)
+
+        (record,) = profiler.records
+        assert record["stage"] == "engineer"
+        assert (record["rows_in"], record["columns_in"]) == (100, 2)
+        assert (record["rows_out"], record["columns_out"]) == (10, 3)
+        assert record["wall_seconds"] >= 0
+        assert record["peak_traced_mb"] > 0
+        assert "output" not in record
+
+    def test_failed_stage_is_written(self, tmp_path):
+        """A failing stage is recorded and the profile can still be written."""
+        path = tmp_path / "pipeline_profile.json"
+        profiler = PipelineProfiler(str(path))
+
+        with pytest.raises(RuntimeError):
+            with profiler.stage("train"):
+                raise RuntimeError("boom")
+        profiler.write()
+
+        profile = json.loads(path.read_text())
+        assert profile["stages"][0]["status"] == "failed"
+        assert "peak_traced_mb" not in profile["stages"][0]
+
+    def test_cprofile_dump(self, tmp_path):
+        """Selected stages are dumped as cProfile stats."""
+        profiler = PipelineProfiler(
+            str(tmp_path / "pipeline_profile.json"), cprofile_stages=["report"]
+        )
+
+        with profiler.stage("train"):
+            pass
+        with profiler.stage("report"):
+            sorted(range(1000))
+
+        assert "cprofile" not in profiler.records[0]
+        stats = pstats.Stats(profiler.records[1]["cprofile"])
+        assert stats.total_calls > 0
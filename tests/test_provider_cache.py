@@ -0,0 +1,110 @@
+import pytest
+import os
+import sys
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_acquisition import DataAcquisition
+from provider_cache import ProviderCache, is_provider_response
+
+
+class TestProviderCache:
+    """Test suite for the ProviderCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """A cache backed by a temporary SQLite file."""
+        cache = ProviderCache(
+            path=str(tmp_path / "cache.sqlite"),
+            max_entries=3,
+            ttl_seconds={"weather": 60},
+            stale_seconds={"weather": 60},
+            bucket_seconds={"weather": 86400},
+        )
+        yield cache
+        cache.close()
+
+    def test_hit_after_miss(self, cache):
+        """A second lookup in the same bucket is served from the cache."""
+        fetch = Mock(return_value={"max_temp_c": 30.0})
+
+        first = cache.get_or_fetch("weather", "Delhi", fetch)
+        second = cache.get_or_fetch("weather", "Delhi", fetch)
+
+        assert first == second
+        fetch.assert_called_once()
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_keys_include_subject_and_bucket(self, cache):
+        """Different cities and time buckets are cached separately."""
+        fetch = Mock(return_value={})
+
+        cache.get_or_fetch("weather", "Delhi", fetch, as_of=datetime(2023, 1, 1))
+        cache.get_or_fetch("weather", "Mumbai", fetch, as_of=datetime(2023, 1, 1))
+        cache.get_or_fetch("weather", "Delhi", fetch, as_of=datetime(2023, 1, 2))
+
+        assert fetch.call_count == 3
+
+    def test_survives_restart(self, tmp_path):
+        """Responses persist across cache instances."""
+        path = str(tmp_path / "cache.sqlite")
+        with ProviderCache(path=path) as cache:
+            cache.get_or_fetch("ndvi", "Pune", lambda: {"median_ndvi": 0.4})
+
+        fetch = Mock()
+        with ProviderCache(path=path) as cache:
+            value = cache.get_or_fetch("ndvi", "Pune", fetch)
+
+        assert value == {"median_ndvi": 0.4}
+        fetch.assert_not_called()
+
+    def test_stale_while_revalidate(self, cache):
+        """A stale response is returned immediately and refreshed in the background."""
+        cache.get_or_fetch("weather", "Delhi", lambda: "old")
+        cache._conn.execute("UPDATE responses SET stored_at = ?", (time.time() - 90,))
+
+        value = cache.get_or_fetch("weather", "Delhi", lambda: "new")
+        cache._executor.shutdown(wait=True)
+
+        assert value == "old"
+        assert cache.get_or_fetch("weather", "Delhi", Mock()) == "new"
+        assert cache.stats()["stale_hits"] == 1
+
+    def test_bounded_store_evicts_least_recently_used(self, cache):
+        """The store never holds more than max_entries responses."""
+        for city in ["Delhi", "Mumbai", "Pune", "Surat"]:
+            cache.get_or_fetch("weather", city, lambda: city)
+
+        assert cache.stats()["entries"] == 3
+        fetch = Mock(return_value="Delhi")
+        cache.get_or_fetch("weather", "Delhi", fetch)
+        fetch.assert_called_once()
+
+    def test_fallback_responses_are_not_stored(self, cache):
+        """A fallback returned on a provider error is retried next time."""
+        fallback = Mock(return_value={"max_temp_c": 30, "fallback": True})
+        cache.get_or_fetch("weather", "Delhi", fallback, cacheable=is_provider_response)
+        cache.get_or_fetch("weather", "Delhi", fallback, cacheable=is_provider_response)
+
+        assert fallback.call_count == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_wards_are_cached_separately(self, tmp_path):
+        """Cached observations keep the wards of a city apart."""
+        with ProviderCache(path=str(tmp_path / "cache.sqlite")) as cache:
+            observations = DataAcquisition(cache=cache).generate_observations(
+                "2023-01-01", days=1, cities=["Delhi"]
+            )
+            again = DataAcquisition(cache=cache).generate_observations(
+                "2023-01-01", days=1, cities=["Delhi"]
+            )
+
+        assert observations["traffic_index_0_100"].nunique() == 5
+        assert observations["max_temp_c"].nunique() == 5
+        assert again.equals(observations)
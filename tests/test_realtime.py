@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from realtime import RealtimeAcquisitionService, WardStateTable
+
+
+def full_readings(city):
+    """One reading from every provider for a city."""
+    return [
+        {
+            "provider": "traffic",
+            "city": city,
+            "values": {"traffic_index": 70.0, "avg_speed_kph": 30.0},
+        },
+        {
+            "provider": "weather",
+            "city": city,
+            "values": {"max_temp_c": 28.0, "humidity_pct": 65.0, "wind_speed_ms": 3.0},
+        },
+        {"provider": "ndvi", "city": city, "values": {"median_ndvi": 0.5}},
+        {
+            "provider": "air_quality",
+            "city": city,
+            "values": {"pm25_ug_m3": 120.0, "nox_ug_m3": 60.0},
+        },
+    ]
+
+
+class TestWardStateTable:
+    """Test suite for the WardStateTable class."""
+
+    def setup_method(self):
+        """Set up the test case."""
+        self.table = WardStateTable(["Delhi", "Pune"], wards_per_city=2)
+
+    def test_recompute_waits_for_all_inputs(self):
+        """Wards are not recomputed until every provider has reported."""
+        self.table.apply(full_readings("Delhi")[0])
+        assert self.table.recompute() == 0
+
+    def test_recompute_only_affected_wards(self):
+        """Only the wards of the updated city are recomputed."""
+        for reading in full_readings("Delhi") + full_readings("Pune"):
+            self.table.apply(reading)
+        assert self.table.recompute() == 4
+
+        self.table.apply(
+            {"provider": "traffic", "city": "Pune", "values": {"traffic_index": 90.0}}
+        )
+        assert self.table.recompute() == 2
+
+        state = self.table.snapshot()
+        assert state.loc["Pune_W1", "traffic_index_0_100"] == 90.0
+        assert not np.isnan(state.loc["Delhi_W1", "Net_CO2_kg"])
+
+
+class TestRealtimeAcquisitionService:
+    """Test suite for the RealtimeAcquisitionService class."""
+
+    def test_process_batch_applies_queued_readings(self):
+        """A batch drains the queue and records lag and throughput metrics."""
+        service = RealtimeAcquisitionService(cities=["Delhi"])
+        for reading in full_readings("Delhi"):
+            service.submit(reading)
+
+        assert service.process_batch(timeout=0) == 4
+        metrics = service.metrics()
+        assert metrics["ward_recomputes"] == 5
+        assert metrics["queue_depth"] == 0
+
+    def test_full_queue_drops_readings(self):
+        """Readings are dropped and counted once the bounded queue is full."""
+        service = RealtimeAcquisitionService(
+            cities=["Delhi"],
+            config={"queue_maxsize": 1, "enqueue_timeout_seconds": 0.01},
+        )
+        readings = full_readings("Delhi")
+
+        assert service.submit(readings[0])
+        assert not service.submit(readings[1])
+        assert service.metrics()["readings_dropped"] == 1
@@ -0,0 +1,150 @@
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from model_trainer import ModelTrainer
+from serving import build_serving_variants, load_variant, select_variant, variants_match
+
+
+class TestServingVariants:
+    """Test suite for the compacted serving variants."""
+
+    @pytest.fixture
+    def trained(self):
+        """A model that early-stops well before its last iteration."""
+        rng = np.random.default_rng(0)
+        n = 600
+        x = pd.DataFrame(
+            {
+                "city_id": rng.choice(["Delhi", "Pune", "Surat"], n),
+                "ward_id": rng.choice(["W1", "W2", "W3", "W4"], n),
+                "traffic": rng.uniform(0, 100, n),
+                "ndvi": rng.uniform(0, 1, n),
+            }
+        )
+        y = pd.DataFrame(
+            {
+                "Net_CO2_kg": 3 * x["traffic"] - 50 * x["ndvi"] + rng.normal(0, 5, n),
+                "Net_PM25_kg": 0.1 * x["traffic"] + rng.normal(0, 0.5, n),
+                "Net_NOX_kg": x["traffic"] * x["ndvi"] + rng.normal(0, 2, n),
+            }
+        )
+        trainer = ModelTrainer(
+            config={
+                "n_estimators": 300,
+                "learning_rate": 0.2,
+                "early_stopping_rounds": 10,
+                "n_jobs": 1,
+            }
+        )
+        trainer.train(x, y)
+        return trainer, x, y
+
+    @pytest.fixture
+    def report(self, trained, tmp_path):
+        """Variants of the trained model, distillation included."""
+        trainer, x, y = trained
+        return build_serving_variants(
+            trainer,
+            x,
+            y,
+            {
+                "path": str(tmp_path),
+                "rmse_tolerance": 0.05,
+                "tree_step": 5,
+                "distill": {
+                    "enabled": True,
+                    "n_estimators": 100,
+                    "learning_rate": 0.2,
+                    "num_leaves": 15,
+                    "early_stopping_rounds": 10,
+                },
+                "latency_rows": 20,
+            },
+        )
+
+    def test_pruned_variant(self, trained, report, tmp_path):
+        """Pruning keeps each target within the tolerance with fewer trees."""
+        trainer, x, _ = trained
+        pruned = load_variant("pruned", str(tmp_path))
+        assert pruned.training_report["variant"] == "pruned"
+
+        kept = report["pruned_iterations"]
+        for target, full, short in zip(
+            kept, trainer.model.estimators_, pruned.model.estimators_
+        ):
+            assert short.booster_.num_trees() == kept[target]
+            assert kept[target] <= full.best_iteration_
+        assert sum(kept.values()) < report["variants"]["full"]["trees"]
+
+        variants = report["variants"]
+        for target, metrics in variants["pruned"]["target_metrics"].items():
+            assert (
+                metrics["rmse"]
+                <= variants["full"]["target_metrics"][target]["rmse"] * 1.05 + 1e-9
+            )
+        assert set(variants["full"]["latency"]) == {
+            "single_row_p50_ms",
+            "single_row_p95_ms",
+            "batch_us_per_row",
+            "model_us_per_row",
+        }
+
+    def test_zero_tolerance_keeps_predictions(self, trained, tmp_path):
+        """Without tolerance the pruned variant predicts like the full model."""
+        trainer, x, y = trained
+        report = build_serving_variants(
+            trainer,
+            x,
+            y,
+            {
+                "path": str(tmp_path / "exact"),
+                "rmse_tolerance": 0.0,
+                "distill": {"enabled": False},
+                "latency_rows": 5,
+            },
+        )
+        pruned = load_variant("pruned", str(tmp_path / "exact"))
+
+        np.testing.assert_allclose(pruned.predict(x), trainer.predict(x))
+        assert set(report["variants"]) == {"full", "pruned"}
+
+    def test_distilled_variant_and_selection(self, trained, report, tmp_path):
+        """The shared ensemble predicts every target; budgets pick a variant."""
+        _, x, y = trained
+        distilled = load_variant("distilled", str(tmp_path))
+
+        predictions = distilled.predict(x)
+        assert predictions.shape == (len(x), 3)
+        assert list(predictions.columns) == list(y.columns)
+        assert report["variants"]["distilled"]["overall_rmse"] < y.std().max()
+
+        fastest = min(
+            report["variants"],
+            key=lambda name: report["variants"][name]["latency"]["batch_us_per_row"],
+        )
+        assert select_variant(report, 0.0) == fastest
+        assert select_variant(report, None) == min(
+            report["variants"],
+            key=lambda name: report["variants"][name]["overall_rmse"],
+        )
+        selected = load_variant("auto", str(tmp_path))
+        assert selected.training_report.get("variant", "full") == report["selected"]
+
+    def test_unknown_variants_are_rejected(self, report, tmp_path):
+        """Only known variant names are turned into paths and loaded."""
+        assert variants_match(report, str(tmp_path))
+
+        with pytest.raises(ValueError, match="Unknown"):
+            load_variant("../trained_model", str(tmp_path))
+
+        with open(tmp_path / "report.json", "w") as f:
+            json.dump({**report, "selected": "../trained_model"}, f)
+        assert not variants_match(report, str(tmp_path))
+        with pytest.raises(ValueError, match="unknown variant"):
+            load_variant("auto", str(tmp_path))
@@ -0,0 +1,88 @@
+import pytest
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from stages import StagePipeline
+
+
+def make_source(days):
+    """A tiny acquire stage."""
+    return pd.DataFrame({"day": range(days), "value": [1.0] * days})
+
+
+def total(df, scale):
+    """A tiny downstream stage."""
+    return {"total": float(df["value"].sum()) * scale}
+
+
+class TestStagePipeline:
+    """Test suite for the StagePipeline class."""
+
+    def run(self, root, days=3, scale=1, force=None):
+        """Run the two-stage pipeline."""
+        pipeline = StagePipeline(str(root), force=force)
+        pipeline.run("acquire", make_source, params={"days": days})
+        result = pipeline.run(
+            "report", total, inputs=["acquire"], params={"scale": scale}
+        )
+        return pipeline, result
+
+    def test_unchanged_stages_are_cached(self, tmp_path):
+        """A second run loads every stage from its artifact."""
+        _, first = self.run(tmp_path)
+        pipeline, second = self.run(tmp_path)
+
+        assert pipeline.status == {"acquire": "cached", "report": "cached"}
+        assert second == first
+        pd.testing.assert_frame_equal(pipeline.outputs["acquire"], make_source(3))
+
+    def test_changes_invalidate_downstream_only(self, tmp_path):
+        """Changed parameters rerun the stage and stages fed by its output."""
+        self.run(tmp_path)
+
+        pipeline, _ = self.run(tmp_path, scale=2)
+        assert pipeline.status == {"acquire": "cached", "report": "computed"}
+
+        pipeline, result = self.run(tmp_path, days=4, scale=2)
+        assert pipeline.status == {"acquire": "computed", "report": "computed"}
+        assert result == {"total": 8.0}
+
+    def test_force_reruns_stage(self, tmp_path):
+        """Forced stages rerun; identical output keeps downstream cached."""
+        self.run(tmp_path)
+        pipeline = StagePipeline(str(tmp_path), force=["acquire"])
+
+        pipeline.run("acquire", make_source, params={"days": 3})
+        pipeline.run("report", total, inputs=["acquire"], params={"scale": 1})
+
+        assert pipeline.status == {"acquire": "forced", "report": "cached"}
+
+    def test_options_are_not_fingerprinted(self, tmp_path):
+        """Options reach the stage but changing them keeps it cached."""
+        calls = []
+
+        def source(days, max_workers=None):
+            calls.append(max_workers)
+            return make_source(days)
+
+        for workers in (None, 4):
+            pipeline = StagePipeline(str(tmp_path))
+            pipeline.run(
+                "acquire", source, params={"days": 3}, options={"max_workers": workers}
+            )
+
+        assert calls == [None]
+        assert pipeline.status == {"acquire": "cached"}
+
+    def test_invalid_cached_output_reruns(self, tmp_path):
+        """A cached output rejected by the validity check is recomputed."""
+        self.run(tmp_path)
+        pipeline = StagePipeline(str(tmp_path))
+
+        pipeline.run("acquire", make_source, params={"days": 3}, valid=lambda _: False)
+
+        assert pipeline.status == {"acquire": "computed"}
@@ -0,0 +1,106 @@
+import pytest
+import json
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from model_trainer import ModelTrainer
+from tuning import pruning_thresholds, run_search, sample_params
+
+MODEL_CONFIG = {"n_estimators": 60, "early_stopping_rounds": 10, "n_jobs": 2}
+
+
+class TestTuning:
+    """Test suite for the hyperparameter search."""
+
+    @pytest.fixture
+    def training_data(self):
+        """A small regression problem with three targets."""
+        rng = np.random.default_rng(0)
+        x = pd.DataFrame(
+            {"traffic": rng.uniform(0, 100, 400), "ndvi": rng.uniform(0, 1, 400)}
+        )
+        y = pd.DataFrame(
+            {
+                "Net_CO2_kg": 3 * x["traffic"] - 50 * x["ndvi"],
+                "Net_PM25_kg": 0.1 * x["traffic"],
+                "Net_NOX_kg": x["traffic"] * x["ndvi"],
+            }
+        )
+        return x, y
+
+    def test_sampling_and_thresholds(self):
+        """Sampling is seeded and thresholds need enough finished trials."""
+        space = {"num_leaves": ["int", 15, 63], "learning_rate": ["log", 0.01, 0.2]}
+        first = sample_params(space, np.random.default_rng(1))
+        assert first == sample_params(space, np.random.default_rng(1))
+        assert 15 <= first["num_leaves"] <= 63
+
+        trials = [
+            {"curves": {"Net_CO2_kg": {10: rmse, 20: rmse / 2}}} for rmse in (1, 2, 3)
+        ]
+        thresholds = pruning_thresholds(trials, percentile=50, min_trials=3)
+        assert thresholds == {"Net_CO2_kg": {10: 2.0, 20: 1.0}}
+        assert pruning_thresholds(trials[:2], percentile=50, min_trials=3) == {
+            "Net_CO2_kg": {}
+        }
+
+    def test_best_config_reproduces(self, training_data, tmp_path):
+        """Retraining with the written best config reproduces its score."""
+        x, y = training_data
+        summary = run_search(
+            x,
+            y,
+            {
+                "n_trials": 4,
+                "max_workers": 2,
+                "prune_interval": 10,
+                "min_trials_to_prune": 1,
+                "output_path": str(tmp_path),
+            },
+            MODEL_CONFIG,
+        )
+
+        with open(tmp_path / "best_config.json") as f:
+            best_config = json.load(f)
+        with open(tmp_path / "trials.json") as f:
+            assert len(json.load(f)) == summary["trials_started"] == 4
+
+        # Trials rank on rows held out of the training split, never the test rows
+        trainer = ModelTrainer(config={**MODEL_CONFIG, **best_config})
+        x_train, x_test, y_train, y_test = trainer.split_data(x, y)
+        x_fit, x_valid, y_fit, y_valid = train_test_split(
+            x_train, y_train, test_size=0.2, random_state=42
+        )
+        assert not x_valid.index.isin(x_test.index).any()
+
+        trainer.model = trainer.fit_targets(
+            x_fit, y_fit, x_valid, y_valid, trainer.lgb_params()
+        )
+        valid_metrics = trainer.evaluate_model(x_valid, y_valid, "Validation")
+        test_metrics = trainer.evaluate_model(x_test, y_test, "Test")
+        assert valid_metrics["overall_rmse"] == pytest.approx(summary["best_score"])
+        assert test_metrics["overall_rmse"] == pytest.approx(summary["best_test_rmse"])
+        assert summary["base_test_rmse"] > 0
+
+    def test_time_budget(self, training_data, tmp_path):
+        """Trials stop at their first checkpoint once the budget is spent."""
+        x, y = training_data
+        with pytest.raises(RuntimeError, match="time budget"):
+            run_search(
+                x,
+                y,
+                {
+                    "n_trials": 4,
+                    "max_workers": 2,
+                    "prune_interval": 10,
+                    "time_budget_seconds": 0,
+                    "output_path": str(tmp_path),
+                },
+                MODEL_CONFIG,
+            )